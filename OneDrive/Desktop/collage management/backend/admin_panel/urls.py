@@ -0,0 +1,12 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('throttle-stats/', views.throttle_stats, name='throttle-stats'),
+    path('export/attendance/', views.export_records, {'kind': 'attendance'}, name='export-attendance'),
+    path('export/grades/', views.export_records, {'kind': 'grades'}, name='export-grades'),
+    path('import/students/', views.import_records, {'kind': 'students'}, name='import-students'),
+    path('import/faculty/', views.import_records, {'kind': 'faculty'}, name='import-faculty'),
+    path('import/grades/', views.import_records, {'kind': 'grades'}, name='import-grades'),
+    path('import/enrollments/', views.import_records, {'kind': 'enrollments'}, name='import-enrollments'),
+]
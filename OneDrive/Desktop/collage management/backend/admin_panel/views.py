@@ -1,3 +1,48 @@
-from django.shortcuts import render
+import io
 
-# Create your views here.
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from college_system.throttling import get_throttle_stats
+from users.exports import ExportFilterSerializer, export_response
+from users.imports import InvalidImportFile, import_csv
+from users.permissions import IsAdminRole
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminRole])
+def throttle_stats(request):
+    """Allowed/rejected counts and rejection rate per throttle scope"""
+    return Response({
+        'scopes': get_throttle_stats()
+    }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminRole])
+def export_records(request, kind):
+    """Stream attendance or grades for the whole college (or the filtered cohort) as CSV"""
+    serializer = ExportFilterSerializer(data=request.query_params)
+    if serializer.is_valid():
+        return export_response(kind, serializer.validated_data)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdminRole])
+@parser_classes([MultiPartParser])
+def import_records(request, kind):
+    """Import students, faculty, grades or enrollments from an uploaded CSV (`file`); `dry_run=true` only validates"""
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({
+            'error': 'Upload the CSV as the "file" field'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    dry_run = str(request.data.get('dry_run', request.query_params.get('dry_run', ''))).lower() in ('1', 'true', 'yes')
+    try:
+        report = import_csv(kind, io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''), dry_run=dry_run)
+    except InvalidImportFile as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(report.as_dict(), status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
@@ -0,0 +1,96 @@
+"""
+Async versions of the public auth endpoints for the ASGI deployment.
+
+They behave like the DRF views in views.py (same payloads, throttles and
+error bodies) but never hold a worker thread while waiting on the database:
+ORM calls use the async API, and serializer validation and password hashing
+run through sync_to_async.
+"""
+import secrets
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework import status
+
+from college_system.async_utils import parse_json, athrottle, validation_error
+from college_system.throttling import (
+    RegisterIPThrottle, ForgotPasswordIPThrottle, ForgotPasswordEmailThrottle
+)
+from users.models import User, PasswordResetToken
+from .serializers import RegisterSerializer, UserSerializer, ForgotPasswordSerializer
+from .services import aqueue_email_notification
+
+@csrf_exempt
+@require_POST
+async def register(request):
+    """User registration endpoint (async)"""
+    data, error = parse_json(request)
+    if error:
+        return error
+    throttled = await athrottle(request, data, [RegisterIPThrottle])
+    if throttled:
+        return throttled
+    
+    serializer = RegisterSerializer(data=data)
+    if await sync_to_async(serializer.is_valid)():
+        user = await sync_to_async(serializer.save)()
+        
+        # Queue welcome email
+        await aqueue_email_notification(
+            to_email=user.email,
+            subject='Welcome to Adwaita Mission Institute of Technology',
+            message=f'Hello {user.name},\n\nYour account has been created successfully.\n\nRole: {user.role}\nEmail: {user.email}\n\nPlease login to complete your profile setup.'
+        )
+        
+        return JsonResponse({
+            'message': 'User registered successfully',
+            'user': UserSerializer(user).data
+        }, status=status.HTTP_201_CREATED)
+    
+    return validation_error(serializer)
+
+@csrf_exempt
+@require_POST
+async def forgot_password(request):
+    """Forgot password endpoint - queues reset token email (async)"""
+    data, error = parse_json(request)
+    if error:
+        return error
+    throttled = await athrottle(request, data, [ForgotPasswordIPThrottle, ForgotPasswordEmailThrottle])
+    if throttled:
+        return throttled
+    
+    serializer = ForgotPasswordSerializer(data=data)
+    if not serializer.is_valid():
+        return validation_error(serializer)
+    
+    user = await User.objects.filter(email=serializer.validated_data['email']).afirst()
+    if user is None:
+        # Don't reveal if email exists
+        return JsonResponse({
+            'message': 'If the email exists, a reset link has been sent'
+        }, status=status.HTTP_200_OK)
+    
+    # Generate reset token
+    token = secrets.token_urlsafe(32)
+    await PasswordResetToken.objects.acreate(
+        user=user,
+        token=token,
+        expires_at=timezone.now() + timedelta(hours=1)
+    )
+    
+    # Queue reset email
+    reset_link = f"{request.build_absolute_uri('/')[:-1]}/reset-password?token={token}"
+    await aqueue_email_notification(
+        to_email=user.email,
+        subject='Password Reset Request',
+        message=f'Hello {user.name},\n\nYou requested a password reset.\n\nClick here to reset: {reset_link}\n\nThis link expires in 1 hour.\n\nIf you did not request this, please ignore this email.'
+    )
+    
+    return JsonResponse({
+        'message': 'Password reset email sent successfully'
+    }, status=status.HTTP_200_OK)
@@ -0,0 +1,34 @@
+"""
+Password hashers with cost parameters taken from settings.
+
+Each class keeps the algorithm name of the Django hasher it extends, so
+existing hashes still verify. When a stored hash uses a different
+algorithm or different parameters than the preferred hasher, Django's
+check_password rehashes it on the next successful login.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher, make_password
+)
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = settings.PASSWORD_HASHER_PARAMS['pbkdf2']['iterations']
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    time_cost = settings.PASSWORD_HASHER_PARAMS['argon2']['time_cost']
+    memory_cost = settings.PASSWORD_HASHER_PARAMS['argon2']['memory_cost']
+    parallelism = settings.PASSWORD_HASHER_PARAMS['argon2']['parallelism']
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = settings.PASSWORD_HASHER_PARAMS['scrypt']['work_factor']
+    block_size = settings.PASSWORD_HASHER_PARAMS['scrypt']['block_size']
+    parallelism = settings.PASSWORD_HASHER_PARAMS['scrypt']['parallelism']
+
+def make_passwords(passwords):
+    """
+    Hash a batch of passwords with the preferred hasher.
+    
+    Used by process pools (bulk imports); this module only needs settings,
+    not the app registry, so spawned workers can import it cheaply.
+    """
+    return [make_password(password) for password in passwords]
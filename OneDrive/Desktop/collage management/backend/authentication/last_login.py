@@ -0,0 +1,70 @@
+"""
+Last-login tracking without rewriting the whole users row.
+
+By default each login issues a single-column UPDATE. LAST_LOGIN_COALESCE_SECONDS
+skips the write when the stored timestamp is already that recent, and
+LAST_LOGIN_BUFFERED keeps timestamps in process memory and writes them with one
+bulk UPDATE every LAST_LOGIN_FLUSH_INTERVAL seconds or LAST_LOGIN_FLUSH_SIZE
+users. Buffered timestamps not yet flushed are lost if the worker is killed,
+which is acceptable for a "last seen" value.
+"""
+import atexit
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from users.models import User
+
+_lock = threading.Lock()
+_pending = {}
+_last_flush = time.monotonic()
+
+def record_login(user, now=None):
+    """Record a successful login; returns False when the write was coalesced away"""
+    now = now or timezone.now()
+    window = settings.LAST_LOGIN_COALESCE_SECONDS
+    if window and user.last_login and now - user.last_login < timedelta(seconds=window):
+        return False
+    
+    user.last_login = now
+    if not settings.LAST_LOGIN_BUFFERED:
+        User.objects.filter(pk=user.pk).update(last_login=now)
+        return True
+    
+    with _lock:
+        _pending[user.pk] = now
+        due = (
+            len(_pending) >= settings.LAST_LOGIN_FLUSH_SIZE
+            or time.monotonic() - _last_flush >= settings.LAST_LOGIN_FLUSH_INTERVAL
+        )
+    if due:
+        flush_last_logins()
+    return True
+
+def flush_last_logins():
+    """Write all buffered timestamps with one bulk UPDATE; returns the number of users written"""
+    global _last_flush
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+    
+    User.objects.bulk_update(
+        [User(pk=pk, last_login=last_login) for pk, last_login in pending.items()],
+        ['last_login'],
+        batch_size=500,
+    )
+    return len(pending)
+
+def _flush_at_exit():
+    try:
+        flush_last_logins()
+    except Exception:
+        pass
+
+atexit.register(_flush_at_exit)
@@ -0,0 +1,243 @@
+import itertools
+import json
+import secrets
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from authentication.serializers import RegisterSerializer, LoginSerializer, UserSerializer
+from authentication.tokens import CollegeRefreshToken
+from contact.serializers import ContactSubmissionSerializer
+from users.models import User, PasswordResetToken
+
+PASSWORD = 'Bench@12345'
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'api_baseline.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the auth/contact serializers and views on a throwaway test database, '
+        'record ops/sec and queries per call, and compare against the in-repo baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=100, help='Timed calls per round')
+        parser.add_argument('--rounds', type=int, default=5, help='Rounds per case; the fastest median is kept')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed calls per case before measuring')
+        parser.add_argument('--case', action='append', dest='cases', help='Only run cases whose name contains this')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+        parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline')
+        parser.add_argument('--check', action='store_true', help='Fail if a case regressed against the baseline')
+        parser.add_argument('--query-tolerance', type=int, default=0, help='Extra queries per call allowed by --check')
+        parser.add_argument('--latency-tolerance', type=float, default=0.5,
+                            help='Allowed median latency increase by --check, as a fraction of the baseline')
+        parser.add_argument('--queries-only', action='store_true', help='Only compare query counts (for noisy CI machines)')
+        parser.add_argument('--real-hashers', action='store_true',
+                            help='Keep the configured password hashers instead of MD5 (login then measures hashing)')
+
+    def handle(self, *args, **options):
+        overrides = {
+            # Every case would otherwise be throttled after a handful of calls
+            'REST_FRAMEWORK': {
+                **settings.REST_FRAMEWORK,
+                'DEFAULT_THROTTLE_RATES': {scope: '1000000/s' for scope in settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']},
+            },
+        }
+        if not options['real_hashers']:
+            overrides['PASSWORD_HASHERS'] = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(**overrides):
+                cache.clear()
+                results = self._run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self._report(results)
+        baseline_path = Path(options['baseline'])
+        if options['check']:
+            self._check(results, baseline_path, options)
+        if options['update_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline = {
+                'vendor': connection.vendor,
+                'iterations': options['iterations'],
+                'rounds': options['rounds'],
+                'hashers': 'configured' if options['real_hashers'] else 'md5',
+                'cases': results,
+            }
+            baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {baseline_path}'))
+
+    def _run(self, options):
+        results = {}
+        for name, prepare in self._cases():
+            if options['cases'] and not any(part in name for part in options['cases']):
+                continue
+            results[name] = self._measure(prepare, options['iterations'], options['rounds'], options['warmup'])
+        if not results:
+            raise CommandError('No benchmark case matched --case')
+        return results
+
+    def _measure(self, prepare, iterations, rounds, warmup):
+        """
+        Time `rounds` x `iterations` calls; prepare(i) builds the i-th call's inputs outside the timed region.
+        Like timeit, the fastest round's median is reported, which filters out machine noise
+        """
+        for i in range(warmup):
+            prepare(i)()
+
+        medians = []
+        timings = []
+        queries = 0
+        calls = itertools.count(warmup)
+        for _ in range(rounds):
+            round_timings = []
+            for i in itertools.islice(calls, iterations):
+                call = prepare(i)
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    call()
+                    round_timings.append(time.perf_counter() - start)
+                queries = max(queries, len(captured))
+            medians.append(statistics.median(round_timings))
+            timings += round_timings
+
+        timings.sort()
+        return {
+            'ops_per_sec': round(1 / min(medians), 1),
+            'median_ms': round(min(medians) * 1000, 3),
+            'p95_ms': round(timings[int(len(timings) * 0.95) - 1] * 1000, 3),
+            'queries': queries,
+        }
+
+    def _cases(self):
+        """(name, prepare) pairs; each prepare(i) returns the zero-argument call to time"""
+        client = Client()
+        user = self._user('bench-user', role='student', setup_complete=True)
+        refresh = CollegeRefreshToken.for_user(user)
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {refresh.access_token}'}
+
+        def post(path, data, expected, **extra):
+            def call():
+                response = client.post(path, data, content_type='application/json', **extra)
+                if response.status_code != expected:
+                    raise CommandError(f'POST {path} returned {response.status_code}, expected {expected}: {response.content[:200]}')
+            return call
+
+        def valid(serializer_class, data):
+            def call():
+                serializer = serializer_class(data=data)
+                if not serializer.is_valid():
+                    raise CommandError(f'{serializer_class.__name__} rejected benchmark data: {serializer.errors}')
+            return call
+
+        def registration(i):
+            return {
+                'email': f'register-{i}-{uuid.uuid4().hex[:6]}@example.com', 'password': PASSWORD, 'password2': PASSWORD,
+                'name': 'Benchmark Register', 'role': 'student',
+            }
+
+        def contact(i):
+            return {
+                'name': 'Benchmark Contact', 'email': f'contact-{i}@example.com', 'phone': '+919876543210',
+                'message': 'Benchmark contact form submission',
+            }
+
+        def reset_password(i):
+            token = secrets.token_urlsafe(32)
+            PasswordResetToken.objects.create(user=user, token=token, expires_at=timezone.now() + timedelta(hours=1))
+            return post('/api/auth/reset-password/', {'token': token, 'password': PASSWORD, 'password2': PASSWORD}, 200)
+
+        def complete_setup(i):
+            fresh = self._user(f'setup-{i}', role='student')
+            access = CollegeRefreshToken.for_user(fresh).access_token
+            return post('/api/auth/setup/', {
+                'student_id': f'BENCH-{i}', 'program': 'B.Tech CSE', 'enrollment_date': date(2024, 8, 1).isoformat(),
+                'current_semester': 1, 'phone': '9876543210', 'address': 'Benchmark Street',
+            }, 200, HTTP_AUTHORIZATION=f'Bearer {access}')
+
+        def verify_token(i):
+            def call():
+                response = client.get('/api/auth/verify-token/', **auth)
+                if response.status_code != 200:
+                    raise CommandError(f'verify-token returned {response.status_code}')
+            return call
+
+        def serialize_user(i):
+            return lambda: UserSerializer(user).data
+
+        login = {'email': user.email, 'password': PASSWORD}
+        return [
+            ('serializer.register', lambda i: valid(RegisterSerializer, registration(i))),
+            ('serializer.login', lambda i: valid(LoginSerializer, login)),
+            ('serializer.user', serialize_user),
+            ('serializer.contact', lambda i: valid(ContactSubmissionSerializer, contact(i))),
+            ('view.register', lambda i: post('/api/auth/register/', registration(i), 201)),
+            ('view.login', lambda i: post('/api/auth/login/', login, 200)),
+            # Access-token-only logout; a refresh_token is blacklisted only when token_blacklist is installed
+            ('view.logout', lambda i: post('/api/auth/logout/', {}, 200, **auth)),
+            ('view.forgot_password', lambda i: post('/api/auth/forgot-password/', {'email': user.email}, 200)),
+            ('view.reset_password', reset_password),
+            ('view.verify_token', verify_token),
+            ('view.refresh_token', lambda i: post('/api/auth/refresh-token/', {'refresh': str(refresh)}, 200)),
+            ('view.complete_setup', complete_setup),
+            ('view.contact_submit', lambda i: post('/api/contact/submit/', contact(i), 201)),
+        ]
+
+    def _user(self, prefix, role, setup_complete=False):
+        user = User(email=f'{prefix}-{uuid.uuid4().hex[:8]}@example.com', name='Benchmark User', role=role,
+                    is_setup_complete=setup_complete)
+        user.set_password(PASSWORD)
+        user.save()
+        return user
+
+    def _report(self, results):
+        self.stdout.write(f'{"case":<24} {"ops/sec":>10} {"median ms":>10} {"p95 ms":>10} {"queries":>8}')
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<24} {result["ops_per_sec"]:>10.1f} {result["median_ms"]:>10.3f} '
+                f'{result["p95_ms"]:>10.3f} {result["queries"]:>8}'
+            )
+
+    def _check(self, results, baseline_path, options):
+        if not baseline_path.exists():
+            raise CommandError(f'No baseline at {baseline_path}; run with --update-baseline first')
+        baseline = json.loads(baseline_path.read_text())
+        check_latency = not options['queries_only']
+        if check_latency and baseline.get('vendor') != connection.vendor:
+            self.stdout.write(self.style.WARNING(
+                f'Baseline was recorded on {baseline.get("vendor")}, not {connection.vendor}; only comparing queries'
+            ))
+            check_latency = False
+
+        regressions = []
+        for name, result in results.items():
+            expected = baseline['cases'].get(name)
+            if expected is None:
+                self.stdout.write(self.style.WARNING(f'{name}: not in baseline'))
+                continue
+            if result['queries'] > expected['queries'] + options['query_tolerance']:
+                regressions.append(f'{name}: {result["queries"]} queries per call (baseline {expected["queries"]})')
+            limit = expected['median_ms'] * (1 + options['latency_tolerance'])
+            if check_latency and result['median_ms'] > limit:
+                regressions.append(
+                    f'{name}: median {result["median_ms"]:.3f} ms (baseline {expected["median_ms"]:.3f} ms, limit {limit:.3f} ms)'
+                )
+
+        if regressions:
+            raise CommandError('Benchmark regressions:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {baseline_path}'))
@@ -0,0 +1,49 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from authentication.tokens import CachedJWTAuthentication, CollegeRefreshToken
+from authentication.views import verify_token
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Measure verify-token/ requests per second with the default and the cached JWT authentication'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        with transaction.atomic():
+            user = User.objects.create(
+                email=f'bench-{uuid.uuid4().hex[:8]}@example.com', name='Benchmark User', role='student', password='!'
+            )
+            access = str(CollegeRefreshToken.for_user(user).access_token)
+
+            for label, auth_class in (('JWTAuthentication', JWTAuthentication), ('CachedJWTAuthentication', CachedJWTAuthentication)):
+                view = verify_token.cls.as_view(authentication_classes=[auth_class])
+
+                def call():
+                    response = view(factory.get('/api/auth/verify-token/', HTTP_AUTHORIZATION=f'Bearer {access}'))
+                    assert response.status_code == 200, response.data
+
+                call()  # warm up caches
+                with CaptureQueriesContext(connection) as queries:
+                    call()
+
+                start = time.perf_counter()
+                for _ in range(options['requests']):
+                    call()
+                seconds = time.perf_counter() - start
+
+                self.stdout.write(
+                    f'{label:<24} {options["requests"] / seconds:>8.0f} req/s  {len(queries)} queries/request'
+                )
+
+            transaction.set_rollback(True)
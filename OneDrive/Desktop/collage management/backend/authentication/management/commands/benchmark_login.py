@@ -0,0 +1,90 @@
+import json
+import math
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers, make_password, PBKDF2SHA1PasswordHasher
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from authentication.views import login
+from users.models import User
+
+PASSWORD = 'Benchmark@12345'
+
+
+class Command(BaseCommand):
+    help = 'Report password verifications and full logins per second per core for the configured hashers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Verifications per hasher')
+        parser.add_argument('--target', type=float, help='Peak logins/second to size gunicorn workers for')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        self.stdout.write(f'Preferred hasher: {settings.PASSWORD_HASHER}')
+
+        # Raw verify cost of every enabled hasher, measured as CPU time of this process (one core)
+        for hasher in get_hashers():
+            if isinstance(hasher, PBKDF2SHA1PasswordHasher):
+                continue
+            try:
+                encoded = hasher.encode(PASSWORD, hasher.salt())
+            except ValueError as e:
+                self.stdout.write(f'  {hasher.algorithm:<14} unavailable ({e})')
+                continue
+            start = time.process_time()
+            for _ in range(iterations):
+                hasher.verify(PASSWORD, encoded)
+            per_second = iterations / (time.process_time() - start)
+            self.stdout.write(f'  {hasher.algorithm:<14} {per_second:>8.1f} verifications/s/core')
+
+        # Every login comes from the same client, which the login throttles would stop after a few
+        rest_framework = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {scope: '1000000/s' for scope in settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']},
+        }
+        with override_settings(REST_FRAMEWORK=rest_framework), transaction.atomic():
+            login_rate = self._login_rate(iterations)
+            upgraded = self._check_rehash()
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'Full login (view + hash + token): {login_rate:.1f} logins/s/core')
+        self.stdout.write(f'Legacy hash upgraded on login: {upgraded}')
+
+        if options['target']:
+            cores = math.ceil(options['target'] / login_rate)
+            self.stdout.write(self.style.SUCCESS(
+                f'{options["target"]:.0f} logins/s needs about {cores} CPU-bound sync workers (one per core)'
+            ))
+
+    def _create_user(self, password):
+        return User.objects.create(
+            email=f'bench-{uuid.uuid4().hex[:8]}@example.com', name='Benchmark User', role='student', password=password
+        )
+
+    def _login_rate(self, iterations):
+        user = self._create_user(make_password(PASSWORD))
+        factory = RequestFactory()
+        body = json.dumps({'email': user.email, 'password': PASSWORD})
+
+        start = time.process_time()
+        for _ in range(iterations):
+            response = login(factory.post('/api/auth/login/', body, content_type='application/json'))
+            assert response.status_code == 200, response.data
+        return iterations / (time.process_time() - start)
+
+    def _check_rehash(self):
+        """Store a legacy PBKDF2-SHA1 hash and confirm a login rewrites it with the preferred hasher"""
+        legacy = PBKDF2SHA1PasswordHasher()
+        user = self._create_user(legacy.encode(PASSWORD, legacy.salt()))
+        login(RequestFactory().post(
+            '/api/auth/login/', json.dumps({'email': user.email, 'password': PASSWORD}), content_type='application/json'
+        ))
+        user.refresh_from_db()
+        before = legacy.algorithm
+        after = user.password.split('$', 1)[0]
+        return f'{before} -> {after}'
@@ -2,6 +2,10 @@ from rest_framework import serializers
 from users.models import User, StudentProfile, FacultyProfile
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import authenticate
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .tokens import CollegeRefreshToken, add_user_claims
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
@@ -74,3 +78,33 @@ class FacultySetupSerializer(serializers.ModelSerializer):
     class Meta:
         model = FacultyProfile
         fields = ('faculty_id', 'department', 'designation', 'phone', 'specialization')
+
+class CollegeTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh that re-reads the user so new access tokens carry current claims"""
+    token_class = CollegeRefreshToken
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        
+        user = User.objects.filter(pk=refresh[api_settings.USER_ID_CLAIM]).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed('User is inactive or does not exist', code='user_inactive')
+        if refresh.get('ver', user.token_version) != user.token_version:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+        
+        add_user_claims(refresh, user)
+        data = {'access': str(refresh.access_token)}
+        
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    # Blacklist app not installed
+                    pass
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        
+        return data
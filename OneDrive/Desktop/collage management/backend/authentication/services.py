@@ -1,100 +1,227 @@
-from django.core.mail import send_mail
+from django.core.mail import get_connection, EmailMultiAlternatives
 from django.conf import settings
-from contact.models import NotificationLog
-import time
+from django.db import transaction
+from django.utils import timezone
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import timedelta
+from smtplib import SMTPServerDisconnected
+from contact.models import NotificationLog, OutboundNotification, ContactSubmission
+from users.models import StudentProfile
+from college_system.metrics import external_call
+from .sms import get_sms_backend, truncate_sms, SMSNotConfigured
 
-def send_email_notification(to_email, subject, message, html_message=None, max_retries=3):
-    """Send email with retry logic"""
-    for attempt in range(max_retries):
-        try:
-            send_mail(
-                subject=subject,
-                message=message,
+def queue_email_notification(to_email, subject, message, html_message=None, submission=None):
+    """Add an email to the outbox; delivery happens in the notification worker"""
+    return OutboundNotification.objects.create(
+        type='email',
+        recipient=to_email,
+        subject=subject,
+        message=message,
+        html_message=html_message,
+        submission=submission
+    )
+
+def queue_sms_notification(to_phone, message, submission=None):
+    """Add an SMS to the outbox; delivery happens in the notification worker"""
+    return OutboundNotification.objects.create(
+        type='sms',
+        recipient=to_phone,
+        message=truncate_sms(message),
+        submission=submission
+    )
+
+async def aqueue_email_notification(to_email, subject, message, html_message=None, submission=None):
+    """Async variant of queue_email_notification for the ASGI views"""
+    return await OutboundNotification.objects.acreate(
+        type='email',
+        recipient=to_email,
+        subject=subject,
+        message=message,
+        html_message=html_message,
+        submission=submission
+    )
+
+async def aqueue_sms_notification(to_phone, message, submission=None):
+    """Async variant of queue_sms_notification for the ASGI views"""
+    return await OutboundNotification.objects.acreate(
+        type='sms',
+        recipient=to_phone,
+        message=truncate_sms(message),
+        submission=submission
+    )
+
+def _claim_notifications(batch_size, lease_seconds):
+    """Lock a batch of due notifications so concurrent workers skip them"""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboundNotification.objects.select_for_update(skip_locked=True)
+            .filter(status__in=('pending', 'processing'), next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        # Rows stay claimed until the lease expires, so a crashed worker's batch is picked up again
+        OutboundNotification.objects.filter(id__in=ids).update(
+            status='processing',
+            next_attempt_at=now + timedelta(seconds=lease_seconds)
+        )
+    return list(OutboundNotification.objects.filter(id__in=ids))
+
+def _send_email_batch(notifications):
+    """Send emails over one SMTP connection, returning (error, retryable) per message"""
+    try:
+        connection = get_connection(fail_silently=False)
+        with external_call('email'):
+            connection.open()
+    except Exception as e:
+        return [(str(e), True)] * len(notifications)
+    
+    results = []
+    try:
+        for notification in notifications:
+            message = EmailMultiAlternatives(
+                subject=notification.subject,
+                body=notification.message,
                 from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[to_email],
-                html_message=html_message,
-                fail_silently=False,
+                to=[notification.recipient],
+                connection=connection
             )
-            
-            # Log success
-            NotificationLog.objects.create(
-                type='email',
-                recipient=to_email,
-                content=f"{subject}: {message[:100]}",
-                status='success',
-                retry_count=attempt
-            )
-            return True
-            
-        except Exception as e:
-            if attempt == max_retries - 1:
-                # Log final failure
-                NotificationLog.objects.create(
-                    type='email',
-                    recipient=to_email,
-                    content=f"{subject}: {message[:100]}",
-                    status='failed',
-                    error_message=str(e),
-                    retry_count=attempt + 1
-                )
-                raise
-            # Exponential backoff
-            time.sleep(2 ** attempt)
+            if notification.html_message:
+                message.attach_alternative(notification.html_message, 'text/html')
+            # One message per call so a rejected recipient only fails its own row;
+            # the connection is already open, so send_messages reuses it
+            try:
+                with external_call('email'):
+                    connection.send_messages([message])
+                results.append((None, False))
+            except SMTPServerDisconnected as e:
+                connection.connection = None
+                results.append((str(e), True))
+            except Exception as e:
+                results.append((str(e), True))
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    return results
+
+def _send_sms(notification, sms_backend):
+    try:
+        with external_call('sms'):
+            sms_backend.send(notification.recipient, truncate_sms(notification.message))
+    except SMSNotConfigured as e:
+        return str(e), False
+    except Exception as e:
+        return str(e), True
+    return None, False
+
+def _deliver_batch(notifications, sms_backend, max_workers):
+    """Deliver a batch, returning (error, retryable) for each notification in order"""
+    emails = [n for n in notifications if n.type == 'email']
+    messages = [n for n in notifications if n.type != 'email']
+    
+    # The email batch runs as one task beside the SMS fan-out; all SMS share one backend client
+    # Each task runs in a copy of the caller's context so its external time counts toward the request
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        email_results = pool.submit(copy_context().run, _send_email_batch, emails) if emails else None
+        sms_results = [pool.submit(copy_context().run, _send_sms, n, sms_backend) for n in messages]
+        sms_results = [future.result() for future in sms_results]
+        email_results = email_results.result() if email_results else []
     
-    return False
+    results = dict(zip(map(id, emails), email_results))
+    results.update(zip(map(id, messages), sms_results))
+    return [results[id(n)] for n in notifications]
+
+def _log_content(notification):
+    if notification.type == 'email':
+        return f"{notification.subject}: {notification.message[:100]}"
+    return notification.message
 
-def send_sms_notification(to_phone, message, max_retries=3):
-    """Send SMS with retry logic using Twilio"""
-    from twilio.rest import Client
+def _log_entry(notification, error):
+    return NotificationLog(
+        type=notification.type,
+        recipient=notification.recipient,
+        content=_log_content(notification),
+        status='success' if error is None else 'failed',
+        error_message=error,
+        retry_count=notification.attempts - 1 if error is None else notification.attempts
+    )
+
+def _record_results(notifications, results):
+    """Persist the outcome of a delivery batch and schedule retries, in a fixed number of queries"""
+    now = timezone.now()
+    logs = []
+    sent_flags = {'email_sent': set(), 'sms_sent': set()}
+    
+    for notification, (error, retryable) in zip(notifications, results):
+        notification.attempts += 1
+        notification.last_error = error
+        
+        if error is None:
+            notification.status = 'sent'
+            notification.sent_at = now
+            logs.append(_log_entry(notification, None))
+            if notification.submission_id:
+                flag = 'email_sent' if notification.type == 'email' else 'sms_sent'
+                sent_flags[flag].add(notification.submission_id)
+        elif retryable and notification.attempts < notification.max_attempts:
+            # Exponential backoff, without holding a worker thread while we wait
+            notification.status = 'pending'
+            notification.next_attempt_at = now + timedelta(seconds=2 ** (notification.attempts - 1))
+        else:
+            notification.status = 'failed'
+            logs.append(_log_entry(notification, error))
     
-    # Check if Twilio is configured
-    if not settings.TWILIO_ACCOUNT_SID or not settings.TWILIO_AUTH_TOKEN:
-        NotificationLog.objects.create(
-            type='sms',
-            recipient=to_phone,
-            content=message[:100],
-            status='failed',
-            error_message='Twilio not configured'
+    with transaction.atomic():
+        OutboundNotification.objects.bulk_update(
+            notifications, ['status', 'attempts', 'next_attempt_at', 'sent_at', 'last_error']
         )
-        return False
+        NotificationLog.objects.bulk_create(logs)
+        for flag, submission_ids in sent_flags.items():
+            if submission_ids:
+                ContactSubmission.objects.filter(id__in=submission_ids).update(**{flag: True})
+
+def process_outbox(batch_size=50, max_workers=4, sms_backend=None, lease_seconds=300):
+    """Deliver one batch of due notifications, returning the number processed"""
+    notifications = _claim_notifications(batch_size, lease_seconds)
+    if not notifications:
+        return 0
     
-    client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+    # Provider calls run in the pool; all database writes stay on this thread
+    results = _deliver_batch(notifications, sms_backend or get_sms_backend(), max_workers)
+    _record_results(notifications, results)
     
-    for attempt in range(max_retries):
-        try:
-            # Limit message to 160 characters
-            if len(message) > 160:
-                message = message[:157] + '...'
-            
-            client.messages.create(
-                body=message,
-                from_=settings.TWILIO_PHONE_NUMBER,
-                to=to_phone
-            )
-            
-            # Log success
-            NotificationLog.objects.create(
-                type='sms',
-                recipient=to_phone,
-                content=message,
-                status='success',
-                retry_count=attempt
-            )
-            return True
-            
-        except Exception as e:
-            if attempt == max_retries - 1:
-                # Log final failure
-                NotificationLog.objects.create(
-                    type='sms',
-                    recipient=to_phone,
-                    content=message,
-                    status='failed',
-                    error_message=str(e),
-                    retry_count=attempt + 1
-                )
-                return False
-            # Exponential backoff
-            time.sleep(2 ** attempt)
+    return len(notifications)
+
+def queue_notifications(notifications, batch_size=1000):
+    """Add many unsaved OutboundNotification instances to the outbox with bulk inserts"""
+    return OutboundNotification.objects.bulk_create(notifications, batch_size=batch_size)
+
+def broadcast_announcement(announcement, sms=False, chunk_size=1000):
+    """
+    Queue an announcement for every active student in its program (all programs if blank).
+    Recipients are streamed in chunks so large programs never sit in memory at once.
+    Returns the number of notifications queued.
+    """
+    students = StudentProfile.objects.filter(user__is_active=True)
+    if announcement.program:
+        students = students.filter(program=announcement.program)
     
-    return False
+    subject = f"Announcement: {announcement.title}"
+    sms_message = truncate_sms(f"{announcement.title}: {announcement.content}")
+    queued = 0
+    batch = []
+    for email, phone in students.values_list('user__email', 'phone').iterator(chunk_size=chunk_size):
+        batch.append(OutboundNotification(
+            type='email', recipient=email, subject=subject, message=announcement.content
+        ))
+        if sms and phone:
+            batch.append(OutboundNotification(type='sms', recipient=phone, message=sms_message))
+        if len(batch) >= chunk_size:
+            queued += len(queue_notifications(batch, chunk_size))
+            batch = []
+    if batch:
+        queued += len(queue_notifications(batch, chunk_size))
+    return queued
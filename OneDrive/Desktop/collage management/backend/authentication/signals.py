@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from users.models import User
+from .tokens import set_cached_token_version, token_version_key, REVOKED
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    """Publish the user's token version so revocations apply immediately"""
+    set_cached_token_version(instance)
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    cache.set(token_version_key(instance.pk), REVOKED, settings.TOKEN_VERSION_CACHE_TIMEOUT)
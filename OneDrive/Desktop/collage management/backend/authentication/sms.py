@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Messages sent through the locmem backend, mirrors django.core.mail.outbox
+outbox = []
+
+class SMSNotConfigured(Exception):
+    """Raised when the SMS provider has no credentials; retrying will not help"""
+    pass
+
+class TwilioBackend:
+    """Send SMS through Twilio, reusing one client for the backend's lifetime"""
+
+    def __init__(self):
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from twilio.rest import Client
+            self._client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+        return self._client
+
+    def send(self, to_phone, body):
+        if not settings.TWILIO_ACCOUNT_SID or not settings.TWILIO_AUTH_TOKEN:
+            raise SMSNotConfigured('Twilio not configured')
+        self.client.messages.create(
+            body=body,
+            from_=settings.TWILIO_PHONE_NUMBER,
+            to=to_phone
+        )
+
+class LocmemBackend:
+    """Store SMS in authentication.sms.outbox instead of sending them"""
+
+    def send(self, to_phone, body):
+        outbox.append({'to': to_phone, 'body': body})
+
+def get_sms_backend(backend=None):
+    """Instantiate the configured SMS backend"""
+    return import_string(backend or settings.SMS_BACKEND)()
+
+def truncate_sms(message):
+    """Limit message to 160 characters"""
+    if len(message) > 160:
+        return message[:157] + '...'
+    return message
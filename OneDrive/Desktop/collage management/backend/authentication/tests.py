@@ -1,3 +1,140 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from college_system.throttling import consume
+from contact.models import ContactSubmission, NotificationLog, OutboundNotification
+from .services import _claim_notifications, process_outbox, queue_email_notification, queue_sms_notification
+from .sms import SMSNotConfigured
+
+THROTTLE_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'throttle-tests'}}
+
+@override_settings(CACHES=THROTTLE_CACHES)
+class TokenBucketTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_burst_up_to_capacity_then_refill(self):
+        results = [consume('bucket', 3, 1.0, now=100)[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(consume('bucket', 3, 1.0, now=100), (False, 1.0))
+        self.assertTrue(consume('bucket', 3, 1.0, now=101)[0])
+        self.assertFalse(consume('bucket', 3, 1.0, now=101)[0])
+
+    def test_clock_going_backwards_does_not_refill(self):
+        for _ in range(2):
+            consume('bucket', 2, 1.0, now=100)
+        self.assertFalse(consume('bucket', 2, 1.0, now=99)[0])
+        self.assertFalse(consume('bucket', 2, 1.0, now=100)[0])
+
+    def test_concurrent_requests_do_not_overspend(self):
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: consume('bucket', 10, 0.001, now=100)[0], range(50)))
+        self.assertEqual(results.count(True), 10)
+
+@override_settings(CACHES=THROTTLE_CACHES)
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def login(self, email):
+        return self.client.post('/api/auth/login/', {'email': email, 'password': 'wrong'}, content_type='application/json')
+
+    def test_many_accounts_behind_one_address_can_log_in(self):
+        statuses = {self.login(f'student{n}@example.com').status_code for n in range(40)}
+        self.assertNotIn(429, statuses)
+
+    def test_guessing_one_account_is_throttled(self):
+        statuses = [self.login('student@example.com').status_code for _ in range(6)]
+        self.assertNotIn(429, statuses[:5])
+        self.assertEqual(statuses[5], 429)
+
+class FakeSMSBackend:
+    """Records what is sent; numbers in `failing` raise `error`"""
+
+    def __init__(self, failing=(), error=ConnectionError('provider down')):
+        self.failing = set(failing)
+        self.error = error
+        self.sent = []
+
+    def send(self, to_phone, body):
+        if to_phone in self.failing:
+            raise self.error
+        self.sent.append((to_phone, body))
+
+def make_due(*notifications):
+    OutboundNotification.objects.filter(pk__in=[n.pk for n in notifications]).update(
+        next_attempt_at=timezone.now() - timedelta(seconds=1)
+    )
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.submission = ContactSubmission.objects.create(
+            name='Ann', email='ann@example.com', phone='+911111111111', message='Hello'
+        )
+
+    def test_delivers_emails_and_sms_and_records_the_results(self):
+        email = queue_email_notification('ann@example.com', 'Thanks', 'We got it', submission=self.submission)
+        sms = queue_sms_notification('+911111111111', 'We got it', submission=self.submission)
+        backend = FakeSMSBackend()
+        self.assertEqual(process_outbox(sms_backend=backend), 2)
+
+        self.assertEqual([message.to for message in mail.outbox], [['ann@example.com']])
+        self.assertEqual(backend.sent, [('+911111111111', 'We got it')])
+        for notification in (email, sms):
+            notification.refresh_from_db()
+            self.assertEqual((notification.status, notification.attempts), ('sent', 1))
+        self.assertEqual(NotificationLog.objects.filter(status='success').count(), 2)
+        self.submission.refresh_from_db()
+        self.assertTrue(self.submission.email_sent and self.submission.sms_sent)
+        self.assertEqual(process_outbox(sms_backend=backend), 0)
+
+    def test_claimed_notifications_are_leased(self):
+        notification = queue_sms_notification('+911111111111', 'Hi')
+        self.assertEqual([n.pk for n in _claim_notifications(10, lease_seconds=300)], [notification.pk])
+        # A second worker skips the batch while the lease runs
+        self.assertEqual(_claim_notifications(10, lease_seconds=300), [])
+        # and picks it up again once a crashed worker's lease expires
+        make_due(notification)
+        self.assertEqual([n.pk for n in _claim_notifications(10, lease_seconds=300)], [notification.pk])
+
+    def test_failed_sms_is_retried_with_backoff_then_given_up(self):
+        notification = queue_sms_notification('+912222222222', 'Hi')
+        backend = FakeSMSBackend(failing=['+912222222222'])
+        for attempt in range(1, notification.max_attempts):
+            before = timezone.now()
+            process_outbox(sms_backend=backend)
+            notification.refresh_from_db()
+            self.assertEqual((notification.status, notification.attempts), ('pending', attempt))
+            self.assertGreaterEqual(notification.next_attempt_at, before + timedelta(seconds=2 ** (attempt - 1)))
+            self.assertEqual(process_outbox(sms_backend=backend), 0)
+            make_due(notification)
+        self.assertFalse(NotificationLog.objects.exists())
+
+        process_outbox(sms_backend=backend)
+        notification.refresh_from_db()
+        self.assertEqual((notification.status, notification.last_error), ('failed', 'provider down'))
+        log = NotificationLog.objects.get()
+        self.assertEqual((log.status, log.retry_count), ('failed', notification.max_attempts))
+
+    def test_unconfigured_sms_fails_without_retrying(self):
+        notification = queue_sms_notification('+912222222222', 'Hi', submission=self.submission)
+        backend = FakeSMSBackend(failing=['+912222222222'], error=SMSNotConfigured('Twilio not configured'))
+        process_outbox(sms_backend=backend)
+        notification.refresh_from_db()
+        self.assertEqual((notification.status, notification.attempts), ('failed', 1))
+        self.submission.refresh_from_db()
+        self.assertFalse(self.submission.sms_sent)
+
+    def test_one_failure_does_not_hold_back_the_batch(self):
+        failing = queue_sms_notification('+912222222222', 'Hi')
+        sent = queue_sms_notification('+913333333333', 'Hi')
+        email = queue_email_notification('ann@example.com', 'Hi', 'Hello')
+        process_outbox(sms_backend=FakeSMSBackend(failing=['+912222222222']))
+        statuses = dict(OutboundNotification.objects.values_list('pk', 'status'))
+        self.assertEqual([statuses[n.pk] for n in (failing, sent, email)], ['pending', 'sent', 'sent'])
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import serializers
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import User
+
+# Stored instead of a version for inactive or deleted users; never matches a token
+REVOKED = -1
+
+def token_version_key(user_id):
+    return f'auth:token_version:{user_id}'
+
+def set_cached_token_version(user):
+    cache.set(token_version_key(user.pk), user.token_version if user.is_active else REVOKED, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+
+def get_token_version(user_id):
+    """Current token version for a user, from the cache or one narrow query"""
+    key = token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        row = User.objects.filter(pk=user_id).values_list('is_active', 'token_version').first()
+        version = row[1] if row and row[0] else REVOKED
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+def add_user_claims(token, user):
+    """Embed what request handlers need so they don't have to load the user row"""
+    token['email'] = user.email
+    token['name'] = user.name
+    token['role'] = user.role
+    token['is_setup_complete'] = user.is_setup_complete
+    token['created_at'] = serializers.DateTimeField().to_representation(user.created_at)
+    token['ver'] = user.token_version
+    return token
+
+class CollegeRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the user claims"""
+
+    @classmethod
+    def for_user(cls, user):
+        return add_user_claims(super().for_user(user), user)
+
+class ClaimsUser(TokenUser):
+    """Stateless user backed by access token claims (see add_user_claims)"""
+    is_staff = False
+    is_superuser = False
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from token claims.
+    
+    Revocation (deactivation, role change) is checked against a per-user token
+    version kept in the cache, so steady-state requests do not query the DB.
+    Tokens issued before the claims existed fall back to the default lookup.
+    """
+
+    def get_user(self, validated_token):
+        if 'ver' not in validated_token or api_settings.USER_ID_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        
+        if get_token_version(validated_token[api_settings.USER_ID_CLAIM]) != validated_token['ver']:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+        
+        return ClaimsUser(validated_token)
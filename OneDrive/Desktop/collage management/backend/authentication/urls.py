@@ -1,12 +1,16 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
-from . import views
+from . import views, async_views
+
+# ASGI deployments serve the notification-heavy endpoints with async views
+api = async_views if settings.ASYNC_API_VIEWS else views
 
 urlpatterns = [
-    path('register/', views.register, name='register'),
+    path('register/', api.register, name='register'),
     path('login/', views.login, name='login'),
     path('logout/', views.logout, name='logout'),
-    path('forgot-password/', views.forgot_password, name='forgot-password'),
+    path('forgot-password/', api.forgot_password, name='forgot-password'),
     path('reset-password/', views.reset_password, name='reset-password'),
     path('verify-token/', views.verify_token, name='verify-token'),
     path('refresh-token/', TokenRefreshView.as_view(), name='token-refresh'),
@@ -1,5 +1,5 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -13,33 +13,37 @@ from .serializers import (
     StudentSetupSerializer, FacultySetupSerializer
 )
 from users.models import User, PasswordResetToken, StudentProfile, FacultyProfile
-from contact.models import NotificationLog
-from .services import send_email_notification
+from .services import queue_email_notification
+from .tokens import CollegeRefreshToken
+from .last_login import record_login
+from college_system.throttling import (
+    LoginIPThrottle, LoginEmailThrottle, RegisterIPThrottle,
+    ForgotPasswordIPThrottle, ForgotPasswordEmailThrottle
+)
+
+def _issue_tokens(user):
+    """Refresh/access pair carrying the user's current claims"""
+    refresh = CollegeRefreshToken.for_user(user)
+    return {
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterIPThrottle])
 def register(request):
     """User registration endpoint"""
     serializer = RegisterSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.save()
         
-        # Send welcome email
-        try:
-            send_email_notification(
-                to_email=user.email,
-                subject='Welcome to Adwaita Mission Institute of Technology',
-                message=f'Hello {user.name},\n\nYour account has been created successfully.\n\nRole: {user.role}\nEmail: {user.email}\n\nPlease login to complete your profile setup.'
-            )
-        except Exception as e:
-            # Log but don't fail registration
-            NotificationLog.objects.create(
-                type='email',
-                recipient=user.email,
-                content='Welcome email',
-                status='failed',
-                error_message=str(e)
-            )
+        # Queue welcome email
+        queue_email_notification(
+            to_email=user.email,
+            subject='Welcome to Adwaita Mission Institute of Technology',
+            message=f'Hello {user.name},\n\nYour account has been created successfully.\n\nRole: {user.role}\nEmail: {user.email}\n\nPlease login to complete your profile setup.'
+        )
         
         return Response({
             'message': 'User registered successfully',
@@ -50,25 +54,19 @@ def register(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginEmailThrottle])
 def login(request):
     """User login endpoint"""
     serializer = LoginSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.validated_data['user']
         
-        # Update last login
-        user.last_login = timezone.now()
-        user.save()
-        
-        # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        # Update last login (single column, optionally coalesced/buffered)
+        record_login(user)
         
         return Response({
             'message': 'Login successful',
-            'tokens': {
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-            },
+            'tokens': _issue_tokens(user),
             'user': UserSerializer(user).data
         }, status=status.HTTP_200_OK)
     
@@ -89,6 +87,7 @@ def logout(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([ForgotPasswordIPThrottle, ForgotPasswordEmailThrottle])
 def forgot_password(request):
     """Forgot password endpoint - sends reset token via email"""
     serializer = ForgotPasswordSerializer(data=request.data)
@@ -108,29 +107,17 @@ def forgot_password(request):
                 expires_at=expires_at
             )
             
-            # Send reset email
+            # Queue reset email
             reset_link = f"{request.build_absolute_uri('/')[:-1]}/reset-password?token={token}"
-            try:
-                send_email_notification(
-                    to_email=user.email,
-                    subject='Password Reset Request',
-                    message=f'Hello {user.name},\n\nYou requested a password reset.\n\nClick here to reset: {reset_link}\n\nThis link expires in 1 hour.\n\nIf you did not request this, please ignore this email.'
-                )
-                
-                return Response({
-                    'message': 'Password reset email sent successfully'
-                }, status=status.HTTP_200_OK)
-            except Exception as e:
-                NotificationLog.objects.create(
-                    type='email',
-                    recipient=user.email,
-                    content='Password reset email',
-                    status='failed',
-                    error_message=str(e)
-                )
-                return Response({
-                    'error': 'Failed to send email. Please try again later.'
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            queue_email_notification(
+                to_email=user.email,
+                subject='Password Reset Request',
+                message=f'Hello {user.name},\n\nYou requested a password reset.\n\nClick here to reset: {reset_link}\n\nThis link expires in 1 hour.\n\nIf you did not request this, please ignore this email.'
+            )
+            
+            return Response({
+                'message': 'Password reset email sent successfully'
+            }, status=status.HTTP_200_OK)
                 
         except User.DoesNotExist:
             # Don't reveal if email exists
@@ -189,7 +176,7 @@ def verify_token(request):
 @permission_classes([IsAuthenticated])
 def complete_setup(request):
     """Complete first-time user setup"""
-    user = request.user
+    user = User.objects.get(pk=request.user.id)
     
     if user.is_setup_complete:
         return Response({
@@ -203,7 +190,8 @@ def complete_setup(request):
             user.is_setup_complete = True
             user.save()
             return Response({
-                'message': 'Student profile setup completed'
+                'message': 'Student profile setup completed',
+                'tokens': _issue_tokens(user)
             }, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
@@ -214,7 +202,8 @@ def complete_setup(request):
             user.is_setup_complete = True
             user.save()
             return Response({
-                'message': 'Faculty profile setup completed'
+                'message': 'Faculty profile setup completed',
+                'tokens': _issue_tokens(user)
             }, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
@@ -222,5 +211,6 @@ def complete_setup(request):
         user.is_setup_complete = True
         user.save()
         return Response({
-            'message': 'Admin setup completed'
+            'message': 'Admin setup completed',
+            'tokens': _issue_tokens(user)
         }, status=status.HTTP_200_OK)
@@ -0,0 +1,85 @@
+"""Helpers shared by the async (ASGI) views, mirroring DRF's request/response handling"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework import exceptions, status
+
+from .throttling import check_throttles
+
+def _jwt_authentication():
+    from authentication.tokens import CachedJWTAuthentication
+    return CachedJWTAuthentication()
+
+def parse_json(request):
+    """Parse the JSON body; returns (data, error_response)"""
+    if not request.body:
+        return {}, None
+    try:
+        data = json.loads(request.body)
+    except ValueError as e:
+        return None, error_response(exceptions.ParseError(f'JSON parse error - {e}'))
+    if not isinstance(data, dict):
+        return None, error_response(exceptions.ParseError('Expected a JSON object'))
+    return data, None
+
+def error_response(exc):
+    """Same body shape as college_system.exceptions.custom_exception_handler"""
+    detail = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+    response = JsonResponse({
+        'error': True,
+        'message': str(exc),
+        'details': detail,
+    }, status=exc.status_code)
+    wait = getattr(exc, 'wait', None)
+    if wait is not None:
+        response['Retry-After'] = str(wait)
+    return response
+
+async def athrottle(request, data, throttle_classes):
+    """Returns a 429 response if any throttle rejects the request, else None"""
+    wait = await sync_to_async(check_throttles)(request, data, throttle_classes)
+    if wait is None:
+        return None
+    return error_response(exceptions.Throttled(wait))
+
+def validation_error(serializer):
+    return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+async def aauthenticate(request, allow_query_token=False):
+    """
+    Authenticate the Authorization: Bearer header like the DRF views do;
+    returns (user, token, error_response). EventSource cannot send headers,
+    so streaming endpoints may also accept ?token=<access token>.
+    """
+    authentication = _jwt_authentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None and allow_query_token and request.GET.get('token'):
+        raw_token = request.GET['token'].encode()
+    if raw_token is None:
+        return None, None, error_response(exceptions.NotAuthenticated())
+    
+    try:
+        token = authentication.get_validated_token(raw_token)
+        user = await sync_to_async(authentication.get_user)(token)
+    except exceptions.AuthenticationFailed as e:
+        return None, None, error_response(e)
+    return user, token, None
+
+async def aiterate(iterator):
+    """
+    Async iterator over a sync one, e.g. a streaming response body read from
+    the database. Each item is produced by sync_to_async, on the thread sync
+    views use, so ASGI sends every chunk as it is ready instead of reading the
+    whole iterator into a list first.
+    """
+    iterator = iter(iterator)
+    done = object()
+    try:
+        while (item := await sync_to_async(next)(iterator, done)) is not done:
+            yield item
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close:
+            await sync_to_async(close)()
@@ -11,8 +11,14 @@ def custom_exception_handler(exc, context):
     # Call REST framework's default exception handler first
     response = exception_handler(exc, context)
     
-    # Log the error
-    logger.error(f"Exception: {exc}, Context: {context}")
+    # Log the error with the view and path; unexpected errors get their traceback
+    request = context.get('request')
+    match = getattr(request, 'resolver_match', None)
+    where = f"{match.view_name if match else '-'} ({request.method} {request.path})" if request else '-'
+    if response is None:
+        logger.error(f"Unhandled exception in {where}: {exc!r}", exc_info=exc)
+    else:
+        logger.warning(f"{response.status_code} in {where}: {exc.__class__.__name__}")
     
     if response is not None:
         # Customize the response format
@@ -0,0 +1,277 @@
+"""
+Per-request timing metrics and a Prometheus-style /metrics endpoint.
+
+RequestMetricsMiddleware measures each request's wall time, the number and
+duration of its database queries and the time spent in external calls
+(email, SMS), adds them to the response as a Server-Timing header and folds
+them into in-process histograms labelled by URL route.
+
+Queries are counted by an execute wrapper installed once on every database
+connection (see _instrument); it adds to the RequestMetrics held in a
+context variable, so queries run by sync_to_async threads under ASGI are
+attributed to the right request too. Code that talks to an outside service
+wraps the call in external_call('email'|'sms'). Notifications are delivered
+by the process_notifications worker, not in requests, so their provider time
+shows up in external_call_duration_seconds rather than in Server-Timing.
+
+Histograms are cumulative per process. Each process copies its snapshot into
+the default cache every METRICS_FLUSH_SECONDS, and /metrics adds the other
+processes' snapshots to its own, so a scrape through the load balancer sees
+all gunicorn workers, and the notification worker (which flushes after each
+batch), when the cache is shared (Redis).
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+PROCESSES_KEY = 'metrics:processes'
+
+_current = ContextVar('request_metrics', default=None)
+
+class RequestMetrics:
+    """Counters for the request being served"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.external = {}
+        self._lock = threading.Lock()
+
+    def add_external(self, kind, seconds):
+        # Notifications may be sent from worker threads
+        with self._lock:
+            self.external[kind] = self.external.get(kind, 0.0) + seconds
+
+    def server_timing(self, total):
+        parts = [
+            f'app;dur={total * 1000:.1f}',
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries"',
+        ]
+        parts += [f'{kind};dur={seconds * 1000:.1f}' for kind, seconds in sorted(self.external.items())]
+        return ', '.join(parts)
+
+class Histogram:
+    """Prometheus histogram: cumulative bucket counts, sum and count per label set"""
+
+    def __init__(self, name, help_text, labels, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {labels: [list(counts), total, count] for labels, (counts, total, count) in self._series.items()}
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Wall time per request', ('route', 'method', 'status'), LATENCY_BUCKETS
+)
+REQUEST_DB_QUERIES = Histogram(
+    'http_request_db_queries', 'Database queries per request', ('route', 'method'), QUERY_BUCKETS
+)
+REQUEST_DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', 'Database time per request', ('route', 'method'), LATENCY_BUCKETS
+)
+REQUEST_EXTERNAL_DURATION = Histogram(
+    'http_request_external_duration_seconds', 'Email/SMS time per request', ('route', 'method', 'kind'), LATENCY_BUCKETS
+)
+EXTERNAL_CALL_DURATION = Histogram(
+    'external_call_duration_seconds', 'Duration of each email/SMS provider call', ('kind', 'outcome'), LATENCY_BUCKETS
+)
+HISTOGRAMS = (REQUEST_DURATION, REQUEST_DB_QUERIES, REQUEST_DB_DURATION, REQUEST_EXTERNAL_DURATION, EXTERNAL_CALL_DURATION)
+
+@contextmanager
+def external_call(kind):
+    """Time a call to an outside service and charge it to the current request, if any"""
+    outcome = 'error'
+    start = time.perf_counter()
+    try:
+        yield
+        outcome = 'ok'
+    finally:
+        elapsed = time.perf_counter() - start
+        EXTERNAL_CALL_DURATION.observe(elapsed, kind, outcome)
+        current = _current.get()
+        if current is not None:
+            current.add_external(kind, elapsed)
+
+def _record_query(execute, sql, params, many, context):
+    current = _current.get()
+    if current is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        current.db_time += time.perf_counter() - start
+        current.db_queries += 1
+
+def _instrument(sender=None, connection=None, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+connection_created.connect(_instrument)
+
+def _route(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return '/' + match.route if match.route else match.view_name
+
+# Process identity and cache flushing; the id changes after fork so workers never share one
+_process = {'pid': None, 'id': None, 'flushed': 0.0}
+
+def _process_id():
+    if _process['pid'] != os.getpid():
+        _process.update(pid=os.getpid(), id=f'{os.getpid()}-{uuid.uuid4().hex[:6]}', flushed=0.0)
+    return _process['id']
+
+def _snapshot():
+    return {histogram.name: histogram.snapshot() for histogram in HISTOGRAMS}
+
+def flush(force=False):
+    """Copy this process's histograms into the cache for other processes' /metrics"""
+    process_id = _process_id()
+    now = time.time()
+    if not force and now - _process['flushed'] < settings.METRICS_FLUSH_SECONDS:
+        return
+    _process['flushed'] = now
+    ttl = settings.METRICS_FLUSH_SECONDS * 10
+    try:
+        cache.set(f'metrics:process:{process_id}', _snapshot(), ttl)
+        processes = {pid: seen for pid, seen in (cache.get(PROCESSES_KEY) or {}).items() if now - seen < ttl}
+        processes[process_id] = now
+        cache.set(PROCESSES_KEY, processes, None)
+    except Exception:
+        logger.warning('Could not flush metrics to the cache', exc_info=True)
+
+def _merged_snapshot():
+    merged = _snapshot()
+    try:
+        others = [pid for pid in cache.get(PROCESSES_KEY) or {} if pid != _process_id()]
+        snapshots = cache.get_many([f'metrics:process:{pid}' for pid in others]).values()
+    except Exception:
+        logger.warning('Could not read other processes\' metrics', exc_info=True)
+        snapshots = []
+    for snapshot in snapshots:
+        for name, series in snapshot.items():
+            target = merged.setdefault(name, {})
+            for labels, (counts, total, count) in series.items():
+                if labels in target:
+                    existing = target[labels]
+                    existing[0] = [a + b for a, b in zip(existing[0], counts)]
+                    existing[1] += total
+                    existing[2] += count
+                else:
+                    target[labels] = [list(counts), total, count]
+    return merged
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render():
+    """All histograms in the Prometheus text exposition format"""
+    snapshot = _merged_snapshot()
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.append(f'# HELP {histogram.name} {histogram.help_text}')
+        lines.append(f'# TYPE {histogram.name} histogram')
+        for labels, (counts, total, count) in sorted(snapshot.get(histogram.name, {}).items()):
+            label_text = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(histogram.labels, labels))
+            prefix = label_text + ',' if label_text else ''
+            for bound, bucket_count in zip(histogram.buckets, counts):
+                lines.append(f'{histogram.name}_bucket{{{prefix}le="{bound}"}} {bucket_count}')
+            lines.append(f'{histogram.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            lines.append(f'{histogram.name}_sum{{{label_text}}} {total}')
+            lines.append(f'{histogram.name}_count{{{label_text}}} {count}')
+    return '\n'.join(lines) + '\n'
+
+def metrics_view(request):
+    """Prometheus scrape endpoint; requires `Authorization: Bearer <METRICS_TOKEN>` when one is set"""
+    if settings.METRICS_TOKEN and request.headers.get('Authorization') != f'Bearer {settings.METRICS_TOKEN}':
+        return HttpResponse('Unauthorized\n', status=401, content_type='text/plain')
+    return HttpResponse(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+class RequestMetricsMiddleware:
+    """Record per-request wall, DB and external time; list it first in MIDDLEWARE"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        # Connections opened before this module was imported have no wrapper yet
+        for connection in connections.all(initialized_only=True):
+            _instrument(connection=connection)
+        current = RequestMetrics()
+        token = _current.set(current)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, current)
+
+    async def __acall__(self, request):
+        current = RequestMetrics()
+        token = _current.set(current)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, current)
+
+    def _finish(self, request, response, current):
+        total = time.perf_counter() - current.start
+        route = _route(request)
+        REQUEST_DURATION.observe(total, route, request.method, str(response.status_code))
+        REQUEST_DB_QUERIES.observe(current.db_queries, route, request.method)
+        REQUEST_DB_DURATION.observe(current.db_time, route, request.method)
+        for kind, seconds in current.external.items():
+            REQUEST_EXTERNAL_DURATION.observe(seconds, route, request.method, kind)
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = current.server_timing(total)
+            # Browsers only expose Server-Timing to cross-origin pages listed here
+            origin = request.headers.get('Origin')
+            if origin and origin in settings.CORS_ALLOWED_ORIGINS:
+                response['Timing-Allow-Origin'] = origin
+        flush()
+        return response
@@ -0,0 +1,162 @@
+"""
+Publish/subscribe for live updates pushed to the portals.
+
+publish() is called from ordinary sync code (usually in transaction.on_commit);
+subscribers are asyncio tasks in the ASGI app, each waiting on its own
+asyncio.Queue, so an idle connection costs no threads and no queries.
+
+LocalBroker delivers within one process and doubles as the fake for tests.
+RedisBroker fans out across processes and hosts: every process keeps one
+pattern subscription to Redis and hands messages to its local subscribers.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """Messages for a set of channels, delivered to one asyncio consumer"""
+
+    def __init__(self, broker, channels, maxsize=100):
+        self.broker = broker
+        self.channels = tuple(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, message):
+        """Thread-safe; may be called from any thread"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # Event loop already closed; the subscriber is gone
+            pass
+
+    def _put(self, message):
+        # A slow consumer loses its oldest messages rather than growing without bound
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """Next message, or None if nothing arrives within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def drain(self):
+        """Messages already queued, without waiting"""
+        messages = []
+        while not self.queue.empty():
+            messages.append(self.queue.get_nowait())
+        return messages
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+class LocalBroker:
+    """In-process broker: publishers and subscribers must share the process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+    async def subscribe(self, channels):
+        subscription = Subscription(self, channels)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return len({subscription for subscribers in self._subscribers.values() for subscription in subscribers})
+
+class RedisBroker:
+    """Redis PUBLISH/PSUBSCRIBE fan-out with one Redis subscription per process"""
+    prefix = 'live:'
+
+    def __init__(self, url=None):
+        self.url = url or settings.REDIS_URL
+        self._local = LocalBroker()
+        self._client = None
+        self._listener = None
+
+    def publish(self, channel, message):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(self.prefix + channel, json.dumps(message))
+
+    async def subscribe(self, channels):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return await self._local.subscribe(channels)
+
+    def unsubscribe(self, subscription):
+        self._local.unsubscribe(subscription)
+
+    def subscriber_count(self):
+        return self._local.subscriber_count()
+
+    async def _listen(self):
+        import redis.asyncio as aioredis
+        while True:
+            client = aioredis.Redis.from_url(self.url)
+            try:
+                pubsub = client.pubsub()
+                await pubsub.psubscribe(self.prefix + '*')
+                async for item in pubsub.listen():
+                    if item['type'] == 'pmessage':
+                        channel = item['channel'].decode()[len(self.prefix):]
+                        self._local.publish(channel, json.loads(item['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Redis pub/sub listener failed; reconnecting')
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+_broker = None
+_broker_lock = threading.Lock()
+
+def get_broker():
+    """The process-wide broker configured by settings.PUBSUB_BACKEND"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.PUBSUB_BACKEND)()
+    return _broker
+
+def publish_on_commit(channel, message):
+    """Publish once the current transaction commits, so subscribers never see rolled-back data"""
+    def send():
+        try:
+            get_broker().publish(channel, message)
+        except Exception:
+            logger.exception('Failed to publish live event on %s', channel)
+    transaction.on_commit(send)
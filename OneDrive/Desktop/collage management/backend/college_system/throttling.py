@@ -0,0 +1,194 @@
+"""
+Token-bucket throttling for the public (AllowAny) endpoints.
+
+Each scope in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] is read as
+"<capacity>/<period>": a bucket holds up to `capacity` requests and refills
+continuously at capacity/period per second, so short bursts are allowed while
+the sustained rate stays bounded. Buckets live in Django's default cache; if
+that cache is unreachable, a process-local memory cache is used instead so
+requests are still throttled (per worker) rather than failing.
+
+Taking a token is a read-modify-write, so concurrent requests must not both
+read the same bucket. On Redis it runs as one Lua script; the local memory
+caches are only shared by the threads of one process, which a lock covers.
+"""
+import hashlib
+import logging
+import threading
+import time
+from types import SimpleNamespace
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+_fallback_cache = LocMemCache('throttle-fallback', {'MAX_ENTRIES': 10000})
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+def _cache_call(method, *args, **kwargs):
+    try:
+        return getattr(cache, method)(*args, **kwargs)
+    except Exception:
+        logger.warning('Throttle cache unavailable, using local memory', exc_info=True)
+        return getattr(_fallback_cache, method)(*args, **kwargs)
+
+def parse_rate(rate):
+    """'10/min' -> (capacity 10, refill 10/60 tokens per second)"""
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+# KEYS[1] = bucket, ARGV = capacity, refill rate, now; returns {allowed, tokens left}
+TOKEN_BUCKET_SCRIPT = """
+local capacity, refill_rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+-- Workers' clocks differ a little; never refill for time that went backwards
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * refill_rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(math.max(now, updated)))
+redis.call('EXPIRE', KEYS[1], math.floor((capacity - tokens) / refill_rate) + 1)
+-- Lua numbers come back truncated to integers
+return {allowed, tostring(tokens)}
+"""
+
+_local_lock = threading.Lock()
+
+def consume(key, capacity, refill_rate, now=None):
+    """Take one token from the bucket at `key`; returns (allowed, seconds until a token is available)"""
+    now = time.time() if now is None else now
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    try:
+        if isinstance(backend, RedisCache):
+            allowed, tokens = _consume_redis(backend, key, capacity, refill_rate, now)
+        else:
+            allowed, tokens = _consume_local(backend, key, capacity, refill_rate, now)
+    except Exception:
+        logger.warning('Throttle cache unavailable, using local memory', exc_info=True)
+        allowed, tokens = _consume_local(_fallback_cache, key, capacity, refill_rate, now)
+    return allowed, 0 if allowed else (1 - tokens) / refill_rate
+
+def _consume_redis(backend, key, capacity, refill_rate, now):
+    key = backend.make_and_validate_key(key)
+    client = backend._cache.get_client(key, write=True)
+    allowed, tokens = client.register_script(TOKEN_BUCKET_SCRIPT)(keys=[key], args=[capacity, refill_rate, now])
+    return bool(allowed), float(tokens)
+
+def _consume_local(backend, key, capacity, refill_rate, now):
+    with _local_lock:
+        tokens, updated = backend.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + max(0, now - updated) * refill_rate)
+        
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Keep the bucket until it would be full again, after which it's equivalent to a missing key
+        backend.set(key, (tokens, max(now, updated)), int((capacity - tokens) / refill_rate) + 1)
+    return allowed, tokens
+
+def _count(scope, outcome):
+    key = f'throttle:stats:{scope}:{outcome}'
+    if not _cache_call('add', key, 1, None):
+        try:
+            _cache_call('incr', key)
+        except ValueError:
+            # Evicted between add and incr
+            _cache_call('set', key, 1, None)
+
+def get_throttle_stats():
+    """{scope: {'allowed', 'rejected', 'rejection_rate'}} for every configured scope"""
+    stats = {}
+    for scope in api_settings.DEFAULT_THROTTLE_RATES:
+        allowed = _cache_call('get', f'throttle:stats:{scope}:allowed') or 0
+        rejected = _cache_call('get', f'throttle:stats:{scope}:rejected') or 0
+        total = allowed + rejected
+        stats[scope] = {
+            'allowed': allowed,
+            'rejected': rejected,
+            'rejection_rate': round(rejected / total, 4) if total else 0.0,
+        }
+    return stats
+
+def check_throttles(request, data, throttle_classes):
+    """
+    Run throttle classes outside DRF (for the async views).
+    
+    Returns the longest wait in seconds if any throttle rejects, else None.
+    """
+    shim = SimpleNamespace(META=request.META, data=data)
+    waits = []
+    for throttle_class in throttle_classes:
+        throttle = throttle_class()
+        if not throttle.allow_request(shim, None):
+            waits.append(throttle.wait())
+    return max(waits) if waits else None
+
+class TokenBucketThrottle(BaseThrottle):
+    """Base class: subclasses set `scope` and implement get_ident_value()"""
+    scope = None
+    
+    def __init__(self):
+        self.capacity, self.refill_rate = parse_rate(api_settings.DEFAULT_THROTTLE_RATES[self.scope])
+        self._wait = None
+    
+    def get_ident_value(self, request):
+        raise NotImplementedError('.get_ident_value() must be overridden')
+    
+    def allow_request(self, request, view):
+        ident = self.get_ident_value(request)
+        if not ident:
+            return True
+        
+        digest = hashlib.sha256(ident.encode()).hexdigest()[:32]
+        allowed, self._wait = consume(f'throttle:{self.scope}:{digest}', self.capacity, self.refill_rate)
+        _count(self.scope, 'allowed' if allowed else 'rejected')
+        if not allowed:
+            logger.warning(f"Throttled {self.scope} request from {self.get_ident(request)}")
+        return allowed
+    
+    def wait(self):
+        return self._wait
+
+class IPThrottle(TokenBucketThrottle):
+    """One bucket per client IP (honours NUM_PROXIES like DRF's own throttles)"""
+    
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+class EmailThrottle(TokenBucketThrottle):
+    """One bucket per email address in the request body"""
+    
+    def get_ident_value(self, request):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        return email.strip().lower() if isinstance(email, str) else None
+
+class LoginIPThrottle(IPThrottle):
+    scope = 'login_ip'
+
+class LoginEmailThrottle(EmailThrottle):
+    scope = 'login_email'
+
+class RegisterIPThrottle(IPThrottle):
+    scope = 'register_ip'
+
+class ForgotPasswordIPThrottle(IPThrottle):
+    scope = 'forgot_password_ip'
+
+class ForgotPasswordEmailThrottle(EmailThrottle):
+    scope = 'forgot_password_email'
+
+class ContactIPThrottle(IPThrottle):
+    scope = 'contact_ip'
+
+class ContactEmailThrottle(EmailThrottle):
+    scope = 'contact_email'
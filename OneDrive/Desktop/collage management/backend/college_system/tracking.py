@@ -0,0 +1,54 @@
+"""
+Which fields a save actually changed.
+
+post_save only says that a row was written. Every full save rewrites every
+column (User.save() after set_password or setting is_setup_complete), so
+receivers that rebuild something from a few fields would redo that work for
+nothing. track_changes() remembers those fields' values as instances are
+loaded and saved, and changed_fields() tells a post_save receiver which of
+them the save changed; previous_values() what they held before it.
+"""
+from django.db.models.signals import post_init, pre_save
+
+# model -> attnames tracked for it, by every app that asked
+_tracked = {}
+
+def track_changes(model, fields):
+    """Track `fields` (attnames, so 'user_id' for a foreign key) of `model`; apps may add to each other's"""
+    if model not in _tracked:
+        _tracked[model] = set()
+        uid = f'track_changes:{model._meta.label}'
+        post_init.connect(_remember, sender=model, weak=False, dispatch_uid=uid)
+        pre_save.connect(_compare, sender=model, weak=False, dispatch_uid=uid)
+    _tracked[model].update(fields)
+
+def changed_fields(instance):
+    """The tracked fields the save being handled changed; all of them for a new instance"""
+    return getattr(instance, '_changed_fields', frozenset())
+
+def previous_values(instance):
+    """{field: value before the save} for the changed fields that were loaded; empty for a new instance"""
+    return getattr(instance, '_previous_values', {})
+
+def _values(instance, fields):
+    # Deferred fields are missing from __dict__; reading them would query
+    return {field: instance.__dict__[field] for field in fields if field in instance.__dict__}
+
+def _remember(sender, instance, **kwargs):
+    instance._tracked_values = _values(instance, _tracked[sender])
+
+def _compare(sender, instance, update_fields=None, **kwargs):
+    fields = _tracked[sender]
+    if update_fields is not None:
+        # update_fields holds field names, the snapshot attnames
+        fields = {field for field in fields if sender._meta.get_field(field).name in update_fields}
+    old = getattr(instance, '_tracked_values', {})
+    new = _values(instance, fields)
+    if instance._state.adding:
+        changed = new.keys()
+    else:
+        changed = {field for field, value in new.items() if field not in old or old[field] != value}
+    instance._changed_fields = frozenset(changed)
+    instance._previous_values = {field: old[field] for field in changed if field in old}
+    # The next save is compared with what this one writes
+    instance._tracked_values = {**old, **new}
@@ -4,6 +4,7 @@ URL configuration for college_system project.
 from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
+from .metrics import metrics_view
 
 def api_root(request):
     return JsonResponse({
@@ -12,6 +13,10 @@ def api_root(request):
         'endpoints': {
             'auth': '/api/auth/',
             'contact': '/api/contact/',
+            'faculty': '/api/faculty/',
+            'student': '/api/student/',
+            'admin': '/api/admin/',
+            'search': '/api/search/',
             'admin_panel': '/admin/',
         }
     })
@@ -19,6 +24,11 @@ def api_root(request):
 urlpatterns = [
     path('', api_root, name='api-root'),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('api/auth/', include('authentication.urls')),
     path('api/contact/', include('contact.urls')),
+    path('api/faculty/', include('faculty_portal.urls')),
+    path('api/student/', include('student_portal.urls')),
+    path('api/admin/', include('admin_panel.urls')),
+    path('api/search/', include('search.urls')),
 ]
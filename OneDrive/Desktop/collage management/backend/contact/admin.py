@@ -1,11 +1,13 @@
 from django.contrib import admin
-from .models import ContactSubmission, NotificationLog
+from college_system.admin_utils import IndexedSearchMixin
+from .models import ContactSubmission, NotificationLog, OutboundNotification
 
 @admin.register(ContactSubmission)
-class ContactSubmissionAdmin(admin.ModelAdmin):
+class ContactSubmissionAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ('name', 'email', 'phone', 'status', 'email_sent', 'sms_sent', 'created_at')
     list_filter = ('status', 'email_sent', 'sms_sent', 'created_at')
     search_fields = ('name', 'email', 'phone', 'message')
+    search_kind = 'contact'
     ordering = ('-created_at',)
     readonly_fields = ('created_at',)
     
@@ -31,3 +33,11 @@ class NotificationLogAdmin(admin.ModelAdmin):
     search_fields = ('recipient', 'content')
     ordering = ('-created_at',)
     readonly_fields = ('created_at',)
+
+@admin.register(OutboundNotification)
+class OutboundNotificationAdmin(admin.ModelAdmin):
+    list_display = ('type', 'recipient', 'status', 'attempts', 'next_attempt_at', 'created_at')
+    list_filter = ('type', 'status')
+    search_fields = ('recipient', 'subject')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'sent_at')
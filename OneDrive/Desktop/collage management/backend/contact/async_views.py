@@ -0,0 +1,59 @@
+"""Async version of the contact form endpoint for the ASGI deployment (see authentication/async_views.py)"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework import status
+
+from college_system.async_utils import parse_json, athrottle, validation_error
+from college_system.throttling import ContactIPThrottle, ContactEmailThrottle
+from authentication.services import aqueue_email_notification, aqueue_sms_notification
+from .serializers import ContactSubmissionSerializer
+
+@csrf_exempt
+@require_POST
+async def submit_contact_form(request):
+    """Submit contact form and queue notifications (async)"""
+    data, error = parse_json(request)
+    if error:
+        return error
+    throttled = await athrottle(request, data, [ContactIPThrottle, ContactEmailThrottle])
+    if throttled:
+        return throttled
+    
+    serializer = ContactSubmissionSerializer(data=data)
+    if not serializer.is_valid():
+        return validation_error(serializer)
+    
+    submission = await sync_to_async(serializer.save)()
+    
+    email_message = f"""
+New Contact Form Submission
+
+Name: {submission.name}
+Email: {submission.email}
+Phone: {submission.phone}
+
+Message:
+{submission.message}
+
+Submitted at: {submission.created_at.strftime('%Y-%m-%d %H:%M:%S')}
+"""
+    
+    sms_message = f"New contact from {submission.name}. Email: {submission.email}, Phone: {submission.phone}"
+    
+    # Queue notifications; the worker sets email_sent/sms_sent once delivered
+    await aqueue_email_notification(
+        to_email=settings.CONTACT_EMAIL,
+        subject='New Contact Form Submission - AMIT',
+        message=email_message,
+        submission=submission
+    )
+    await aqueue_sms_notification(settings.CONTACT_PHONE_1, sms_message, submission=submission)
+    await aqueue_sms_notification(settings.CONTACT_PHONE_2, sms_message, submission=submission)
+    
+    return JsonResponse({
+        'message': 'Contact form submitted successfully',
+        'submission': ContactSubmissionSerializer(submission).data
+    }, status=status.HTTP_201_CREATED)
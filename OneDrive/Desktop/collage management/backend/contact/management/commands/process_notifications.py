@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authentication.services import process_outbox
+from college_system import metrics
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued email/SMS notifications from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Notifications claimed per batch')
+        parser.add_argument('--workers', type=int, default=4, help='Concurrent provider calls')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when the queue is empty')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep between polls in --loop mode')
+
+    def handle(self, *args, **options):
+        total = 0
+        try:
+            while True:
+                processed = process_outbox(
+                    batch_size=options['batch_size'],
+                    max_workers=options['workers'],
+                )
+                total += processed
+                # Provider call timings are recorded here, not in the web processes that serve /metrics
+                metrics.flush()
+                if processed:
+                    continue
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        finally:
+            metrics.flush(force=True)
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {total} notifications'))
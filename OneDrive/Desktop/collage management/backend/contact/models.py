@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 import uuid
 
 class ContactSubmission(models.Model):
@@ -51,3 +52,39 @@ class NotificationLog(models.Model):
         
     def __str__(self):
         return f"{self.type} to {self.recipient} - {self.status}"
+
+class OutboundNotification(models.Model):
+    """Queued email/SMS waiting to be delivered by the notification worker"""
+    TYPE_CHOICES = NotificationLog.TYPE_CHOICES
+    
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    type = models.CharField(max_length=10, choices=TYPE_CHOICES)
+    recipient = models.CharField(max_length=255)
+    subject = models.CharField(max_length=255, blank=True)
+    message = models.TextField()
+    html_message = models.TextField(null=True, blank=True)
+    submission = models.ForeignKey(ContactSubmission, on_delete=models.SET_NULL, null=True, blank=True, related_name='notifications')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'notification_outbox'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_due_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.type} to {self.recipient} - {self.status}"
@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, async_views
+
+api = async_views if settings.ASYNC_API_VIEWS else views
 
 urlpatterns = [
-    path('submit/', views.submit_contact_form, name='submit-contact'),
+    path('submit/', api.submit_contact_form, name='submit-contact'),
 ]
@@ -1,3 +1,25 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from .models import CourseOffering, Enrollment
+from .roster import enroll_program_students
 
-# Register your models here.
+class EnrollmentInline(admin.TabularInline):
+    model = Enrollment
+    # A select would list every student in the college
+    raw_id_fields = ('student',)
+    readonly_fields = ('enrolled_at',)
+    extra = 0
+
+@admin.register(CourseOffering)
+class CourseOfferingAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'semester', 'program', 'faculty', 'created_at')
+    list_filter = ('semester', 'program')
+    search_fields = ('subject', 'faculty__faculty_id', 'faculty__user__name')
+    list_select_related = ('faculty__user',)
+    raw_id_fields = ('faculty',)
+    inlines = (EnrollmentInline,)
+    actions = ('enroll_program',)
+
+    @admin.action(description="Enroll the program's students in the offering's semester")
+    def enroll_program(self, request, queryset):
+        enrolled = sum(enroll_program_students(offering) for offering in queryset)
+        self.message_user(request, f'Enrolled {enrolled} students.', messages.SUCCESS)
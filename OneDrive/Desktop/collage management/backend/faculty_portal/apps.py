@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FacultyPortalConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'faculty_portal'
+
+    def ready(self):
+        from . import signals  # noqa: F401
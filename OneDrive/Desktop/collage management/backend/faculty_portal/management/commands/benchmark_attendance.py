@@ -0,0 +1,82 @@
+import time
+import uuid
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from users.models import User, StudentProfile, FacultyProfile, AttendanceRecord
+from faculty_portal.models import CourseOffering, Enrollment
+from faculty_portal.services import mark_attendance
+
+
+class Command(BaseCommand):
+    help = 'Compare per-row attendance writes with the bulk upsert (rows/second)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=120, help='Class size')
+        parser.add_argument('--days', type=int, default=20, help='Number of class days to mark')
+        parser.add_argument('--database', default='default', help='Database alias to benchmark')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        vendor = connections[alias].vendor
+
+        # Everything runs inside one transaction that is rolled back at the end
+        with transaction.atomic(using=alias):
+            faculty, roster = self._create_class(options['students'])
+            days = [date(2000, 1, 1) + timedelta(days=n) for n in range(options['days'])]
+
+            naive = self._time(lambda day: self._mark_per_row(faculty, roster, day), days)
+            AttendanceRecord.objects.filter(faculty=faculty).delete()
+            bulk = self._time(lambda day: mark_attendance(faculty, 'Benchmark', day, roster), days)
+            flipped = [dict(entry, status='absent' if entry['status'] == 'present' else 'present') for entry in roster]
+            upsert = self._time(lambda day: mark_attendance(faculty, 'Benchmark', day, flipped), days)
+
+            transaction.set_rollback(True, using=alias)
+
+        rows = options['students'] * options['days']
+        self.stdout.write(f'{vendor}: {rows} rows ({options["students"]} students x {options["days"]} days)')
+        for label, seconds in (('per-row update_or_create', naive), ('bulk insert', bulk), ('bulk upsert (all conflicts)', upsert)):
+            self.stdout.write(f'  {label:<28} {rows / seconds:>10.0f} rows/s  ({seconds:.3f}s)')
+
+    def _time(self, func, days):
+        start = time.perf_counter()
+        for day in days:
+            func(day)
+        return time.perf_counter() - start
+
+    def _mark_per_row(self, faculty, roster, day):
+        for entry in roster:
+            AttendanceRecord.objects.update_or_create(
+                student=StudentProfile.objects.get(student_id=entry['student_id']),
+                subject='Benchmark',
+                date=day,
+                defaults={'status': entry['status'], 'faculty': faculty},
+            )
+
+    def _create_class(self, size):
+        tag = uuid.uuid4().hex[:8]
+        faculty_user = User.objects.create(email=f'bench-faculty-{tag}@example.com', name='Benchmark Faculty', role='faculty', password='!')
+        faculty = FacultyProfile.objects.create(
+            user=faculty_user, faculty_id=f'BF-{tag}', department='Benchmark',
+            designation='Professor', phone='0000000000', specialization='Benchmark'
+        )
+        users = User.objects.bulk_create([
+            User(email=f'bench-{tag}-{n}@example.com', name=f'Student {n}', role='student', password='!')
+            for n in range(size)
+        ])
+        profiles = StudentProfile.objects.bulk_create([
+            StudentProfile(
+                user=user, student_id=f'BS-{tag}-{n}', program='Benchmark',
+                enrollment_date=date(2000, 1, 1), phone='0000000000', address='-'
+            )
+            for n, user in enumerate(users)
+        ])
+        offering = CourseOffering.objects.create(faculty=faculty, subject='Benchmark', semester=1, program='Benchmark')
+        Enrollment.objects.bulk_create([Enrollment(offering=offering, student=profile) for profile in profiles])
+        roster = [
+            {'student_id': profile.student_id, 'status': 'present' if n % 5 else 'absent'}
+            for n, profile in enumerate(profiles)
+        ]
+        return faculty, roster
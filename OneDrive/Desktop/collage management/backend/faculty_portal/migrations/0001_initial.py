@@ -0,0 +1,52 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:37
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0007_admin_changelist_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseOffering',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('subject', models.CharField(max_length=200)),
+                ('semester', models.IntegerField()),
+                ('program', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_offerings', to='users.facultyprofile')),
+            ],
+            options={
+                'db_table': 'course_offerings',
+                'ordering': ['semester', 'subject'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Enrollment',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('enrolled_at', models.DateTimeField(auto_now_add=True)),
+                ('offering', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='faculty_portal.courseoffering')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='users.studentprofile')),
+            ],
+            options={
+                'db_table': 'enrollments',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='courseoffering',
+            constraint=models.UniqueConstraint(fields=('faculty', 'subject', 'semester'), name='course_offering_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='enrollment',
+            constraint=models.UniqueConstraint(fields=('offering', 'student'), name='enrollment_unique'),
+        ),
+    ]
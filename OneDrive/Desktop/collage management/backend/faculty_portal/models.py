@@ -1,3 +1,40 @@
 from django.db import models
+from users.models import StudentProfile, FacultyProfile
+import uuid
 
-# Create your models here.
+class CourseOffering(models.Model):
+    """One faculty member teaching one subject in one semester"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    faculty = models.ForeignKey(FacultyProfile, on_delete=models.CASCADE, related_name='course_offerings')
+    subject = models.CharField(max_length=200)
+    semester = models.IntegerField()
+    program = models.CharField(max_length=100, blank=True)  # whose students enroll_program_students adds
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'course_offerings'
+        ordering = ['semester', 'subject']
+        constraints = [
+            # Also the index for a faculty member's offerings, with or without subject and semester
+            models.UniqueConstraint(fields=['faculty', 'subject', 'semester'], name='course_offering_unique'),
+        ]
+        
+    def __str__(self):
+        return f"{self.subject} - Semester {self.semester} ({self.faculty_id})"
+
+class Enrollment(models.Model):
+    """A student on an offering's class roster"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    offering = models.ForeignKey(CourseOffering, on_delete=models.CASCADE, related_name='enrollments')
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='enrollments')
+    enrolled_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'enrollments'
+        constraints = [
+            # Leads with offering, so a roster is one index range
+            models.UniqueConstraint(fields=['offering', 'student'], name='enrollment_unique'),
+        ]
+        
+    def __str__(self):
+        return f"{self.student_id} in {self.offering_id}"
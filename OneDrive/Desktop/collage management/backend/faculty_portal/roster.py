@@ -0,0 +1,64 @@
+"""
+Class rosters.
+
+A CourseOffering is one faculty member teaching one subject in one semester
+and its Enrollment rows are the students on the attendance sheet. A roster
+is read through the (offering, student) unique index, so loading it costs
+the same however much attendance has been recorded for the class.
+
+Rosters are cached per offering as compact {student_id, name} rows.
+Enrollment changes, student id and name changes drop the entry (see
+signals.py); bulk enrollment through enroll() drops it on commit.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from users.models import StudentProfile
+from .models import Enrollment
+
+def roster_cache_key(offering_id):
+    return f'roster:{offering_id}'
+
+def invalidate_rosters(offering_ids):
+    cache.delete_many([roster_cache_key(offering_id) for offering_id in offering_ids])
+
+def invalidate_student_rosters(student_ids):
+    """invalidate_rosters for every offering the given StudentProfile primary keys are enrolled in"""
+    invalidate_rosters(set(
+        Enrollment.objects.filter(student_id__in=student_ids).values_list('offering_id', flat=True)
+    ))
+
+def get_roster(offering_id):
+    """Active students enrolled in the offering, ordered by student id"""
+    key = roster_cache_key(offering_id)
+    roster = cache.get(key)
+    if roster is None:
+        roster = [
+            {'student_id': student_id, 'name': name}
+            for student_id, name in Enrollment.objects.filter(
+                offering_id=offering_id, student__user__is_active=True
+            ).order_by('student__student_id').values_list('student__student_id', 'student__user__name')
+        ]
+        cache.set(key, roster, settings.ROSTER_CACHE_TIMEOUT)
+    return roster
+
+def enroll(offering, student_ids):
+    """Enroll StudentProfile primary keys in `offering`; returns how many were not enrolled already"""
+    with transaction.atomic():
+        enrolled = set(Enrollment.objects.filter(offering=offering, student_id__in=student_ids).values_list('student_id', flat=True))
+        created = Enrollment.objects.bulk_create(
+            [Enrollment(offering=offering, student_id=pk) for pk in set(student_ids) if pk not in enrolled],
+            ignore_conflicts=True,
+        )
+        # bulk_create skips the post_save signal that drops the cached roster
+        transaction.on_commit(lambda: invalidate_rosters([offering.pk]))
+    return len(created)
+
+def enroll_program_students(offering):
+    """Enroll every student of the offering's program who is in its semester"""
+    if not offering.program:
+        return 0
+    return enroll(offering, list(StudentProfile.objects.filter(
+        program=offering.program, current_semester=offering.semester
+    ).values_list('id', flat=True)))
@@ -0,0 +1,40 @@
+from rest_framework import serializers
+from users.archive import closed_before
+from users.models import AttendanceRecord, Announcement
+from .models import CourseOffering
+
+def validate_open_date(value):
+    """Closed academic years have moved to the attendance archive"""
+    closed = closed_before()
+    if closed is not None and value < closed:
+        raise serializers.ValidationError(
+            f'Attendance before {closed.isoformat()} is archived and can no longer be changed.'
+        )
+
+class AttendanceEntrySerializer(serializers.Serializer):
+    student_id = serializers.CharField(max_length=50)
+    status = serializers.ChoiceField(choices=AttendanceRecord.STATUS_CHOICES)
+
+class MarkAttendanceSerializer(AttendanceEntrySerializer):
+    subject = serializers.CharField(max_length=200)
+    date = serializers.DateField(validators=[validate_open_date])
+
+class BulkAttendanceSerializer(serializers.Serializer):
+    subject = serializers.CharField(max_length=200)
+    date = serializers.DateField(validators=[validate_open_date])
+    records = AttendanceEntrySerializer(many=True, allow_empty=False, max_length=1000)
+
+class AnnouncementSerializer(serializers.ModelSerializer):
+    notify_sms = serializers.BooleanField(default=False, write_only=True)
+    
+    class Meta:
+        model = Announcement
+        fields = ('id', 'title', 'content', 'program', 'is_active', 'created_at', 'notify_sms')
+        read_only_fields = ('id', 'is_active', 'created_at')
+
+class CourseOfferingSerializer(serializers.ModelSerializer):
+    student_count = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = CourseOffering
+        fields = ('id', 'subject', 'semester', 'program', 'student_count')
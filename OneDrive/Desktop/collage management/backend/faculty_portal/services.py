@@ -0,0 +1,98 @@
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from users.archive import is_closed
+from users.models import StudentProfile, AttendanceRecord
+from users.services import apply_attendance_deltas, lock_attendance_summaries
+from student_portal.dashboard import invalidate_dashboards
+from student_portal.live import publish_attendance
+from .models import Enrollment
+
+def mark_attendance(faculty, subject, date, entries):
+    """
+    Upsert attendance for one subject and date in a single statement.
+    
+    `entries` is a list of {'student_id', 'status'} dicts. Only students
+    enrolled in one of the faculty member's offerings of `subject` are
+    marked; a record keeps the faculty member who first marked it. Returns
+    one outcome per entry, in input order: created, updated, unchanged,
+    duplicate, not_found or not_enrolled; every entry is closed, and nothing
+    is written, if an archive run has started for `date`.
+    """
+    results = [{'student_id': entry['student_id'], 'status': entry['status']} for entry in entries]
+    
+    # Last entry wins if a student appears twice in the roster
+    latest = {}
+    for index, entry in enumerate(entries):
+        if entry['student_id'] in latest:
+            results[latest[entry['student_id']]]['outcome'] = 'duplicate'
+        latest[entry['student_id']] = index
+    
+    enrolled = Enrollment.objects.filter(offering__faculty=faculty, offering__subject=subject, student=OuterRef('pk'))
+    students = StudentProfile.objects.filter(student_id__in=latest).annotate(enrolled=Exists(enrolled))
+    profiles = {}
+    user_ids = {}
+    not_enrolled = set()
+    for student_id, pk, user_id, is_enrolled in students.values_list('student_id', 'id', 'user_id', 'enrolled'):
+        profiles[student_id] = pk
+        user_ids[pk] = user_id
+        if not is_enrolled:
+            not_enrolled.add(student_id)
+    
+    records = []
+    for student_id, index in latest.items():
+        if student_id not in profiles:
+            results[index]['outcome'] = 'not_found'
+            continue
+        if student_id in not_enrolled:
+            results[index]['outcome'] = 'not_enrolled'
+            continue
+        records.append(AttendanceRecord(
+            student_id=profiles[student_id],
+            faculty=faculty,
+            subject=subject,
+            date=date,
+            status=entries[index]['status'],
+        ))
+    
+    with transaction.atomic():
+        # Held until commit, so a concurrent first mark of the same student waits and then sees this one
+        lock_attendance_summaries(subject, [record.student_id for record in records])
+        # Checked under those locks, which archive chunks wait for (see users/archive.py)
+        if records and is_closed(date):
+            transaction.set_rollback(True)
+            return [dict(result, outcome='closed') for result in results]
+        previous = dict(
+            AttendanceRecord.objects.filter(
+                subject=subject,
+                date=date,
+                student_id__in=[record.student_id for record in records]
+            ).values_list('student_id', 'status')
+        )
+        AttendanceRecord.objects.bulk_create(
+            records,
+            update_conflicts=True,
+            unique_fields=['student', 'subject', 'date'],
+            update_fields=['status', 'marked_at'],
+        )
+        
+        # Keep AttendanceSummary in step with the rows we just wrote
+        deltas = {}
+        student_ids = {pk: student_id for student_id, pk in profiles.items()}
+        for record in records:
+            result = results[latest[student_ids[record.student_id]]]
+            present = 1 if record.status == 'present' else 0
+            if record.student_id not in previous:
+                result['outcome'] = 'created'
+                deltas[record.student_id] = (present, 1)
+            elif previous[record.student_id] != record.status:
+                result['outcome'] = 'updated'
+                deltas[record.student_id] = (present * 2 - 1, 0)
+            else:
+                result['outcome'] = 'unchanged'
+                continue
+            publish_attendance(user_ids[record.student_id], subject, date, record.status)
+        apply_attendance_deltas(subject, deltas)
+        changed = [user_ids[student] for student in deltas]
+        transaction.on_commit(lambda: invalidate_dashboards(changed))
+    
+    return results
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from college_system.tracking import changed_fields, track_changes
+from users.models import User, StudentProfile
+from .models import Enrollment
+from .roster import invalidate_rosters, invalidate_student_rosters
+
+# What a roster shows of the student
+track_changes(StudentProfile, ['student_id'])
+track_changes(User, ['name', 'is_active'])
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def enrollment_changed(sender, instance, **kwargs):
+    invalidate_rosters([instance.offering_id])
+
+@receiver(post_save, sender=StudentProfile)
+def student_profile_changed(sender, instance, created, **kwargs):
+    """Rosters show the student id; a new profile is on no roster yet"""
+    if not created and 'student_id' in changed_fields(instance):
+        invalidate_student_rosters([instance.pk])
+
+@receiver(post_save, sender=User)
+def student_user_changed(sender, instance, created, **kwargs):
+    """Rosters show the name and leave out deactivated students"""
+    if created or instance.role != 'student' or not changed_fields(instance) & {'name', 'is_active'}:
+        return
+    invalidate_student_rosters(StudentProfile.objects.filter(user=instance).values('id'))
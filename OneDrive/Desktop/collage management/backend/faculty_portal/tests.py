@@ -1,3 +1,98 @@
+from datetime import date
+
 from django.test import TestCase
 
-# Create your tests here.
+from users.models import User, StudentProfile, FacultyProfile, AttendanceRecord, AttendanceSummary
+from .models import CourseOffering, Enrollment
+from .services import mark_attendance
+
+DAY = date(2030, 1, 6)
+
+def create_faculty(tag='F1'):
+    user = User.objects.create(email=f'{tag.lower()}@example.com', name=f'Faculty {tag}', role='faculty')
+    return FacultyProfile.objects.create(
+        user=user, faculty_id=tag, department='CSE', designation='Professor', phone='0', specialization='-'
+    )
+
+def create_students(count, program='BCA', prefix='S'):
+    profiles = []
+    for n in range(count):
+        user = User.objects.create(email=f'{prefix.lower()}{n}@example.com', name=f'Student {n}', role='student')
+        profiles.append(StudentProfile.objects.create(
+            user=user, student_id=f'{prefix}-{n}', program=program, enrollment_date=date(2029, 7, 1), phone='0', address='-'
+        ))
+    return profiles
+
+def teach(faculty, students, subject='Maths'):
+    offering = CourseOffering.objects.create(faculty=faculty, subject=subject, semester=1)
+    Enrollment.objects.bulk_create([Enrollment(offering=offering, student=student) for student in students])
+    return offering
+
+def summary(student, subject='Maths'):
+    row = AttendanceSummary.objects.get(student=student, subject=subject)
+    return row.present_count, row.total_count
+
+class MarkAttendanceTests(TestCase):
+    def setUp(self):
+        self.faculty = create_faculty()
+        self.students = create_students(3)
+        teach(self.faculty, self.students)
+
+    def mark(self, statuses, day=DAY, faculty=None):
+        entries = [{'student_id': student_id, 'status': status} for student_id, status in statuses]
+        return [result['outcome'] for result in mark_attendance(faculty or self.faculty, 'Maths', day, entries)]
+
+    def test_first_mark_creates_records_and_summaries(self):
+        outcomes = self.mark([('S-0', 'present'), ('S-1', 'absent')])
+        self.assertEqual(outcomes, ['created', 'created'])
+        self.assertEqual(AttendanceRecord.objects.filter(date=DAY).count(), 2)
+        self.assertEqual(summary(self.students[0]), (1, 1))
+        self.assertEqual(summary(self.students[1]), (0, 1))
+
+    def test_remark_updates_status_without_counting_the_day_twice(self):
+        self.mark([('S-0', 'present'), ('S-1', 'absent')])
+        outcomes = self.mark([('S-0', 'absent'), ('S-1', 'absent')])
+        self.assertEqual(outcomes, ['updated', 'unchanged'])
+        self.assertEqual(summary(self.students[0]), (0, 1))
+        self.assertEqual(summary(self.students[1]), (0, 1))
+        self.assertEqual(AttendanceRecord.objects.get(student=self.students[0], date=DAY).status, 'absent')
+
+    def test_summaries_add_up_over_days(self):
+        for day in range(1, 6):
+            self.mark([('S-0', 'present' if day % 2 else 'absent')], day=date(2030, 1, day))
+        self.assertEqual(summary(self.students[0]), (3, 5))
+
+    def test_duplicates_and_unknown_students(self):
+        outcomes = self.mark([('S-0', 'absent'), ('S-9', 'present'), ('S-0', 'present')])
+        self.assertEqual(outcomes, ['duplicate', 'not_found', 'created'])
+        self.assertEqual(summary(self.students[0]), (1, 1))
+        self.assertFalse(AttendanceSummary.objects.filter(student__student_id='S-9').exists())
+
+    def test_summaries_match_the_records(self):
+        self.mark([('S-0', 'present'), ('S-1', 'present'), ('S-2', 'absent')])
+        self.mark([('S-0', 'absent'), ('S-2', 'present')])
+        self.mark([('S-1', 'absent')], day=date(2030, 1, 7))
+        for student in self.students:
+            records = AttendanceRecord.objects.filter(student=student, subject='Maths')
+            expected = (records.filter(status='present').count(), records.count())
+            self.assertEqual(summary(student), expected)
+
+    def test_only_enrolled_students_are_marked(self):
+        other = create_students(1, program='BBA', prefix='X')[0]
+        outcomes = self.mark([('S-0', 'present'), ('X-0', 'present')])
+        self.assertEqual(outcomes, ['created', 'not_enrolled'])
+        self.assertFalse(AttendanceRecord.objects.filter(student=other).exists())
+
+    def test_faculty_not_teaching_the_subject_cannot_mark(self):
+        outsider = create_faculty('F2')
+        teach(outsider, self.students, subject='Physics')
+        self.assertEqual(self.mark([('S-0', 'present')], faculty=outsider), ['not_enrolled'])
+        self.assertFalse(AttendanceRecord.objects.exists())
+
+    def test_remark_by_a_co_teacher_keeps_the_original_marker(self):
+        self.mark([('S-0', 'present')])
+        colleague = create_faculty('F2')
+        teach(colleague, self.students[:1])
+        self.assertEqual(self.mark([('S-0', 'absent')], faculty=colleague), ['updated'])
+        record = AttendanceRecord.objects.get(student=self.students[0], date=DAY)
+        self.assertEqual((record.status, record.faculty_id), ('absent', self.faculty.pk))
@@ -0,0 +1,12 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('attendance/', views.mark_attendance_single, name='mark-attendance'),
+    path('attendance/bulk/', views.mark_attendance_bulk, name='mark-attendance-bulk'),
+    path('offerings/', views.course_offerings, name='course-offerings'),
+    path('offerings/<uuid:offering_id>/roster/', views.class_roster, name='class-roster'),
+    path('announcements/', views.create_announcement, name='create-announcement'),
+    path('export/attendance/', views.export_records, {'kind': 'attendance'}, name='faculty-export-attendance'),
+    path('export/grades/', views.export_records, {'kind': 'grades'}, name='faculty-export-grades'),
+]
@@ -1,3 +1,156 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Count
+from collections import Counter
 
-# Create your views here.
+from users.models import FacultyProfile
+from users.permissions import IsFaculty
+from users.exports import ExportFilterSerializer, export_response
+from authentication.services import broadcast_announcement
+from .models import CourseOffering
+from .roster import get_roster
+from .serializers import MarkAttendanceSerializer, BulkAttendanceSerializer, AnnouncementSerializer, CourseOfferingSerializer
+from .services import mark_attendance
+
+# An archive run started after the request's date was validated
+ATTENDANCE_CLOSED = 'Attendance for this date is archived and can no longer be changed.'
+
+def _get_faculty(request):
+    return FacultyProfile.objects.filter(user_id=request.user.id).first()
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsFaculty])
+def mark_attendance_single(request):
+    """Mark attendance for one student"""
+    serializer = MarkAttendanceSerializer(data=request.data)
+    if serializer.is_valid():
+        faculty = _get_faculty(request)
+        if faculty is None:
+            return Response({
+                'error': 'Complete your faculty profile setup first'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        data = serializer.validated_data
+        result = mark_attendance(faculty, data['subject'], data['date'], [data])[0]
+        if result['outcome'] == 'not_found':
+            return Response({
+                'error': 'Student not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        if result['outcome'] == 'not_enrolled':
+            return Response({
+                'error': 'Student is not enrolled in a class of yours for this subject'
+            }, status=status.HTTP_403_FORBIDDEN)
+        if result['outcome'] == 'closed':
+            return Response({
+                'error': ATTENDANCE_CLOSED
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'message': 'Attendance marked successfully',
+            'result': result
+        }, status=status.HTTP_201_CREATED if result['outcome'] == 'created' else status.HTTP_200_OK)
+    
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsFaculty])
+def mark_attendance_bulk(request):
+    """Mark attendance for a whole class roster in one request"""
+    serializer = BulkAttendanceSerializer(data=request.data)
+    if serializer.is_valid():
+        faculty = _get_faculty(request)
+        if faculty is None:
+            return Response({
+                'error': 'Complete your faculty profile setup first'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        data = serializer.validated_data
+        results = mark_attendance(faculty, data['subject'], data['date'], data['records'])
+        if results[0]['outcome'] == 'closed':
+            return Response({
+                'error': ATTENDANCE_CLOSED
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'message': 'Attendance marked successfully',
+            'summary': Counter(result['outcome'] for result in results),
+            'results': results
+        }, status=status.HTTP_200_OK)
+    
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsFaculty])
+def course_offerings(request):
+    """Subjects this faculty member teaches, with class sizes"""
+    offerings = CourseOffering.objects.filter(faculty__user_id=request.user.id).annotate(student_count=Count('enrollments'))
+    
+    return Response({
+        'results': CourseOfferingSerializer(offerings, many=True).data
+    }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsFaculty])
+def class_roster(request, offering_id):
+    """The students to mark attendance for, from the cached roster"""
+    offering = CourseOffering.objects.filter(pk=offering_id, faculty__user_id=request.user.id).first()
+    if offering is None:
+        return Response({
+            'error': 'Course offering not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    roster = get_roster(offering.pk)
+    return Response({
+        'offering': {
+            'id': str(offering.pk),
+            'subject': offering.subject,
+            'semester': offering.semester,
+            'program': offering.program,
+        },
+        'count': len(roster),
+        'students': roster
+    }, status=status.HTTP_200_OK)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsFaculty])
+def create_announcement(request):
+    """Post an announcement and queue it for every student in its program"""
+    serializer = AnnouncementSerializer(data=request.data)
+    if serializer.is_valid():
+        faculty = _get_faculty(request)
+        if faculty is None:
+            return Response({
+                'error': 'Complete your faculty profile setup first'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        notify_sms = serializer.validated_data.pop('notify_sms')
+        with transaction.atomic():
+            announcement = serializer.save(faculty=faculty)
+            queued = broadcast_announcement(announcement, sms=notify_sms)
+        
+        return Response({
+            'message': 'Announcement posted successfully',
+            'announcement': AnnouncementSerializer(announcement).data,
+            'notifications_queued': queued
+        }, status=status.HTTP_201_CREATED)
+    
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsFaculty])
+def export_records(request, kind):
+    """Stream the attendance or grades this faculty member recorded as CSV"""
+    serializer = ExportFilterSerializer(data=request.query_params)
+    if serializer.is_valid():
+        faculty = _get_faculty(request)
+        if faculty is None:
+            return Response({
+                'error': 'Complete your faculty profile setup first'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return export_response(kind, serializer.validated_data, faculty=faculty)
+    
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,343 @@
+"""
+Concurrent HTTP load test for the API.
+
+Uses only the standard library (asyncio streams over keep-alive HTTP/1.1
+connections), so it runs anywhere Python does, and reports throughput and
+p50/p95/p99 latency per endpoint.
+
+Scenarios:
+  contact, register, forgot-password
+      Hammer one public endpoint with --requests POSTs over --concurrency
+      connections (compares the WSGI and ASGI profiles).
+  portal
+      Replay portal traffic for --duration seconds: each virtual user logs in
+      as a generated student or faculty member and then browses with think
+      time. Needs a dataset from `python manage.py generate_college_data`,
+      whose output prints the matching --tag/--students/--faculty options.
+
+Relax the throttles for the run, e.g. for the ASGI profile:
+    THROTTLE_CONTACT_IP=1000000/min THROTTLE_CONTACT_EMAIL=1000000/min THROTTLE_LOGIN_IP=1000000/min \
+        gunicorn -c gunicorn_asgi.conf.py college_system.asgi:application
+
+Then:
+    python loadtest.py --scenario contact --concurrency 500 --requests 20000
+    python loadtest.py --scenario portal --tag <tag> --students 20000 --faculty 800 --concurrency 300 --duration 120
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+# Must match users/synthetic.py
+FIRST_CLASS_DAY = date(2000, 1, 3)
+
+def class_days(days, start=FIRST_CLASS_DAY):
+    """Teaching days (Monday to Friday), as generated by users/synthetic.py"""
+    result = []
+    day = start
+    while len(result) < days:
+        if day.weekday() < 5:
+            result.append(day)
+        day += timedelta(days=1)
+    return result
+
+def contact_body(n):
+    return {
+        'name': f'Load Test {n}',
+        'email': f'load-{n}@example.com',
+        'phone': '+919876543210',
+        'message': 'Load test message',
+    }
+
+def register_body(n):
+    return {
+        'email': f'load-{uuid.uuid4().hex[:12]}@example.com',
+        'password': 'LoadTest@12345',
+        'password2': 'LoadTest@12345',
+        'name': f'Load Test {n}',
+        'role': 'student',
+    }
+
+def forgot_password_body(n):
+    return {'email': f'load-{n}@example.com'}
+
+ENDPOINTS = {
+    'contact': ('/api/contact/submit/', contact_body),
+    'register': ('/api/auth/register/', register_body),
+    'forgot-password': ('/api/auth/forgot-password/', forgot_password_body),
+}
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response; returns (status, headers, body)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed by server')
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        body = b''
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            chunk = await reader.readexactly(size + 2)
+            if size == 0:
+                return status, headers, body
+            body += chunk[:-2]
+    return status, headers, await reader.readexactly(int(headers.get('content-length', 0)))
+
+class Connection:
+    """A keep-alive connection that reconnects if the server closes it"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None, headers=None):
+        body = json.dumps(payload).encode() if payload is not None else b''
+        lines = [
+            f'{method} {path} HTTP/1.1',
+            f'Host: {self.host}:{self.port}',
+            'Connection: keep-alive',
+            f'Content-Length: {len(body)}',
+        ]
+        if payload is not None:
+            lines.append('Content-Type: application/json')
+        lines.extend(f'{name}: {value}' for name, value in (headers or {}).items())
+        raw = ('\r\n'.join(lines) + '\r\n\r\n').encode() + body
+
+        for attempt in range(2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                self.writer.write(raw)
+                await self.writer.drain()
+                return await read_response(self.reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class Stats:
+    """Latencies and status codes per endpoint name"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = defaultdict(Counter)
+
+    async def timed(self, name, connection, method, path, payload=None, headers=None):
+        """Make a request and record it; returns (status, headers, body) or None on a transport error"""
+        start = time.perf_counter()
+        try:
+            response = await connection.request(method, path, payload, headers)
+        except Exception as e:
+            self.errors[name][type(e).__name__] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - start)
+        self.statuses[name][response[0]] += 1
+        return response
+
+    def report(self, title, elapsed):
+        print(f'{title} ({elapsed:.1f}s)')
+        print(f'  {"endpoint":<22} {"requests":>9} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"max ms":>8}  status codes')
+        for name in sorted(self.latencies.keys() | self.errors.keys()):
+            latencies = sorted(self.latencies[name])
+            statuses = dict(sorted(self.statuses[name].items()))
+            errors = sum(self.errors[name].values())
+            print(
+                f'  {name:<22} {len(latencies):>9} {len(latencies) / elapsed:>8.1f} '
+                f'{percentile(latencies, 0.50) * 1000:>8.1f} {percentile(latencies, 0.95) * 1000:>8.1f} '
+                f'{percentile(latencies, 0.99) * 1000:>8.1f} {(latencies[-1] if latencies else 0) * 1000:>8.1f}  '
+                f'{statuses}' + (f' errors={dict(self.errors[name])}' if errors else '')
+            )
+
+async def run_endpoint(args, url):
+    """Single public endpoint, fixed number of requests"""
+    path, make_body = ENDPOINTS[args.scenario]
+    counter = itertools.count()
+    stats = Stats()
+
+    async def worker():
+        connection = Connection(url.hostname, url.port or 80)
+        try:
+            while (n := next(counter)) < args.requests:
+                await stats.timed(args.scenario, connection, 'POST', path, make_body(n))
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    stats.report(f'{args.scenario} @ {args.concurrency} connections', time.perf_counter() - start)
+
+# Student dashboard traffic: (name, weight). Announcements are polled with If-None-Match.
+STUDENT_MIX = (
+    ('announcements', 40),
+    ('attendance', 25),
+    ('verify-token', 15),
+    ('grades', 10),
+    ('results', 10),
+)
+
+class PortalUser:
+    """One virtual user: logs in, then browses until the deadline"""
+
+    def __init__(self, args, url, stats, number, rng):
+        self.args = args
+        self.stats = stats
+        self.rng = rng
+        self.connection = Connection(url.hostname, url.port or 80)
+        self.is_faculty = rng.random() < args.faculty_share and args.faculty > 0
+        if self.is_faculty:
+            self.email = f'faculty-{args.tag}-{number % args.faculty}@example.com'
+        else:
+            self.email = f'student-{args.tag}-{number % args.students}@example.com'
+        self.headers = {}
+        self.etag = None
+        # (subject, student ids) per offering, loaded on the first mark
+        self.classes = None
+
+    async def login(self):
+        response = await self.stats.timed('login', self.connection, 'POST', '/api/auth/login/', {
+            'email': self.email,
+            'password': self.args.password,
+        })
+        if response is None or response[0] != 200:
+            return False
+        self.headers = {'Authorization': f"Bearer {json.loads(response[2])['tokens']['access']}"}
+        return True
+
+    async def run(self, deadline):
+        try:
+            if not await self.login():
+                return
+            while time.monotonic() < deadline:
+                if self.is_faculty:
+                    await self.mark_attendance()
+                else:
+                    await self.browse()
+                if self.args.think:
+                    await asyncio.sleep(self.rng.expovariate(1 / self.args.think))
+        finally:
+            self.connection.close()
+
+    async def browse(self):
+        name = self.rng.choices([name for name, _ in STUDENT_MIX], weights=[weight for _, weight in STUDENT_MIX])[0]
+        if name == 'announcements':
+            headers = dict(self.headers, **({'If-None-Match': self.etag} if self.etag else {}))
+            response = await self.stats.timed(name, self.connection, 'GET', '/api/student/announcements/?limit=10', headers=headers)
+            if response is not None and response[0] == 200:
+                self.etag = response[1].get('etag')
+        elif name == 'attendance':
+            await self.stats.timed(name, self.connection, 'GET', '/api/student/attendance/', headers=self.headers)
+        elif name == 'verify-token':
+            await self.stats.timed(name, self.connection, 'GET', '/api/auth/verify-token/', headers=self.headers)
+        elif name == 'grades':
+            await self.stats.timed(name, self.connection, 'GET', '/api/student/grades/', headers=self.headers)
+        else:
+            semester = self.rng.randint(1, max(self.args.semesters - 1, 1))
+            await self.stats.timed(name, self.connection, 'GET', f'/api/student/results/{semester}/', headers=self.headers)
+
+    async def load_classes(self):
+        """The faculty member's offerings and their rosters; attendance can only be marked for these"""
+        response = await self.stats.timed('offerings', self.connection, 'GET', '/api/faculty/offerings/', headers=self.headers)
+        if response is None or response[0] != 200:
+            return
+        for offering in json.loads(response[2])['results']:
+            path = f"/api/faculty/offerings/{offering['id']}/roster/"
+            response = await self.stats.timed('roster', self.connection, 'GET', path, headers=self.headers)
+            if response is not None and response[0] == 200:
+                students = [student['student_id'] for student in json.loads(response[2])['students']]
+                if students:
+                    self.classes.append((offering['subject'], students))
+
+    async def mark_attendance(self):
+        """Re-mark a whole section of one of the faculty member's classes for a day (an upsert over existing rows)"""
+        if self.classes is None:
+            self.classes = []
+            await self.load_classes()
+        if not self.classes:
+            return
+        subject, students = self.rng.choice(self.classes)
+        sections = -(-len(students) // self.args.section_size)
+        section = self.rng.randrange(sections)
+        members = students[section * self.args.section_size:(section + 1) * self.args.section_size]
+        day = self.rng.choice(class_days(self.args.days))
+        await self.stats.timed('attendance-bulk', self.connection, 'POST', '/api/faculty/attendance/bulk/', {
+            'subject': subject,
+            'date': day.isoformat(),
+            'records': [
+                {'student_id': student_id, 'status': 'present' if self.rng.random() < 0.85 else 'absent'}
+                for student_id in members
+            ],
+        }, headers=self.headers)
+
+async def run_portal(args, url):
+    """Mixed student/faculty traffic for a fixed duration"""
+    if not args.tag:
+        raise SystemExit('--tag is required for the portal scenario (see generate_college_data output)')
+    stats = Stats()
+    rng = random.Random(args.seed)
+    users = [PortalUser(args, url, stats, rng.randrange(1 << 30), random.Random(rng.random())) for _ in range(args.concurrency)]
+
+    start = time.perf_counter()
+    deadline = time.monotonic() + args.duration
+    # Stagger logins over the ramp-up so they do not all land in the first second
+    async def start_user(user, delay):
+        await asyncio.sleep(delay)
+        await user.run(deadline)
+
+    ramp = min(args.ramp_up, args.duration)
+    await asyncio.gather(*(start_user(user, ramp * n / len(users)) for n, user in enumerate(users)))
+    faculty = sum(user.is_faculty for user in users)
+    stats.report(f'portal @ {args.concurrency} users ({faculty} faculty)', time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--scenario', choices=sorted([*ENDPOINTS, 'portal']), default='contact')
+    parser.add_argument('--concurrency', type=int, default=500, help='Connections (virtual users for portal)')
+    parser.add_argument('--requests', type=int, default=10000, help='Total requests for single-endpoint scenarios')
+
+    portal = parser.add_argument_group('portal scenario (match the generate_college_data options)')
+    portal.add_argument('--tag', help='Dataset tag printed by generate_college_data')
+    portal.add_argument('--password', default='LoadTest@12345')
+    portal.add_argument('--students', type=int, default=20000)
+    portal.add_argument('--faculty', type=int, default=800)
+    portal.add_argument('--days', type=int, default=42)
+    portal.add_argument('--semesters', type=int, default=3)
+    portal.add_argument('--section-size', type=int, default=60)
+    portal.add_argument('--faculty-share', type=float, default=0.05, help='Fraction of virtual users that are faculty')
+    portal.add_argument('--duration', type=float, default=60, help='Seconds to run')
+    portal.add_argument('--ramp-up', type=float, default=10, help='Seconds over which users log in')
+    portal.add_argument('--think', type=float, default=1.0, help='Mean think time between requests (seconds)')
+    portal.add_argument('--seed', type=int, default=None)
+
+    args = parser.parse_args()
+    url = urlsplit(args.url)
+    asyncio.run(run_portal(args, url) if args.scenario == 'portal' else run_endpoint(args, url))
+
+if __name__ == '__main__':
+    main()
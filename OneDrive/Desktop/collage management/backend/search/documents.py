@@ -0,0 +1,61 @@
+"""
+What gets indexed for each kind of search result.
+
+Each builder turns a model instance into an unsaved SearchDocument. Text is
+reduced to plain words first (see terms), so "john.doe@amit.edu" and
+"S-2024-017" are found by any of their parts on both PostgreSQL and SQLite,
+whose tokenizers would otherwise split them differently.
+"""
+import re
+
+from contact.models import ContactSubmission
+from users.models import StudentProfile, FacultyProfile, Announcement
+from .models import SearchDocument
+
+NON_WORD = re.compile(r'[\W_]+')
+
+def terms(*values):
+    """The words in `values`, lowercased and space separated"""
+    return ' '.join(NON_WORD.sub(' ', str(value)).strip() for value in values if value).lower()
+
+def student_document(profile):
+    user = profile.user
+    return SearchDocument(
+        kind='student', object_id=profile.pk, title=user.name,
+        summary=f'{profile.student_id} · {profile.program} · Semester {profile.current_semester}',
+        keywords=terms(user.name, profile.student_id, user.email), body=terms(profile.program),
+        program=profile.program, is_active=user.is_active,
+    )
+
+def faculty_document(profile):
+    user = profile.user
+    return SearchDocument(
+        kind='faculty', object_id=profile.pk, title=user.name,
+        summary=f'{profile.faculty_id} · {profile.designation}, {profile.department}',
+        keywords=terms(user.name, profile.faculty_id, user.email),
+        body=terms(profile.department, profile.designation, profile.specialization),
+        is_active=user.is_active,
+    )
+
+def announcement_document(announcement):
+    return SearchDocument(
+        kind='announcement', object_id=announcement.pk, title=announcement.title,
+        summary=f'{announcement.program or "All programs"} · {announcement.created_at:%d %b %Y}',
+        keywords=terms(announcement.title), body=terms(announcement.content, announcement.faculty.user.name),
+        program=announcement.program, is_active=announcement.is_active,
+    )
+
+def contact_document(submission):
+    return SearchDocument(
+        kind='contact', object_id=submission.pk, title=submission.name,
+        summary=f'{submission.email} · {submission.created_at:%d %b %Y}',
+        keywords=terms(submission.name, submission.email, submission.phone), body=terms(submission.message),
+    )
+
+# kind -> (source queryset with what the builder reads, builder)
+SOURCES = {
+    'student': (lambda: StudentProfile.objects.select_related('user'), student_document),
+    'faculty': (lambda: FacultyProfile.objects.select_related('user'), faculty_document),
+    'announcement': (lambda: Announcement.objects.select_related('faculty__user'), announcement_document),
+    'contact': (lambda: ContactSubmission.objects.all(), contact_document),
+}
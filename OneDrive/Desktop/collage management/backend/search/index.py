@@ -0,0 +1,203 @@
+"""
+Writing to and querying the search index.
+
+Documents live in search_documents on every database. The full-text index
+depends on the backend:
+
+- PostgreSQL: a tsvector column (keywords weighted A, body B) with a GIN
+  index, ranked with ts_rank
+- SQLite: the FTS5 table search_documents_fts, whose rowid is the document
+  id, ranked with bm25
+- anything else: LIKE over the document text, unranked
+
+Every word of a query must match, each as a prefix, so "jo sm" finds
+"John Smith" while the user is still typing.
+"""
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.core.exceptions import EmptyResultSet, FullResultSet
+from django.db import connections, router, transaction
+from django.db.models import F, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .documents import SOURCES, terms
+from .models import SearchDocument
+
+FTS_TABLE = 'search_documents_fts'
+# bm25 column weights for (keywords, body)
+FTS_WEIGHTS = (10.0, 1.0)
+MAX_QUERY_WORDS = 8
+UPDATE_FIELDS = ['title', 'summary', 'keywords', 'body', 'program', 'is_active', 'updated_at']
+# What index() compares with the stored document, the full-text columns first
+COMPARED_FIELDS = ('keywords', 'body', 'title', 'summary', 'program', 'is_active')
+RESULT_COLUMNS = ('id', 'kind', 'object_id', 'title', 'summary', 'program', 'is_active', 'updated_at')
+
+def query_words(text):
+    """
+    The words of a search box entry, as indexed. Single letters are dropped
+    when there are longer words ("S-2024-017"): as prefixes they match nearly
+    every document and only slow the query down.
+    """
+    words = terms(text).split()
+    return ([word for word in words if len(word) > 1 or word.isdigit()] or words)[:MAX_QUERY_WORDS]
+
+def _vector():
+    config = settings.SEARCH_CONFIG
+    return SearchVector('keywords', weight='A', config=config) + SearchVector('body', weight='B', config=config)
+
+def _tsquery(words):
+    # Words are letters and digits only, so they are safe in to_tsquery syntax
+    return SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=settings.SEARCH_CONFIG)
+
+def _fts_match(words):
+    return ' '.join(f'"{word}"*' for word in words)
+
+def _sync(using, documents, replaced):
+    """
+    Bring the backend's full-text index in line with `documents` after they
+    were written; `replaced` are the ids of those that already had entries
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql' and documents:
+        SearchDocument.objects.using(using).filter(id__in=[d.id for d in documents]).update(search_vector=_vector())
+    elif connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            if replaced:
+                cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(id,) for id in replaced])
+            if documents:
+                cursor.executemany(
+                    f'INSERT INTO {FTS_TABLE} (rowid, keywords, body) VALUES (%s, %s, %s)',
+                    [(d.id, d.keywords, d.body) for d in documents],
+                )
+
+def _delete(documents):
+    connection = connections[documents.db]
+    if connection.vendor == 'sqlite':
+        sql, params = documents.values('id').query.get_compiler(documents.db).as_sql()
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({sql})', params)
+    documents.delete()
+
+def index(kind, objects, new=False):
+    """
+    Add or refresh the documents for `objects`, instances of the kind's
+    model. Documents that would not change are left alone, and only those
+    whose text changed are reindexed. `new` says none has a document yet.
+    """
+    build = SOURCES[kind][1]
+    documents = [build(obj) for obj in objects]
+    if not documents:
+        return
+    using = router.db_for_write(SearchDocument)
+    current = {} if new else {
+        row[0]: row for row in SearchDocument.objects.using(using).filter(
+            kind=kind, object_id__in=[d.object_id for d in documents]
+        ).values_list('object_id', 'id', *COMPARED_FIELDS)
+    }
+    written, reindexed, replaced = [], [], []
+    for document in documents:
+        row = current.get(document.object_id)
+        if row is not None:
+            stored = row[2:]
+            if stored == tuple(getattr(document, field) for field in COMPARED_FIELDS):
+                continue
+            if stored[:2] == (document.keywords, document.body):
+                written.append(document)
+                continue
+            replaced.append(row[1])
+        written.append(document)
+        reindexed.append(document)
+    if not written:
+        return
+    with transaction.atomic(using=using):
+        SearchDocument.objects.using(using).bulk_create(
+            written, update_conflicts=True, unique_fields=['kind', 'object_id'], update_fields=UPDATE_FIELDS
+        )
+        if reindexed and reindexed[0].id is None:
+            # No RETURNING on this backend, so bulk_create left the ids unset
+            ids = dict(SearchDocument.objects.using(using).filter(
+                kind=kind, object_id__in=[d.object_id for d in reindexed]
+            ).values_list('object_id', 'id'))
+            for document in reindexed:
+                document.id = ids[document.object_id]
+        _sync(using, reindexed, replaced)
+
+def remove(kind, object_ids):
+    using = router.db_for_write(SearchDocument)
+    with transaction.atomic(using=using):
+        _delete(SearchDocument.objects.using(using).filter(kind=kind, object_id__in=object_ids))
+
+def rebuild(kinds=None, chunk_size=1000, progress=None):
+    """Reindex every object of `kinds` (default all); `progress(kind, count)` is called per chunk"""
+    using = router.db_for_write(SearchDocument)
+    for kind in kinds or SOURCES:
+        source = SOURCES[kind][0]
+        with transaction.atomic(using=using):
+            _delete(SearchDocument.objects.using(using).filter(kind=kind))
+            objects = source().iterator(chunk_size=chunk_size)
+            while chunk := list(islice(objects, chunk_size)):
+                index(kind, chunk, new=True)
+                if progress:
+                    progress(kind, len(chunk))
+    if connections[using].vendor == 'sqlite':
+        # Without statistics SQLite walks every document of a kind instead of the few full-text matches
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'ANALYZE {SearchDocument._meta.db_table}')
+
+def matching(text, documents=None):
+    """
+    Documents (from `documents`, default all) containing every word of `text`
+    as a prefix, unranked; None when `text` has no words
+    """
+    words = query_words(text)
+    if not words:
+        return None
+    documents = SearchDocument.objects.all() if documents is None else documents
+    vendor = connections[documents.db].vendor
+    if vendor == 'postgresql':
+        return documents.filter(search_vector=_tsquery(words))
+    if vendor == 'sqlite':
+        return documents.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [_fts_match(words)]
+        ))
+    for word in words:
+        documents = documents.filter(Q(keywords__icontains=word) | Q(body__icontains=word))
+    return documents
+
+def search(text, documents=None, limit=20):
+    """The `limit` best matches for `text` among `documents`, each with a `score` (higher is better)"""
+    words = query_words(text)
+    if not words:
+        return []
+    documents = SearchDocument.objects.all() if documents is None else documents
+    vendor = connections[documents.db].vendor
+    if vendor == 'postgresql':
+        query = _tsquery(words)
+        return list(
+            documents.filter(search_vector=query).only(*RESULT_COLUMNS)
+            .annotate(score=SearchRank(F('search_vector'), query)).order_by('-score', 'title')[:limit]
+        )
+    if vendor == 'sqlite':
+        return _fts_search(words, documents, limit)
+    return list(matching(text, documents).only(*RESULT_COLUMNS).annotate(score=Value(0.0)).order_by('title')[:limit])
+
+def _fts_search(words, documents, limit):
+    # Join from the FTS matches so the restriction is checked per match, not per document
+    try:
+        where, params = documents.query.get_compiler(documents.db).compile(documents.query.where)
+    except FullResultSet:
+        where, params = '', []
+    except EmptyResultSet:
+        return []
+    table = SearchDocument._meta.db_table
+    columns = ', '.join(f'"{table}"."{column}"' for column in RESULT_COLUMNS)
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+    sql = (
+        f'SELECT {columns}, -bm25({FTS_TABLE}, {weights}) AS score '
+        f'FROM {FTS_TABLE} JOIN "{table}" ON "{table}"."id" = {FTS_TABLE}.rowid '
+        f'WHERE {FTS_TABLE} MATCH %s{f" AND {where}" if where else ""} '
+        f'ORDER BY score DESC, "{table}"."title" LIMIT %s'
+    )
+    return list(SearchDocument.objects.db_manager(documents.db).raw(sql, [_fts_match(words), *params, limit]))
@@ -0,0 +1,164 @@
+import random
+import statistics
+import time
+from datetime import date
+
+from django.contrib import admin
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from contact.models import ContactSubmission
+from search.index import matching, rebuild, search
+from search.models import SearchDocument
+from users.models import User, StudentProfile, FacultyProfile, Announcement
+
+FIRST_NAMES = (
+    'Aarav', 'Aditi', 'Akash', 'Ananya', 'Arjun', 'Deepa', 'Divya', 'Gautam', 'Ishaan', 'Kavya', 'Krishna', 'Lakshmi',
+    'Meera', 'Mohan', 'Neha', 'Nikhil', 'Pooja', 'Priya', 'Rahul', 'Ravi', 'Rohan', 'Sanjay', 'Sneha', 'Suresh',
+    'Tara', 'Varun', 'Vikram', 'Vishnu', 'Anil', 'Bindu', 'Chitra', 'Gopal', 'Hari', 'Jaya', 'Kiran', 'Manoj',
+)
+LAST_NAMES = (
+    'Nair', 'Menon', 'Pillai', 'Kumar', 'Sharma', 'Iyer', 'Reddy', 'Rao', 'Das', 'Gupta', 'Joseph', 'Thomas',
+    'Varghese', 'Krishnan', 'Mathew', 'Panicker', 'Kurup', 'Warrier', 'Namboothiri', 'George', 'Jacob', 'Abraham',
+)
+WORDS = (
+    'admission', 'fees', 'hostel', 'library', 'examination', 'schedule', 'results', 'semester', 'scholarship',
+    'placement', 'internship', 'workshop', 'seminar', 'holiday', 'timetable', 'laboratory', 'project', 'submission',
+    'deadline', 'attendance', 'transport', 'canteen', 'sports', 'festival', 'certificate', 'transcript', 'refund',
+    'payment', 'registration', 'counselling', 'syllabus', 'assignment', 'practical', 'viva', 'revaluation', 'campus',
+    'department', 'faculty', 'course', 'elective', 'credits', 'grade', 'notice', 'meeting', 'parents', 'alumni',
+    'please', 'kindly', 'regarding', 'request', 'information', 'students', 'today', 'tomorrow', 'week', 'office',
+)
+PROGRAMS = ('B.Tech CSE', 'B.Tech ECE', 'BCA', 'BBA', 'MBA')
+
+# Stock admin search (LIKE '%word%' on every field) as it was before the search index
+LIKE_SEARCH_FIELDS = {
+    'contact': (ContactSubmission, ('name', 'email', 'phone', 'message')),
+    'announcement': (Announcement, ('title', 'content', 'faculty__user__name')),
+    'student': (StudentProfile, ('student_id', 'user__name', 'user__email')),
+    'faculty': (FacultyProfile, ('faculty_id', 'user__name', 'user__email', 'department')),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare admin-style LIKE searches with the full-text search index on a throwaway test database '
+        'filled with synthetic students, faculty, announcements and contact submissions'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=20000)
+        parser.add_argument('--faculty', type=int, default=500)
+        parser.add_argument('--announcements', type=int, default=5000)
+        parser.add_argument('--contacts', type=int, default=20000, help='Contact submissions')
+        parser.add_argument('--rounds', type=int, default=5, help='Timed runs per search; the median is reported')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self._seed(options)
+            start = time.perf_counter()
+            rebuild()
+            self.stdout.write(
+                f'Indexed {SearchDocument.objects.count()} documents in {time.perf_counter() - start:.1f}s '
+                f'({connection.vendor})\n'
+            )
+            self._run(options['rounds'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def _seed(self, options):
+        rng = random.Random(options['seed'])
+        password = make_password(None)
+
+        def name():
+            return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+
+        def text(low, high):
+            return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+        faculty_users = User.objects.bulk_create([
+            User(email=f'faculty{n}@amit.edu', name=name(), role='faculty', password=password)
+            for n in range(options['faculty'])
+        ], batch_size=2000)
+        faculty = FacultyProfile.objects.bulk_create([
+            FacultyProfile(user=user, faculty_id=f'F-{n:05d}', department=rng.choice(PROGRAMS), designation='Professor',
+                           phone='0000000000', specialization=text(1, 3))
+            for n, user in enumerate(faculty_users)
+        ], batch_size=2000)
+        student_users = User.objects.bulk_create([
+            User(email=f'student{n}@amit.edu', name=name(), role='student', password=password)
+            for n in range(options['students'])
+        ], batch_size=2000)
+        StudentProfile.objects.bulk_create([
+            StudentProfile(user=user, student_id=f'S-{2020 + n % 5}-{n:06d}', program=rng.choice(PROGRAMS),
+                           enrollment_date=date(2020 + n % 5, 7, 1), phone='0000000000', address='-')
+            for n, user in enumerate(student_users)
+        ], batch_size=2000)
+        Announcement.objects.bulk_create([
+            Announcement(faculty=rng.choice(faculty), title=text(2, 6).capitalize(), content=text(20, 80),
+                         program=rng.choice(('',) + PROGRAMS))
+            for _ in range(options['announcements'])
+        ], batch_size=2000)
+        ContactSubmission.objects.bulk_create([
+            ContactSubmission(name=name(), email=f'parent{n}@example.com', phone=f'+91{n:010d}', message=text(10, 60))
+            for n in range(options['contacts'])
+        ], batch_size=2000)
+
+    def _run(self, rounds):
+        cases = [
+            ('contact', 'Menon'),
+            ('contact', 'refund'),
+            ('contact', 'hostel fees'),
+            ('announcement', 'revaluation'),
+            ('announcement', 'exam schedule'),
+            ('student', 'Priya'),
+            ('student', 'S-2023-0042'),
+            ('student', 'ra'),
+            ('faculty', 'Iyer'),
+        ]
+        self.stdout.write(
+            f'{"kind":<13} {"search":<16} {"LIKE ms":>9} {"rows":>7} {"index ms":>9} {"rows":>7} '
+            f'{"ranked ms":>10} {"speedup":>8}'
+        )
+        for kind, term in cases:
+            model, search_fields = LIKE_SEARCH_FIELDS[kind]
+            stock = admin.ModelAdmin(model, admin.site)
+            stock.search_fields = search_fields
+            documents = SearchDocument.objects.filter(kind=kind)
+
+            # What a changelist page does with the search: count the matches, fetch the first page
+            def like():
+                queryset, _ = stock.get_search_results(None, model.objects.all(), term)
+                return queryset.count(), list(queryset[:100])
+
+            def indexed():
+                queryset = model.objects.filter(pk__in=matching(term, documents).values('object_id'))
+                return queryset.count(), list(queryset[:100])
+
+            like_ms, (like_rows, _) = self._time(like, rounds)
+            index_ms, (index_rows, _) = self._time(indexed, rounds)
+            ranked_ms, _ = self._time(lambda: search(term, documents), rounds)
+            self.stdout.write(
+                f'{kind:<13} {term:<16} {like_ms:>9.2f} {like_rows:>7} {index_ms:>9.2f} {index_rows:>7} '
+                f'{ranked_ms:>10.2f} {like_ms / index_ms:>7.1f}x'
+            )
+        self.stdout.write(
+            '\nLIKE matches substrings and the index matches word prefixes, so row counts can differ '
+            '(e.g. "ra" inside "Krishnan").'
+        )
+
+    def _time(self, call, rounds):
+        """Median milliseconds over `rounds` runs after one warm-up, and the last result"""
+        result = call()
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            result = call()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings), result
@@ -0,0 +1,26 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from search.documents import SOURCES
+from search.index import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index (after bulk loads that bypass signals, or to recover from drift)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', action='append', dest='kinds', choices=sorted(SOURCES),
+                            help='Only rebuild this kind (repeatable); default all')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Objects indexed per batch')
+
+    def handle(self, *args, **options):
+        counts = Counter()
+
+        def progress(kind, count):
+            counts[kind] += count
+            self.stdout.write(f'  {kind:<14} {counts[kind]:>8}')
+
+        rebuild(options['kinds'], chunk_size=options['chunk_size'], progress=progress)
+        summary = ', '.join(f'{counts[kind]} {kind}' for kind in options['kinds'] or SOURCES)
+        self.stdout.write(self.style.SUCCESS(f'Indexed {summary}'))
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:28
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# The full-text index depends on the backend, so it is created here rather than in Meta.indexes
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE INDEX search_document_vector_idx ON search_documents USING gin (search_vector)')
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE search_documents_fts USING fts5("
+            "keywords, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS search_document_vector_idx')
+    elif vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS search_documents_fts')
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('student', 'Student'), ('faculty', 'Faculty'), ('announcement', 'Announcement'), ('contact', 'Contact submission')], max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('title', models.CharField(max_length=255)),
+                ('summary', models.CharField(blank=True, max_length=255)),
+                ('keywords', models.TextField()),
+                ('body', models.TextField(blank=True)),
+                ('program', models.CharField(blank=True, max_length=100)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+            ],
+            options={
+                'db_table': 'search_documents',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='search_document_unique'),
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
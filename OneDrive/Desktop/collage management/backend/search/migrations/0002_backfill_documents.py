@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# The models whose rows 0001 left unindexed
+SOURCE_MODELS = (
+    ('users', 'StudentProfile'),
+    ('users', 'FacultyProfile'),
+    ('users', 'Announcement'),
+    ('contact', 'ContactSubmission'),
+)
+
+def backfill_documents(apps, schema_editor):
+    """
+    Index what existed before the search app was installed; saves only index
+    what they change, so nothing else would.
+    """
+    if not any(apps.get_model(app, model).objects.exists() for app, model in SOURCE_MODELS):
+        # A new database: skip reading the live models, whose tables may be ahead of this migration
+        return
+    # The documents are built by the app's code, so this uses the live models
+    from search.index import rebuild
+    rebuild()
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('users', '0008_attendance_archive'),
+        ('contact', '0002_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
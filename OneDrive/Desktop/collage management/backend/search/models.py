@@ -0,0 +1,38 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+class SearchDocument(models.Model):
+    """
+    One searchable row per student, faculty member, announcement and contact
+    submission, kept in step by search/signals.py. `keywords` (names, IDs,
+    emails, titles) ranks above `body` (free text); both hold plain words only.
+    """
+    KIND_CHOICES = (
+        ('student', 'Student'),
+        ('faculty', 'Faculty'),
+        ('announcement', 'Announcement'),
+        ('contact', 'Contact submission'),
+    )
+
+    # Integer key: it doubles as the rowid of the SQLite FTS5 table
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.UUIDField()
+    title = models.CharField(max_length=255)
+    summary = models.CharField(max_length=255, blank=True)
+    keywords = models.TextField()
+    body = models.TextField(blank=True)
+    program = models.CharField(max_length=100, blank=True)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # PostgreSQL only (GIN indexed by migration 0001); stays NULL on SQLite, which uses search_documents_fts
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        db_table = 'search_documents'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_document_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+from .models import SearchDocument
+
+KINDS = [kind for kind, _ in SearchDocument.KIND_CHOICES]
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    kinds = serializers.CharField(required=False)  # comma separated, default all the user may search
+    limit = serializers.IntegerField(required=False, default=20, min_value=1, max_value=50)
+    
+    def validate_kinds(self, value):
+        kinds = [kind.strip() for kind in value.split(',') if kind.strip()]
+        unknown = [kind for kind in kinds if kind not in KINDS]
+        if unknown:
+            raise serializers.ValidationError(f'Unknown kinds: {", ".join(unknown)}. Choose from {", ".join(KINDS)}.')
+        return kinds
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField(source='object_id')
+    score = serializers.FloatField()
+    
+    class Meta:
+        model = SearchDocument
+        fields = ('kind', 'id', 'title', 'summary', 'score')
@@ -0,0 +1,93 @@
+from threading import local
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from college_system.tracking import changed_fields, track_changes
+from contact.models import ContactSubmission
+from users.models import User, StudentProfile, FacultyProfile, Announcement
+from .documents import SOURCES
+from .index import index, remove
+
+# Model -> kind, and the fields its document is built from
+INDEXED_MODELS = {
+    StudentProfile: ('student', ('user_id', 'student_id', 'program', 'current_semester')),
+    FacultyProfile: ('faculty', ('user_id', 'faculty_id', 'department', 'designation', 'specialization')),
+    Announcement: ('announcement', ('faculty_id', 'title', 'content', 'program', 'is_active')),
+    ContactSubmission: ('contact', ('name', 'email', 'phone', 'message')),
+}
+# User fields copied into search documents
+USER_FIELDS = ('name', 'email', 'is_active')
+# kind -> lookup from the kind's model to the user whose fields its documents show
+USER_LOOKUPS = {'student': 'user_id__in', 'faculty': 'user_id__in', 'announcement': 'faculty__user_id__in'}
+
+for model, (kind, fields) in INDEXED_MODELS.items():
+    track_changes(model, fields)
+track_changes(User, USER_FIELDS)
+
+# kind -> (object ids, user ids, ids of objects created) waiting for the transaction to commit
+_pending = local()
+
+def reindex_on_commit(kind, object_ids=(), user_ids=(), created=False):
+    """
+    Reindex the objects (and the objects showing the users) once the
+    transaction commits; every save in it shares one index() per kind, e.g.
+    a user and their profile saved together from the admin. Objects are read
+    back then, so a rolled back save leaves no document behind.
+    """
+    pending = getattr(_pending, 'kinds', None)
+    if pending is None:
+        pending = _pending.kinds = {}
+    ids, users, new = pending.setdefault(kind, (set(), set(), set()))
+    ids.update(object_ids)
+    users.update(user_ids)
+    if created:
+        new.update(object_ids)
+    # Runs at once outside a transaction; later callbacks find nothing left
+    transaction.on_commit(_flush)
+
+def _flush():
+    pending, _pending.kinds = getattr(_pending, 'kinds', None), None
+    for kind, (ids, users, new) in (pending or {}).items():
+        found = Q(pk__in=ids)
+        if users:
+            found |= Q(**{USER_LOOKUPS[kind]: users})
+        objects = list(SOURCES[kind][0]().filter(found))
+        index(kind, objects, new=not users and ids <= new)
+        if missing := ids - {obj.pk for obj in objects}:
+            remove(kind, missing)
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_save, sender=FacultyProfile)
+@receiver(post_save, sender=Announcement)
+@receiver(post_save, sender=ContactSubmission)
+def indexed_object_saved(sender, instance, created, **kwargs):
+    kind, fields = INDEXED_MODELS[sender]
+    if not changed_fields(instance).intersection(fields):
+        return
+    if transaction.get_connection().in_atomic_block:
+        reindex_on_commit(kind, [instance.pk], created=created)
+    else:
+        # Already committed, and the instance is what was written
+        index(kind, [instance], new=created)
+
+@receiver(post_delete, sender=StudentProfile)
+@receiver(post_delete, sender=FacultyProfile)
+@receiver(post_delete, sender=Announcement)
+@receiver(post_delete, sender=ContactSubmission)
+def indexed_object_deleted(sender, instance, **kwargs):
+    reindex_on_commit(INDEXED_MODELS[sender][0], [instance.pk])
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    """Reindex the user's documents when their name, email or active flag changed"""
+    # New users have no profile yet
+    if created or instance.role not in ('student', 'faculty') or not changed_fields(instance).intersection(USER_FIELDS):
+        return
+    if instance.role == 'student':
+        reindex_on_commit('student', user_ids=[instance.pk])
+    else:
+        reindex_on_commit('faculty', user_ids=[instance.pk])
+        reindex_on_commit('announcement', user_ids=[instance.pk])
@@ -0,0 +1,67 @@
+from datetime import date
+
+from django.db import transaction
+from django.test import TestCase
+
+from users.models import User, StudentProfile
+from .index import rebuild, search
+from .models import SearchDocument
+
+def create_student(name='Ann Smith', student_id='S-1'):
+    user = User.objects.create(email=f'{student_id.lower()}@example.com', name=name, role='student')
+    return StudentProfile.objects.create(
+        user=user, student_id=student_id, program='BCA', enrollment_date=date(2029, 7, 1), phone='0', address='-'
+    )
+
+def titles(text):
+    return [document.title for document in search(text)]
+
+class SearchIndexTests(TestCase):
+    def test_saved_student_is_found_by_name_and_id(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_student()
+        self.assertEqual(titles('smi'), ['Ann Smith'])
+        self.assertEqual(titles('S-1'), ['Ann Smith'])
+
+    def test_renaming_the_user_reindexes_their_profile(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = create_student()
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.user.name = 'Ann Jones'
+            profile.user.save()
+        self.assertEqual(titles('smith'), [])
+        self.assertEqual(titles('jones'), ['Ann Jones'])
+
+    def test_save_without_indexed_changes_leaves_the_index_alone(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = create_student()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks, self.assertNumQueries(1):
+            profile.phone = '123'
+            profile.save()
+        self.assertEqual(callbacks, [])
+
+    def test_rolled_back_save_leaves_no_document(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    create_student()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertFalse(SearchDocument.objects.exists())
+        self.assertEqual(titles('smith'), [])
+
+    def test_deleted_student_is_no_longer_found(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = create_student()
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.delete()
+        self.assertEqual(titles('smith'), [])
+
+    def test_rebuild_indexes_rows_saved_without_signals(self):
+        # Outside captureOnCommitCallbacks the signals' on_commit reindex never runs
+        profile = create_student()
+        StudentProfile.objects.filter(pk=profile.pk).update(student_id='S-2')
+        self.assertEqual(titles('S-2'), [])
+        rebuild()
+        self.assertEqual(titles('S-2'), ['Ann Smith'])
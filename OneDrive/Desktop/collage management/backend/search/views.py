@@ -0,0 +1,52 @@
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from users.models import StudentProfile
+from .index import search as search_index
+from .models import SearchDocument
+from .serializers import KINDS, SearchQuerySerializer, SearchResultSerializer
+
+# What each role may search; contact submissions are for admins only
+ROLE_KINDS = {
+    'admin': KINDS,
+    'faculty': ['student', 'faculty', 'announcement'],
+    'student': ['faculty', 'announcement'],
+}
+
+def visible_documents(user, kinds):
+    """The documents of `kinds` that `user` may see"""
+    documents = SearchDocument.objects.filter(kind__in=kinds)
+    if user.role == 'admin':
+        return documents
+    documents = documents.filter(is_active=True)
+    if user.role == 'student' and 'announcement' in kinds:
+        program = StudentProfile.objects.filter(user_id=user.id).values_list('program', flat=True).first()
+        documents = documents.filter(~Q(kind='announcement') | Q(program__in=['', program or '']))
+    return documents
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search(request):
+    """Ranked prefix search over students, faculty, announcements and contact submissions"""
+    serializer = SearchQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    allowed = ROLE_KINDS.get(request.user.role, [])
+    kinds = serializer.validated_data.get('kinds') or allowed
+    denied = [kind for kind in kinds if kind not in allowed]
+    if denied:
+        return Response({
+            'error': f'You cannot search {", ".join(denied)}'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    results = search_index(
+        serializer.validated_data['q'], visible_documents(request.user, kinds), serializer.validated_data['limit']
+    )
+    return Response({
+        'query': serializer.validated_data['q'],
+        'results': SearchResultSerializer(results, many=True).data
+    }, status=status.HTTP_200_OK)
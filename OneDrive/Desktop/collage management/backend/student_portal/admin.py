@@ -1,3 +1,10 @@
 from django.contrib import admin
+from .models import SemesterResult
 
-# Register your models here.
+@admin.register(SemesterResult)
+class SemesterResultAdmin(admin.ModelAdmin):
+    list_display = ('student', 'semester', 'sgpa', 'cgpa', 'published_at')
+    list_filter = ('semester',)
+    search_fields = ('student__student_id', 'student__user__name')
+    list_select_related = ('student__user',)
+    readonly_fields = ('published_at', 'updated_at')
@@ -0,0 +1,123 @@
+"""
+Announcement feed for the student dashboard.
+
+Pages are keyset-paginated on (created_at, id), newest first, so every page
+is an index range scan on announcement_feed_idx however deep the reader
+goes. Each response carries an ETag derived from two cached version tokens
+(the feed's and the user's read state), so a dashboard poll with a matching
+If-None-Match is answered with 304 before any query runs.
+"""
+import base64
+import hashlib
+import uuid
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from users.models import Announcement, StudentProfile
+from .models import AnnouncementReadState
+
+FEED_VERSION_KEY = 'announcements:version'
+
+class InvalidCursor(ValueError):
+    pass
+
+def read_version_key(user_id):
+    return f'announcements:read:{user_id}'
+
+def _version(key):
+    """Current version token for `key`; a cache miss starts a new version"""
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(key, version, timeout=None)
+        version = cache.get(key, version)
+    return version
+
+def bump_feed_version():
+    cache.set(FEED_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+def bump_read_version(user_id):
+    cache.set(read_version_key(user_id), uuid.uuid4().hex, timeout=None)
+
+def feed_versions(user_id):
+    """(feed version, user's read-state version); anything derived from both is stale once either changes"""
+    return _version(FEED_VERSION_KEY), _version(read_version_key(user_id))
+
+def feed_etag(user_id, cursor, limit):
+    """ETag for a feed page; computed from the cache only"""
+    feed_version, read_version = feed_versions(user_id)
+    raw = f'{user_id}:{feed_version}:{read_version}:{cursor}:{limit}'
+    return '"%s"' % hashlib.sha1(raw.encode()).hexdigest()
+
+def encode_cursor(announcement):
+    raw = f'{announcement.created_at.isoformat()}|{announcement.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, announcement_id = raw.split('|')
+        return datetime.fromisoformat(created_at), uuid.UUID(announcement_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+def visible_announcements(program):
+    """Active announcements for everyone plus those targeted at `program`"""
+    return Announcement.objects.filter(is_active=True).filter(Q(program='') | Q(program=program))
+
+def serialize_announcement(announcement):
+    """Feed item without the reader's is_read flag; needs faculty__user loaded"""
+    return {
+        'id': str(announcement.id),
+        'title': announcement.title,
+        'content': announcement.content,
+        'program': announcement.program,
+        'faculty': announcement.faculty.user.name,
+        'created_at': announcement.created_at.isoformat(),
+    }
+
+def get_feed(user_id, cursor=None, limit=20):
+    """One page of the feed with per-item read flags and the user's unread count"""
+    program = StudentProfile.objects.filter(user_id=user_id).values_list('program', flat=True).first() or ''
+    read_state = AnnouncementReadState.objects.filter(user_id=user_id).first() or AnnouncementReadState(user_id=user_id)
+    announcements = visible_announcements(program)
+
+    page = announcements.select_related('faculty__user').order_by('-created_at', '-id')
+    if cursor:
+        created_at, announcement_id = decode_cursor(cursor)
+        page = page.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=announcement_id))
+    page = list(page[:limit + 1])
+
+    unread = announcements.exclude(id__in=read_state.read_ids)
+    if read_state.read_until:
+        unread = unread.filter(created_at__gt=read_state.read_until)
+
+    return {
+        'results': [
+            {**serialize_announcement(announcement), 'is_read': read_state.is_read(announcement)}
+            for announcement in page[:limit]
+        ],
+        'next_cursor': encode_cursor(page[limit - 1]) if len(page) > limit else None,
+        'unread_count': unread.count(),
+    }
+
+def mark_read(user_id, announcement_ids=None):
+    """Mark specific announcements read, or everything up to now if no ids are given"""
+    with transaction.atomic():
+        read_state, _ = AnnouncementReadState.objects.select_for_update().get_or_create(user_id=user_id)
+        if announcement_ids is None:
+            read_state.read_until = timezone.now()
+            read_state.read_ids = []
+        else:
+            # Only ids newer than the watermark need to be remembered; prune the rest
+            newer = Announcement.objects.filter(id__in={*read_state.read_ids, *map(str, announcement_ids)})
+            if read_state.read_until:
+                newer = newer.filter(created_at__gt=read_state.read_until)
+            read_state.read_ids = sorted(str(pk) for pk in newer.values_list('id', flat=True))
+        read_state.save()
+    bump_read_version(user_id)
+    return read_state
@@ -0,0 +1,86 @@
+"""
+Live update endpoints for the ASGI deployment.
+
+events() streams server-sent events; poll() is a long-poll fallback that
+returns the next batch of events, or 204 when none arrive in time. Both hold
+only an asyncio.Queue while idle: the student's program is read once per
+connection and nothing touches the database until an event is published.
+"""
+import asyncio
+import json
+import time
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions, status
+
+from college_system.async_utils import aauthenticate, error_response
+from college_system.pubsub import get_broker
+from users.models import StudentProfile
+from .live import student_channels
+
+async def _subscribe(request):
+    """Authenticate a student and subscribe them; returns (subscription, expires_at, error_response)"""
+    user, token, error = await aauthenticate(request, allow_query_token=True)
+    if error:
+        return None, None, error
+    if getattr(user, 'role', None) != 'student':
+        return None, None, error_response(exceptions.PermissionDenied())
+    
+    program = await StudentProfile.objects.filter(user_id=user.id).values_list('program', flat=True).afirst()
+    subscription = await get_broker().subscribe(student_channels(user.id, program or ''))
+    return subscription, token['exp'], None
+
+def _format_event(message):
+    return f"event: {message['type']}\ndata: {json.dumps(message['data'])}\n\n"
+
+@require_GET
+async def events(request):
+    """Server-sent event stream of announcements and attendance updates"""
+    subscription, expires_at, error = await _subscribe(request)
+    if error:
+        return error
+    
+    async def stream():
+        try:
+            yield f"retry: {settings.LIVE_RETRY_MS}\n\n"
+            # End the stream when the access token expires; the client reconnects with a fresh one
+            while (remaining := expires_at - time.time()) > 0:
+                message = await subscription.get(timeout=min(settings.LIVE_HEARTBEAT_SECONDS, remaining))
+                if message is None:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield _format_event(message)
+                for message in subscription.drain():
+                    yield _format_event(message)
+        except asyncio.CancelledError:
+            # Client disconnected
+            raise
+        finally:
+            subscription.close()
+    
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@require_GET
+async def poll(request):
+    """Long-poll: wait up to ?timeout= seconds for events"""
+    try:
+        timeout = min(max(float(request.GET.get('timeout', settings.LIVE_POLL_TIMEOUT)), 0), settings.LIVE_POLL_TIMEOUT)
+    except ValueError:
+        return JsonResponse({'error': 'timeout must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    subscription, _, error = await _subscribe(request)
+    if error:
+        return error
+    
+    try:
+        message = await subscription.get(timeout=timeout)
+        if message is None:
+            return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+        return JsonResponse({'events': [message, *subscription.drain()]})
+    finally:
+        subscription.close()
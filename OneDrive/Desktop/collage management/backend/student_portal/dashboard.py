@@ -0,0 +1,161 @@
+"""
+Everything the student dashboard shows, in one payload.
+
+A cold build runs three queries: the profile with its user and announcement
+read state (select_related), then the attendance summaries and grade rows
+(prefetch_related), each narrowed with only(). SGPA/CGPA are computed from
+the prefetched grade rows in memory.
+
+Recent announcements come from a block cached per program and keyed by the
+feed version, so all students of a program share it and a new or edited
+announcement moves everyone to a fresh block. The block also lists the
+(id, created_at) of every visible announcement, which is all the unread count
+needs. Rebuilding it after an announcement change costs two more queries,
+once per program.
+
+The finished payload is cached per user for DASHBOARD_CACHE_TIMEOUT together
+with the feed and read-state versions it was built from; a warm request
+is answered from the cache without touching the database. Attendance, grade
+and profile changes delete the entry (invalidate_dashboards).
+"""
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from users.models import StudentProfile, AttendanceSummary, GradeRecord
+from .announcements import feed_versions, serialize_announcement, visible_announcements
+from .grading import CohortResult, GradeArrays, GradingScheme
+from .models import AnnouncementReadState
+from .serializers import AttendanceSummarySerializer
+
+RECENT_ANNOUNCEMENTS = 5
+# Shared blocks are replaced whenever the feed version changes, so they can live long
+ANNOUNCEMENT_BLOCK_TIMEOUT = 60 * 60
+
+# Enough of an Announcement for AnnouncementReadState.is_read
+AnnouncementKey = namedtuple('AnnouncementKey', ('id', 'created_at'))
+
+def dashboard_key(user_id):
+    return f'dashboard:{user_id}'
+
+def invalidate_dashboards(user_ids):
+    cache.delete_many([dashboard_key(user_id) for user_id in user_ids])
+
+def invalidate_student_dashboards(student_ids):
+    """invalidate_dashboards for StudentProfile primary keys"""
+    invalidate_dashboards(StudentProfile.objects.filter(pk__in=student_ids).values_list('user_id', flat=True))
+
+def attendance_overview(summaries):
+    """Overall and per-subject attendance from AttendanceSummary rows"""
+    present = sum(summary.present_count for summary in summaries)
+    total = sum(summary.total_count for summary in summaries)
+    return {
+        'overall': {
+            'present_count': present,
+            'total_count': total,
+            'percentage': round(present * 100 / total, 2) if total else None,
+        },
+        # Plain dicts: ReturnList keeps a reference to its serializer, which should not end up in the cache
+        'subjects': [dict(item) for item in AttendanceSummarySerializer(summaries, many=True).data],
+    }
+
+def announcement_block(program, feed_version):
+    """The newest visible announcements for `program` and the keys of all of them, shared per feed version"""
+    key = f'dashboard:announcements:{program}:{feed_version}'
+    block = cache.get(key)
+    if block is None:
+        announcements = visible_announcements(program).order_by('-created_at', '-id')
+        keys = [AnnouncementKey(str(pk), created_at) for pk, created_at in announcements.values_list('id', 'created_at')]
+        recent = announcements.select_related('faculty__user').only(
+            'id', 'title', 'content', 'program', 'created_at', 'faculty__user__name'
+        )[:RECENT_ANNOUNCEMENTS] if keys else []
+        block = {'recent': [serialize_announcement(announcement) for announcement in recent], 'keys': keys}
+        cache.set(key, block, ANNOUNCEMENT_BLOCK_TIMEOUT)
+    return block
+
+def _load_student(user_id):
+    return (
+        StudentProfile.objects
+        .select_related('user', 'user__announcement_read_state')
+        .only(
+            'id', 'student_id', 'program', 'current_semester', 'enrollment_date', 'phone', 'address',
+            'user__id', 'user__name', 'user__email',
+            'user__announcement_read_state__read_until', 'user__announcement_read_state__read_ids',
+        )
+        .prefetch_related(
+            Prefetch(
+                'attendance_summaries',
+                queryset=AttendanceSummary.objects.only('student', 'subject', 'present_count', 'total_count').order_by('subject'),
+            ),
+            Prefetch(
+                'grade_records',
+                queryset=GradeRecord.objects.only(
+                    'student', 'semester', 'subject', 'assessment_type', 'marks_obtained', 'total_marks'
+                ).order_by(),
+            ),
+        )
+        .filter(user_id=user_id)
+        .first()
+    )
+
+def build_dashboard(user_id, feed_version):
+    """The dashboard payload for `user_id`, or None if they have no student profile"""
+    student = _load_student(user_id)
+    if student is None:
+        return None
+    user = student.user
+    try:
+        read_state = user.announcement_read_state
+    except AnnouncementReadState.DoesNotExist:
+        read_state = AnnouncementReadState(user_id=user_id)
+
+    rows = [
+        (grade.student_id, grade.semester, grade.subject, grade.assessment_type, grade.marks_obtained, grade.total_marks)
+        for grade in student.grade_records.all()
+    ]
+    grades = rows and CohortResult(GradeArrays.from_rows(rows), GradingScheme.from_settings()).for_student(student.pk)
+    grades = grades or {'cgpa': None, 'semesters': []}
+    latest = grades['semesters'][-1] if grades['semesters'] else None
+
+    block = announcement_block(student.program, feed_version)
+    return {
+        'profile': {
+            'name': user.name,
+            'email': user.email,
+            'student_id': student.student_id,
+            'program': student.program,
+            'current_semester': student.current_semester,
+            'enrollment_date': student.enrollment_date.isoformat(),
+            'phone': student.phone,
+            'address': student.address,
+        },
+        'attendance': attendance_overview(list(student.attendance_summaries.all())),
+        'grades': {
+            'cgpa': grades['cgpa'],
+            'sgpa': latest['sgpa'] if latest else None,
+            'sgpa_semester': latest['semester'] if latest else None,
+            'semesters': grades['semesters'],
+        },
+        'announcements': {
+            'results': [
+                {**item, 'is_read': read_state.is_read(key)} for item, key in zip(block['recent'], block['keys'])
+            ],
+            'unread_count': sum(1 for key in block['keys'] if not read_state.is_read(key)),
+        },
+        'generated_at': timezone.now().isoformat(),
+    }
+
+def get_dashboard(user_id):
+    """Cached dashboard payload; None if the user has no student profile"""
+    versions = feed_versions(user_id)
+    cached = cache.get(dashboard_key(user_id))
+    if cached is not None and cached['versions'] == versions:
+        return cached['data']
+
+    data = build_dashboard(user_id, versions[0])
+    if data is not None:
+        cache.set(dashboard_key(user_id), {'versions': versions, 'data': data}, settings.DASHBOARD_CACHE_TIMEOUT)
+    return data
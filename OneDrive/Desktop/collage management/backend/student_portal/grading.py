@@ -0,0 +1,181 @@
+"""
+SGPA / CGPA computation over GradeRecord.
+
+Grade rows for a whole cohort are loaded once into NumPy arrays and reduced
+with np.unique / np.bincount, so the cost is a handful of array passes
+regardless of how many students are involved.
+
+Per subject, marks are first pooled per assessment type (sum obtained / sum
+total), then combined with the configured assessment weights over the types
+actually recorded. The subject percentage maps to a grade point through the
+configured bands, and SGPA/CGPA are credit-weighted means of those points.
+"""
+import numpy as np
+from django.conf import settings
+
+from users.models import GradeRecord
+
+class GradingScheme:
+    """Assessment weights, grade-point bands and subject credits"""
+
+    def __init__(self, assessment_weights, grade_bands, subject_credits=None,
+                 default_weight=1.0, default_credits=1.0):
+        self.assessment_weights = {key.lower(): float(value) for key, value in assessment_weights.items()}
+        self.default_weight = float(default_weight)
+        self.subject_credits = {key: float(value) for key, value in (subject_credits or {}).items()}
+        self.default_credits = float(default_credits)
+
+        # Bands are (minimum percentage, grade point); anything below the lowest band scores 0
+        bands = sorted(grade_bands)
+        self.band_minimums = np.array([minimum for minimum, _ in bands], dtype=np.float64)
+        self.band_points = np.array([0.0] + [points for _, points in bands], dtype=np.float64)
+
+    @classmethod
+    def from_settings(cls):
+        return cls(**settings.GRADING)
+
+    def weight_for(self, assessment_type):
+        return self.assessment_weights.get(assessment_type.lower(), self.default_weight)
+
+    def credits_for(self, subject):
+        return self.subject_credits.get(subject, self.default_credits)
+
+    def grade_points(self, percentages):
+        """Vectorized band lookup: percentage array -> grade point array"""
+        return self.band_points[np.searchsorted(self.band_minimums, percentages, side='right')]
+
+class GradeArrays:
+    """Column arrays for a set of grade rows, with string columns factorized to integer codes"""
+
+    def __init__(self, student_ids, semesters, subjects, assessment_types, marks_obtained, total_marks):
+        self.students, self.student_codes = np.unique(np.asarray(student_ids, dtype=object).astype(str), return_inverse=True)
+        self.semesters, self.semester_codes = np.unique(np.asarray(semesters, dtype=np.int64), return_inverse=True)
+        self.subjects, self.subject_codes = np.unique(np.asarray(subjects, dtype=object).astype(str), return_inverse=True)
+        self.assessment_types, self.assessment_codes = np.unique(np.asarray(assessment_types, dtype=object).astype(str), return_inverse=True)
+        self.marks_obtained = np.asarray(marks_obtained, dtype=np.float64)
+        self.total_marks = np.asarray(total_marks, dtype=np.float64)
+
+    @classmethod
+    def from_queryset(cls, queryset=None):
+        """Load grade rows with a single query"""
+        queryset = GradeRecord.objects.all() if queryset is None else queryset
+        return cls.from_rows(list(queryset.values_list(
+            'student_id', 'semester', 'subject', 'assessment_type', 'marks_obtained', 'total_marks'
+        ).order_by()))
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Arrays from (student_id, semester, subject, assessment_type, marks_obtained, total_marks) tuples"""
+        if not rows:
+            return cls([], [], [], [], [], [])
+        return cls(*zip(*rows))
+
+    def __len__(self):
+        return len(self.marks_obtained)
+
+class CohortResult:
+    """Subject grades, SGPA and CGPA for every student in a GradeArrays"""
+
+    def __init__(self, arrays, scheme):
+        self.arrays = arrays
+        self.scheme = scheme
+        n_semesters = max(len(arrays.semesters), 1)
+        n_subjects = max(len(arrays.subjects), 1)
+        n_types = max(len(arrays.assessment_types), 1)
+
+        # Stage 1: pool marks per (student, semester, subject, assessment type)
+        subject_key = (arrays.student_codes * n_semesters + arrays.semester_codes) * n_subjects + arrays.subject_codes
+        type_key = subject_key * n_types + arrays.assessment_codes
+        type_groups, type_inverse = np.unique(type_key, return_inverse=True)
+        obtained = np.bincount(type_inverse, weights=arrays.marks_obtained, minlength=len(type_groups))
+        total = np.bincount(type_inverse, weights=arrays.total_marks, minlength=len(type_groups))
+        # bincount returns integers for empty input, hence the explicit float outputs
+        type_percentage = np.divide(obtained * 100, total, out=np.zeros_like(obtained, dtype=np.float64), where=total > 0)
+
+        # Stage 2: weighted mean over the assessment types present for each subject
+        type_weights = np.array([scheme.weight_for(name) for name in arrays.assessment_types], dtype=np.float64)
+        weights = type_weights[type_groups % n_types] if len(type_weights) else np.zeros(len(type_groups))
+        subject_groups, subject_inverse = np.unique(type_groups // n_types, return_inverse=True)
+        weighted = np.bincount(subject_inverse, weights=weights * type_percentage, minlength=len(subject_groups))
+        weight_sum = np.bincount(subject_inverse, weights=weights, minlength=len(subject_groups))
+        self.percentage = np.divide(weighted, weight_sum, out=np.zeros_like(weighted, dtype=np.float64), where=weight_sum > 0)
+
+        self.subject_code = subject_groups % n_subjects
+        self.semester_code = (subject_groups // n_subjects) % n_semesters
+        self.student_code = subject_groups // (n_subjects * n_semesters)
+        self.grade_point = scheme.grade_points(self.percentage)
+        subject_credits = np.array([scheme.credits_for(name) for name in arrays.subjects], dtype=np.float64)
+        self.credits = subject_credits[self.subject_code] if len(subject_credits) else np.zeros(0)
+
+        # Stage 3: credit-weighted means per (student, semester) and per student
+        points = self.credits * self.grade_point
+        semester_key = self.student_code * n_semesters + self.semester_code
+        self.semester_groups, semester_inverse = np.unique(semester_key, return_inverse=True)
+        semester_credits = np.bincount(semester_inverse, weights=self.credits, minlength=len(self.semester_groups))
+        semester_points = np.bincount(semester_inverse, weights=points, minlength=len(self.semester_groups))
+        self.sgpa = np.divide(semester_points, semester_credits, out=np.zeros_like(semester_points, dtype=np.float64), where=semester_credits > 0)
+        self.semester_credits = semester_credits
+
+        n_students = len(arrays.students)
+        student_credits = np.bincount(self.student_code, weights=self.credits, minlength=n_students)
+        student_points = np.bincount(self.student_code, weights=points, minlength=n_students)
+        self.cgpa = np.divide(student_points, student_credits, out=np.zeros_like(student_points, dtype=np.float64), where=student_credits > 0)
+
+    def cgpa_by_student(self):
+        """{student_id: cgpa} for the whole cohort"""
+        return {student: round(float(cgpa), 2) for student, cgpa in zip(self.arrays.students, self.cgpa)}
+
+    def sgpa_by_student(self):
+        """{(student_id, semester): sgpa} for the whole cohort"""
+        n_semesters = max(len(self.arrays.semesters), 1)
+        return {
+            (self.arrays.students[key // n_semesters], int(self.arrays.semesters[key % n_semesters])): round(float(sgpa), 2)
+            for key, sgpa in zip(self.semester_groups, self.sgpa)
+        }
+
+    def for_student(self, student_id):
+        """Semester-by-semester breakdown for one student, or None if they have no grades"""
+        position = np.searchsorted(self.arrays.students, str(student_id))
+        if position >= len(self.arrays.students) or self.arrays.students[position] != str(student_id):
+            return None
+
+        # Group keys are sorted with the student code most significant, so each student is a contiguous slice
+        n_semesters = max(len(self.arrays.semesters), 1)
+        semesters = {}
+        first, last = np.searchsorted(self.student_code, [position, position + 1])
+        for index in range(first, last):
+            semester = int(self.arrays.semesters[self.semester_code[index]])
+            semesters.setdefault(semester, []).append({
+                'subject': self.arrays.subjects[self.subject_code[index]],
+                'percentage': round(float(self.percentage[index]), 2),
+                'grade_point': float(self.grade_point[index]),
+                'credits': float(self.credits[index]),
+            })
+
+        sgpa = {}
+        first, last = np.searchsorted(self.semester_groups, [position * n_semesters, (position + 1) * n_semesters])
+        for index in range(first, last):
+            semester = int(self.arrays.semesters[self.semester_groups[index] % n_semesters])
+            sgpa[semester] = (round(float(self.sgpa[index]), 2), float(self.semester_credits[index]))
+
+        return {
+            'cgpa': round(float(self.cgpa[position]), 2),
+            'semesters': [
+                {
+                    'semester': semester,
+                    'sgpa': sgpa[semester][0],
+                    'credits': sgpa[semester][1],
+                    'subjects': sorted(subjects, key=lambda subject: subject['subject']),
+                }
+                for semester, subjects in sorted(semesters.items())
+            ],
+        }
+
+def compute_cohort(queryset=None, scheme=None):
+    """Compute results for every student whose grades are in `queryset`"""
+    return CohortResult(GradeArrays.from_queryset(queryset), scheme or GradingScheme.from_settings())
+
+def compute_student(student, scheme=None):
+    """Compute results for a single StudentProfile"""
+    result = compute_cohort(GradeRecord.objects.filter(student=student), scheme)
+    return result.for_student(student.pk) or {'cgpa': None, 'semesters': []}
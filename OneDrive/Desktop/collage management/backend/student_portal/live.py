@@ -0,0 +1,40 @@
+"""
+Live events for the student portal (see college_system/pubsub.py).
+
+Each student subscribes to their own channel (attendance changes) and to the
+announcement channels for everyone and for their program. Events are small
+hints; clients refetch the feed or summary, which is cheap thanks to ETags.
+"""
+from college_system.pubsub import publish_on_commit
+
+ALL_PROGRAMS = 'announcements:all'
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+def program_channel(program):
+    return f'announcements:program:{program}' if program else ALL_PROGRAMS
+
+def student_channels(user_id, program):
+    return [user_channel(user_id), ALL_PROGRAMS, program_channel(program)]
+
+def publish_announcement(announcement):
+    publish_on_commit(program_channel(announcement.program), {
+        'type': 'announcement',
+        'data': {
+            'id': str(announcement.id),
+            'title': announcement.title,
+            'program': announcement.program,
+            'created_at': announcement.created_at.isoformat(),
+        },
+    })
+
+def publish_attendance(user_id, subject, date, status):
+    publish_on_commit(user_channel(user_id), {
+        'type': 'attendance',
+        'data': {
+            'subject': subject,
+            'date': date.isoformat(),
+            'status': status,
+        },
+    })
@@ -0,0 +1,83 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from student_portal.grading import GradeArrays, GradingScheme, CohortResult
+
+
+class Command(BaseCommand):
+    help = 'Compare the vectorized SGPA/CGPA engine with a per-row Python loop on synthetic grades'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000, help='Synthetic grade rows')
+        parser.add_argument('--rows-per-student', type=int, default=24, help='Grade rows per student')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        columns = self._synthetic_rows(options['rows'], options['rows_per_student'], options['seed'])
+        scheme = GradingScheme.from_settings()
+
+        start = time.perf_counter()
+        naive = self._naive(columns, scheme)
+        naive_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = CohortResult(GradeArrays(*columns), scheme)
+        vectorized = result.cgpa_by_student()
+        vectorized_seconds = time.perf_counter() - start
+
+        mismatches = sum(1 for student, cgpa in naive.items() if abs(vectorized[student] - round(cgpa, 2)) > 0.011)
+
+        self.stdout.write(f'{options["rows"]} grade rows, {len(naive)} students')
+        self.stdout.write(f'  per-row Python loop  {naive_seconds:.3f}s')
+        self.stdout.write(f'  NumPy engine         {vectorized_seconds:.3f}s  ({naive_seconds / vectorized_seconds:.1f}x)')
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'  {mismatches} students differ between implementations'))
+        else:
+            self.stdout.write(self.style.SUCCESS('  CGPA matches for every student'))
+
+    def _synthetic_rows(self, rows, rows_per_student, seed):
+        rng = np.random.default_rng(seed)
+        students = [f'student-{n}' for n in range(max(rows // rows_per_student, 1))]
+        subjects = [f'Subject {n}' for n in range(6)]
+        assessment_types = ['assignment', 'midterm', 'final']
+        total = rng.choice([20, 50, 100], size=rows).astype(float)
+        return (
+            [students[n] for n in rng.integers(0, len(students), rows)],
+            rng.integers(1, 9, rows),
+            [subjects[n] for n in rng.integers(0, len(subjects), rows)],
+            [assessment_types[n] for n in rng.integers(0, len(assessment_types), rows)],
+            np.round(total * rng.uniform(0.3, 1.0, rows), 2),
+            total,
+        )
+
+    def _naive(self, columns, scheme):
+        """Straightforward dict-of-dicts implementation of the same rules"""
+        pooled = {}
+        for student, semester, subject, assessment, obtained, total in zip(*columns):
+            key = (student, int(semester), subject, assessment)
+            marks = pooled.setdefault(key, [0.0, 0.0])
+            marks[0] += float(obtained)
+            marks[1] += float(total)
+
+        subjects = {}
+        for (student, semester, subject, assessment), (obtained, total) in pooled.items():
+            weight = scheme.weight_for(assessment)
+            sums = subjects.setdefault((student, semester, subject), [0.0, 0.0])
+            sums[0] += weight * (obtained * 100 / total if total else 0.0)
+            sums[1] += weight
+
+        students = {}
+        for (student, semester, subject), (weighted, weights) in subjects.items():
+            percentage = weighted / weights if weights else 0.0
+            points = 0.0
+            for minimum, band_points in sorted(zip(scheme.band_minimums, scheme.band_points[1:])):
+                if percentage >= minimum:
+                    points = band_points
+            credits = scheme.credits_for(subject)
+            sums = students.setdefault(student, [0.0, 0.0])
+            sums[0] += credits * points
+            sums[1] += credits
+
+        return {student: (points / credits if credits else 0.0) for student, (points, credits) in students.items()}
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from student_portal.results import publish_results
+
+
+class Command(BaseCommand):
+    help = 'Snapshot semester results into SemesterResult and warm the results cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', type=int, required=True)
+        parser.add_argument('--program', help='Only publish results for this program')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Students computed per batch')
+
+    def handle(self, *args, **options):
+        published = publish_results(options['semester'], options['program'], options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Published {published} results for semester {options["semester"]}'))
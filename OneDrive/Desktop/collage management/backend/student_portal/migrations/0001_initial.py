@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:32
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0002_attendance_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SemesterResult',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('semester', models.IntegerField()),
+                ('sgpa', models.DecimalField(decimal_places=2, max_digits=4)),
+                ('cgpa', models.DecimalField(decimal_places=2, max_digits=4)),
+                ('credits', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('subjects', models.JSONField(default=list)),
+                ('published_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='semester_results', to='users.studentprofile')),
+            ],
+            options={
+                'db_table': 'semester_results',
+                'unique_together': {('student', 'semester')},
+            },
+        ),
+    ]
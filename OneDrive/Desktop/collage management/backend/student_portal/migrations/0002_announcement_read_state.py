@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:43
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student_portal', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnouncementReadState',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('read_until', models.DateTimeField(blank=True, null=True)),
+                ('read_ids', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='announcement_read_state', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'announcement_read_state',
+            },
+        ),
+    ]
@@ -1,3 +1,44 @@
 from django.db import models
+from users.models import User, StudentProfile
+import uuid
 
-# Create your models here.
+class SemesterResult(models.Model):
+    """Published snapshot of a student's semester grades, SGPA and CGPA"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='semester_results')
+    semester = models.IntegerField()
+    sgpa = models.DecimalField(max_digits=4, decimal_places=2)
+    cgpa = models.DecimalField(max_digits=4, decimal_places=2)
+    credits = models.DecimalField(max_digits=6, decimal_places=2)
+    subjects = models.JSONField(default=list)
+    published_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'semester_results'
+        unique_together = ('student', 'semester')
+        
+    def __str__(self):
+        return f"{self.student_id} - Semester {self.semester} - SGPA {self.sgpa}"
+
+class AnnouncementReadState(models.Model):
+    """
+    Compact per-user read state: everything created up to read_until is read,
+    plus the ids in read_ids that were opened individually after it.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='announcement_read_state')
+    read_until = models.DateTimeField(null=True, blank=True)
+    read_ids = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'announcement_read_state'
+        
+    def __str__(self):
+        return f"{self.user_id} - read until {self.read_until}"
+    
+    def is_read(self, announcement):
+        if self.read_until and announcement.created_at <= self.read_until:
+            return True
+        return str(announcement.id) in self.read_ids
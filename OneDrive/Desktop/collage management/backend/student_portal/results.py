@@ -0,0 +1,116 @@
+"""
+Published semester results.
+
+`publish_results` snapshots SGPA/CGPA into SemesterResult and primes the
+cache, so result-day reads are a single cache lookup keyed by
+(user, semester). Grade edits after publishing refresh the affected
+snapshots and drop their cache entries (see signals.py).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import StudentProfile, GradeRecord
+from .grading import compute_cohort
+from .models import SemesterResult
+
+def result_cache_key(user_id, semester):
+    return f'semester_result:{user_id}:{semester}'
+
+def serialize_result(result):
+    return {
+        'semester': result.semester,
+        'sgpa': float(result.sgpa),
+        'cgpa': float(result.cgpa),
+        'credits': float(result.credits),
+        'subjects': result.subjects,
+        'published_at': result.published_at.isoformat(),
+    }
+
+def _build_snapshots(students, semester, published_at):
+    """Compute SemesterResult objects for `students` as of `semester`"""
+    # CGPA as of a semester only counts that semester and earlier ones
+    cohort = compute_cohort(GradeRecord.objects.filter(student__in=students, semester__lte=semester))
+    snapshots = []
+    for student in students:
+        breakdown = cohort.for_student(student.pk)
+        if breakdown is None:
+            continue
+        current = next((entry for entry in breakdown['semesters'] if entry['semester'] == semester), None)
+        if current is None:
+            continue
+        snapshots.append(SemesterResult(
+            student=student,
+            semester=semester,
+            sgpa=current['sgpa'],
+            cgpa=breakdown['cgpa'],
+            credits=current['credits'],
+            subjects=current['subjects'],
+            published_at=published_at,
+        ))
+    return snapshots
+
+def _save_snapshots(snapshots):
+    SemesterResult.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=['student', 'semester'],
+        update_fields=['sgpa', 'cgpa', 'credits', 'subjects', 'published_at', 'updated_at'],
+    )
+
+def publish_results(semester, program=None, chunk_size=1000):
+    """Snapshot results for every student graded in `semester` and warm the cache"""
+    students = StudentProfile.objects.filter(grade_records__semester=semester).distinct().only('id', 'user_id')
+    if program:
+        students = students.filter(program=program)
+    students = list(students.order_by('id'))
+    published_at = timezone.now()
+    
+    published = 0
+    for start in range(0, len(students), chunk_size):
+        chunk = students[start:start + chunk_size]
+        snapshots = _build_snapshots(chunk, semester, published_at)
+        with transaction.atomic():
+            _save_snapshots(snapshots)
+        cache.set_many(
+            {result_cache_key(result.student.user_id, semester): serialize_result(result) for result in snapshots},
+            settings.RESULTS_CACHE_TIMEOUT,
+        )
+        published += len(snapshots)
+    return published
+
+def get_semester_result(user_id, semester):
+    """Cached read path; returns None if the semester has not been published"""
+    key = result_cache_key(user_id, semester)
+    data = cache.get(key)
+    if data is None:
+        result = SemesterResult.objects.filter(student__user_id=user_id, semester=semester).first()
+        # Unpublished semesters are cached too, briefly, so polling before publish stays cheap
+        data = serialize_result(result) if result else {}
+        cache.set(key, data, settings.RESULTS_CACHE_TIMEOUT if result else settings.RESULTS_MISSING_CACHE_TIMEOUT)
+    return data or None
+
+def refresh_student_results(student_id, from_semester):
+    """Recompute published snapshots affected by a grade change to `from_semester`"""
+    published = list(
+        SemesterResult.objects.filter(student_id=student_id, semester__gte=from_semester)
+        .values_list('semester', 'published_at')
+    )
+    if not published:
+        return
+    
+    student = StudentProfile.objects.only('id', 'user_id').filter(pk=student_id).first()
+    if student is None:
+        return
+    
+    snapshots = []
+    for semester, published_at in published:
+        snapshots.extend(_build_snapshots([student], semester, published_at))
+    
+    with transaction.atomic():
+        stale = {semester for semester, _ in published} - {snapshot.semester for snapshot in snapshots}
+        if stale:
+            SemesterResult.objects.filter(student_id=student_id, semester__in=stale).delete()
+        _save_snapshots(snapshots)
+    cache.delete_many([result_cache_key(student.user_id, semester) for semester, _ in published])
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+from users.models import AttendanceSummary
+
+class AttendanceSummarySerializer(serializers.ModelSerializer):
+    percentage = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = AttendanceSummary
+        fields = ('subject', 'present_count', 'total_count', 'percentage')
+    
+    def get_percentage(self, obj):
+        if not obj.total_count:
+            return None
+        return round(obj.present_count * 100 / obj.total_count, 2)
+
+class MarkAnnouncementsReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False, max_length=500)
+    all = serializers.BooleanField(default=False)
+    
+    def validate(self, data):
+        if not data['all'] and not data.get('ids'):
+            raise serializers.ValidationError('Provide ids or set all to true')
+        return data
@@ -0,0 +1,54 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from college_system.tracking import previous_values, track_changes
+from users.models import User, GradeRecord, Announcement, StudentProfile
+from .announcements import bump_feed_version, bump_read_version
+from .dashboard import invalidate_dashboards, invalidate_student_dashboards
+from .live import publish_announcement
+from .results import refresh_student_results
+
+# A grade moved to another semester or student also changes the results it left
+track_changes(GradeRecord, ['student_id', 'semester'])
+
+@receiver(post_save, sender=GradeRecord)
+@receiver(post_delete, sender=GradeRecord)
+def grade_changed(sender, instance, **kwargs):
+    """Keep published semester results and the student's dashboard in step with grade edits"""
+    previous = previous_values(instance) if kwargs['signal'] is post_save else {}
+    old_student = previous.get('student_id', instance.student_id)
+    old_semester = previous.get('semester', instance.semester)
+    if old_student == instance.student_id:
+        # Snapshots from the earlier semester on cover both the old and the new one
+        refresh_student_results(instance.student_id, min(old_semester, instance.semester))
+    else:
+        refresh_student_results(old_student, old_semester)
+        refresh_student_results(instance.student_id, instance.semester)
+    invalidate_student_dashboards({old_student, instance.student_id})
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+def announcement_changed(sender, instance, **kwargs):
+    """Invalidate every feed ETag"""
+    bump_feed_version()
+
+@receiver(post_save, sender=Announcement)
+def announcement_created(sender, instance, created, **kwargs):
+    """Push new announcements to connected students"""
+    if created and instance.is_active:
+        publish_announcement(instance)
+
+@receiver(post_save, sender=StudentProfile)
+def student_profile_changed(sender, instance, **kwargs):
+    """A program change alters which announcements the student sees"""
+    bump_read_version(instance.user_id)
+    invalidate_dashboards([instance.user_id])
+
+@receiver(post_save, sender=User)
+def student_user_changed(sender, instance, created, update_fields=None, **kwargs):
+    """The dashboard shows the student's name and email"""
+    if created or instance.role != 'student':
+        return
+    if update_fields is not None and not {'name', 'email'}.intersection(update_fields):
+        return
+    invalidate_dashboards([instance.pk])
@@ -1,3 +1,77 @@
+from datetime import date
+
 from django.test import TestCase
 
-# Create your tests here.
+from users.models import User, StudentProfile, FacultyProfile, GradeRecord
+from .models import SemesterResult
+from .results import get_semester_result, publish_results
+
+def create_student(tag='S-1'):
+    user = User.objects.create(email=f'{tag.lower()}@example.com', name=f'Student {tag}', role='student')
+    return StudentProfile.objects.create(
+        user=user, student_id=tag, program='BCA', enrollment_date=date(2029, 7, 1), phone='0', address='-'
+    )
+
+class PublishedResultTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(email='f1@example.com', name='Faculty', role='faculty')
+        self.faculty = FacultyProfile.objects.create(
+            user=user, faculty_id='F1', department='CSE', designation='Professor', phone='0', specialization='-'
+        )
+        self.student = create_student()
+
+    def grade(self, subject, semester, marks, student=None):
+        return GradeRecord.objects.create(
+            student=student or self.student, faculty=self.faculty, subject=subject, assessment_type='final',
+            marks_obtained=marks, total_marks=100, semester=semester,
+        )
+
+    def result(self, semester, student=None):
+        # Read through the cache, as the results endpoint does
+        return get_semester_result((student or self.student).user_id, semester)
+
+    def subjects(self, semester, student=None):
+        result = self.result(semester, student)
+        return result and sorted(subject['subject'] for subject in result['subjects'])
+
+    def test_grade_edit_refreshes_the_published_result(self):
+        grade = self.grade('Maths', 1, 40)
+        publish_results(1)
+        sgpa = self.result(1)['sgpa']
+        grade.marks_obtained = 95
+        grade.save()
+        self.assertGreater(self.result(1)['sgpa'], sgpa)
+
+    def test_grade_moved_to_another_semester_leaves_the_old_one(self):
+        self.grade('Maths', 1, 80)
+        moved = self.grade('Physics', 1, 70)
+        self.grade('Chemistry', 2, 60)
+        publish_results(1)
+        publish_results(2)
+        self.assertEqual(self.subjects(1), ['Maths', 'Physics'])
+
+        moved.semester = 2
+        moved.save()
+        self.assertEqual(self.subjects(1), ['Maths'])
+        self.assertEqual(self.subjects(2), ['Chemistry', 'Physics'])
+
+    def test_grade_moved_to_another_student_leaves_the_old_one(self):
+        other = create_student('S-2')
+        self.grade('Maths', 1, 80)
+        moved = self.grade('Physics', 1, 70)
+        self.grade('Maths', 1, 50, student=other)
+        publish_results(1)
+        self.assertEqual(self.subjects(1), ['Maths', 'Physics'])
+
+        moved.student = other
+        moved.save()
+        self.assertEqual(self.subjects(1), ['Maths'])
+        self.assertEqual(self.subjects(1, other), ['Maths', 'Physics'])
+
+    def test_deleting_the_last_grade_withdraws_the_result(self):
+        grade = self.grade('Maths', 1, 80)
+        publish_results(1)
+        self.assertIsNotNone(self.result(1))
+        grade.delete()
+        self.assertIsNone(self.result(1))
+        self.assertFalse(SemesterResult.objects.exists())
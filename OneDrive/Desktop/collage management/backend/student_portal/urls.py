@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.urls import path
+from . import views, async_views
+
+urlpatterns = [
+    path('dashboard/', views.dashboard, name='student-dashboard'),
+    path('attendance/', views.attendance_summary, name='student-attendance'),
+    path('grades/', views.grades, name='student-grades'),
+    path('results/<int:semester>/', views.semester_result, name='student-semester-result'),
+    path('announcements/', views.announcements, name='student-announcements'),
+    path('announcements/read/', views.mark_announcements_read, name='student-announcements-read'),
+]
+
+# A stream holds its worker for as long as it is open, which only the ASGI profile can afford
+if settings.ASYNC_API_VIEWS:
+    urlpatterns += [
+        path('events/', async_views.events, name='student-events'),
+        path('events/poll/', async_views.poll, name='student-events-poll'),
+    ]
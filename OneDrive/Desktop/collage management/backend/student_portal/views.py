@@ -1,3 +1,96 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from users.models import AttendanceSummary, StudentProfile
+from users.permissions import IsStudent
+from .serializers import MarkAnnouncementsReadSerializer
+from .announcements import InvalidCursor, feed_etag, get_feed, mark_read
+from .dashboard import attendance_overview, get_dashboard
+from .grading import compute_student
+from .results import get_semester_result
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsStudent])
+def attendance_summary(request):
+    """Per-subject and overall attendance for the logged-in student"""
+    summaries = list(
+        AttendanceSummary.objects.filter(student__user_id=request.user.id).order_by('subject')
+    )
+    return Response(attendance_overview(summaries), status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsStudent])
+def dashboard(request):
+    """Profile, attendance, grades and recent announcements in one cached response"""
+    data = get_dashboard(request.user.id)
+    if data is None:
+        return Response({
+            'error': 'Complete your student profile setup first'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(data, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsStudent])
+def grades(request):
+    """Subject grade points, SGPA per semester and CGPA for the logged-in student"""
+    student = StudentProfile.objects.filter(user_id=request.user.id).first()
+    if student is None:
+        return Response({
+            'error': 'Complete your student profile setup first'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(compute_student(student), status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsStudent])
+def semester_result(request, semester):
+    """Published result for one semester, served from the cache"""
+    result = get_semester_result(request.user.id, semester)
+    if result is None:
+        return Response({
+            'error': 'Results for this semester have not been published yet'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(result, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsStudent])
+def announcements(request):
+    """Announcement feed with cursor pagination; answers 304 when nothing changed"""
+    cursor = request.query_params.get('cursor') or None
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+    except ValueError:
+        return Response({
+            'error': 'limit must be an integer'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    etag = feed_etag(request.user.id, cursor, limit)
+    if etag in (tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    
+    try:
+        feed = get_feed(request.user.id, cursor, limit)
+    except InvalidCursor as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(feed, status=status.HTTP_200_OK, headers={'ETag': etag})
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsStudent])
+def mark_announcements_read(request):
+    """Mark some announcements, or all of them, as read"""
+    serializer = MarkAnnouncementsReadSerializer(data=request.data)
+    if serializer.is_valid():
+        data = serializer.validated_data
+        mark_read(request.user.id, None if data['all'] else data['ids'])
+        return Response({
+            'message': 'Announcements marked as read'
+        }, status=status.HTTP_200_OK)
+    
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -1,6 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, StudentProfile, FacultyProfile, AttendanceRecord, GradeRecord, Announcement, PasswordResetToken
+from college_system.admin_utils import IndexedSearchMixin, LargeTableAdmin, cached_values_filter
+from .models import (
+    User, StudentProfile, FacultyProfile, AttendanceRecord, ArchivedAttendanceRecord, AttendanceArchiveRun,
+    AttendanceSummary, GradeRecord, Announcement, PasswordResetToken
+)
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
@@ -26,38 +30,77 @@ class UserAdmin(BaseUserAdmin):
     )
 
 @admin.register(StudentProfile)
-class StudentProfileAdmin(admin.ModelAdmin):
+class StudentProfileAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ('student_id', 'user', 'program', 'current_semester', 'enrollment_date')
     list_filter = ('program', 'current_semester')
     search_fields = ('student_id', 'user__name', 'user__email')
+    search_kind = 'student'
+    list_select_related = ('user',)
     ordering = ('-enrollment_date',)
 
 @admin.register(FacultyProfile)
-class FacultyProfileAdmin(admin.ModelAdmin):
+class FacultyProfileAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ('faculty_id', 'user', 'department', 'designation')
     list_filter = ('department', 'designation')
     search_fields = ('faculty_id', 'user__name', 'user__email', 'department')
+    search_kind = 'faculty'
+    list_select_related = ('user',)
 
 @admin.register(AttendanceRecord)
-class AttendanceRecordAdmin(admin.ModelAdmin):
+class AttendanceRecordAdmin(LargeTableAdmin):
     list_display = ('student', 'subject', 'date', 'status', 'faculty', 'marked_at')
-    list_filter = ('status', 'date', 'subject')
-    search_fields = ('student__student_id', 'student__user__name', 'subject')
-    date_hierarchy = 'date'
+    # The date filter only adds a range; date_hierarchy would run SELECT DISTINCT dates on every page
+    list_filter = ('status', 'date', cached_values_filter('subject'))
+    # Subject is covered by its filter; searching it would scan every row
+    search_fields = ('student__student_id', 'student__user__name')
+    list_select_related = ('student__user', 'faculty__user')
     ordering = ('-date',)
 
+@admin.register(ArchivedAttendanceRecord)
+class ArchivedAttendanceRecordAdmin(LargeTableAdmin):
+    """Closed academic years, read-only; the archive has no date index, so filter by subject or search"""
+    list_display = ('student', 'subject', 'date', 'status', 'faculty')
+    list_filter = ('status', cached_values_filter('subject'))
+    search_fields = ('student__student_id', 'student__user__name')
+    list_select_related = ('student__user', 'faculty__user')
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(AttendanceArchiveRun)
+class AttendanceArchiveRunAdmin(admin.ModelAdmin):
+    list_display = ('cutoff', 'moved', 'started_at', 'finished_at')
+    ordering = ('-started_at',)
+    readonly_fields = ('cutoff', 'moved', 'started_at', 'finished_at')
+    
+    def has_add_permission(self, request):
+        return False
+
+@admin.register(AttendanceSummary)
+class AttendanceSummaryAdmin(admin.ModelAdmin):
+    list_display = ('student', 'subject', 'present_count', 'total_count', 'updated_at')
+    search_fields = ('student__student_id', 'subject')
+    list_select_related = ('student__user',)
+    readonly_fields = ('present_count', 'total_count', 'updated_at')
+
 @admin.register(GradeRecord)
-class GradeRecordAdmin(admin.ModelAdmin):
+class GradeRecordAdmin(LargeTableAdmin):
     list_display = ('student', 'subject', 'assessment_type', 'marks_obtained', 'total_marks', 'semester', 'faculty')
-    list_filter = ('semester', 'assessment_type', 'subject')
-    search_fields = ('student__student_id', 'student__user__name', 'subject')
+    list_filter = (cached_values_filter('semester'), cached_values_filter('assessment_type'), cached_values_filter('subject'))
+    search_fields = ('student__student_id', 'student__user__name')
+    list_select_related = ('student__user', 'faculty__user')
     ordering = ('-created_at',)
 
 @admin.register(Announcement)
-class AnnouncementAdmin(admin.ModelAdmin):
-    list_display = ('title', 'faculty', 'is_active', 'created_at')
-    list_filter = ('is_active', 'created_at')
+class AnnouncementAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    list_display = ('title', 'faculty', 'program', 'is_active', 'created_at')
+    list_filter = ('is_active', 'program', 'created_at')
     search_fields = ('title', 'content', 'faculty__user__name')
+    search_kind = 'announcement'
+    list_select_related = ('faculty__user',)
     ordering = ('-created_at',)
 
 @admin.register(PasswordResetToken)
@@ -65,4 +108,5 @@ class PasswordResetTokenAdmin(admin.ModelAdmin):
     list_display = ('user', 'used', 'expires_at', 'created_at')
     list_filter = ('used', 'expires_at')
     search_fields = ('user__email', 'token')
+    list_select_related = ('user',)
     ordering = ('-created_at',)
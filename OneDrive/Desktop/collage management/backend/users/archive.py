@@ -0,0 +1,155 @@
+"""
+Archival of attendance from closed academic years.
+
+AttendanceRecord grows by students x subjects x teaching days every year,
+but only the open academic years are marked or browsed day to day.
+archive_attendance() moves every record dated before a cutoff (the start of
+an academic year) into ArchivedAttendanceRecord, ATTENDANCE_ARCHIVE_CHUNK_SIZE
+rows per transaction, so the hot table and its five indexes only hold the
+open years. The archive carries just the unique and faculty indexes.
+AttendanceSummary already counts every record and is left alone.
+
+Each run is logged in AttendanceArchiveRun. attendance_sources() routes
+reads by date range with those cutoffs: the archive holds nothing on or
+after the newest cutoff, and once a run has finished the hot table holds
+nothing before it (while one is in progress, both are read for its years).
+
+Dates before the newest cutoff are closed as soon as its run starts and can
+no longer be marked. closed_before() is cached for request validation, and
+archive_attendance() drops the entry when a run starts. A mark also checks
+is_closed() inside its own transaction, holding the locks on its students'
+summaries, which every archive chunk takes as well: a mark either commits
+before the chunk that moves its record, or sees the run and writes nothing.
+So no record is counted in AttendanceSummary twice, once archived and once
+again as a new hot row.
+"""
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .models import AttendanceRecord, AttendanceSummary, ArchivedAttendanceRecord, AttendanceArchiveRun
+
+ARCHIVED_FIELDS = ('id', 'student_id', 'faculty_id', 'subject', 'date', 'status', 'marked_at', 'created_at')
+# Copied over an archived record with the same (student, subject, date)
+UPDATED_FIELDS = ('faculty_id', 'status', 'marked_at')
+CLOSED_CACHE_KEY = 'attendance:closed_before'
+
+def academic_year_start(day):
+    """First day of the academic year containing `day`"""
+    month = settings.ACADEMIC_YEAR_START_MONTH
+    return date(day.year if day.month >= month else day.year - 1, month, 1)
+
+def default_cutoff(today=None):
+    """Start of the oldest of the ATTENDANCE_HOT_YEARS academic years kept hot (the current one included)"""
+    start = academic_year_start(today or timezone.localdate())
+    return start.replace(year=start.year - (settings.ATTENDANCE_HOT_YEARS - 1))
+
+def cutoffs():
+    """(closed, archived): the newest finished cutoff and the newest started one, None before the first run"""
+    result = AttendanceArchiveRun.objects.aggregate(
+        closed=Max('cutoff', filter=Q(finished_at__isnull=False)),
+        archived=Max('cutoff'),
+    )
+    return result['closed'], result['archived']
+
+def closed_before():
+    """Attendance dated before this is (being) archived and is read-only; None before the first run (cached)"""
+    # Wrapped, as a cached None would read as a miss
+    cached = cache.get(CLOSED_CACHE_KEY)
+    if cached is None:
+        cached = {'closed': cutoffs()[1]}
+        cache.set(CLOSED_CACHE_KEY, cached, settings.ATTENDANCE_CLOSED_CACHE_TIMEOUT)
+    return cached['closed']
+
+def is_closed(day):
+    """Uncached closed_before() check, for writers holding their summary locks"""
+    return AttendanceArchiveRun.objects.filter(cutoff__gt=day).exists()
+
+def attendance_sources(date_from=None, date_to=None):
+    """
+    Querysets over the tables holding attendance dated from `date_from` to
+    `date_to` (both optional), archive first. Each record is in exactly one of
+    them, and archived dates come before hot ones once no run is in progress.
+    """
+    closed, archived = cutoffs()
+    sources = []
+    if archived is not None and (date_from is None or date_from < archived):
+        sources.append(ArchivedAttendanceRecord.objects.all())
+    if closed is None or date_to is None or date_to >= closed:
+        sources.append(AttendanceRecord.objects.all())
+    return sources
+
+def archive_attendance(cutoff, chunk_size=None, progress=None):
+    """
+    Move every AttendanceRecord dated before `cutoff` to the archive and
+    return the finished AttendanceArchiveRun. `progress(moved)` is called
+    after each chunk. Safe to re-run after an interruption.
+    """
+    closed = cutoffs()[0]
+    if closed is not None and cutoff < closed:
+        raise ValueError(f'Attendance before {closed.isoformat()} is already archived')
+    chunk_size = chunk_size or settings.ATTENDANCE_ARCHIVE_CHUNK_SIZE
+
+    # Logged before anything moves, so reads start checking the archive for these years and marks stop
+    run = AttendanceArchiveRun.objects.create(cutoff=cutoff)
+    cache.delete(CLOSED_CACHE_KEY)
+    pending = AttendanceRecord.objects.filter(date__lt=cutoff)
+    while ids := list(pending.values_list('id', flat=True)[:chunk_size]):
+        with transaction.atomic():
+            records = AttendanceRecord.objects.filter(id__in=ids)
+            _lock_summaries(records)
+            # A mark that got its locks first may have committed since: move its latest status
+            ids = list(records.select_for_update().values_list('id', flat=True))
+            _copy_to_archive(AttendanceRecord.objects.filter(id__in=ids))
+            AttendanceRecord.objects.filter(id__in=ids).delete()
+        run.moved += len(ids)
+        if progress:
+            progress(run.moved)
+
+    run.finished_at = timezone.now()
+    run.save(update_fields=['moved', 'finished_at'])
+    return run
+
+def _lock_summaries(records):
+    """
+    Lock the summaries of `records`' students and subjects until the
+    transaction ends, waiting for marks that hold them (see the module docstring)
+    """
+    pairs = set(records.values_list('student_id', 'subject'))
+    # Same id order as users.services.lock_attendance_summaries, so a chunk and a mark cannot deadlock
+    list(
+        AttendanceSummary.objects.select_for_update()
+        .filter(student_id__in={student for student, _ in pairs}, subject__in={subject for _, subject in pairs})
+        .order_by('id').values_list('id', flat=True)
+    )
+
+def _copy_to_archive(records):
+    """
+    Copy `records` into the archive. One conflicting with an archived copy
+    (marked again during a run, before marks checked is_closed()) replaces it.
+    """
+    using = router.db_for_write(ArchivedAttendanceRecord)
+    connection = connections[using]
+    if connection.vendor not in ('sqlite', 'postgresql'):
+        ArchivedAttendanceRecord.objects.using(using).bulk_create(
+            [ArchivedAttendanceRecord(**row) for row in records.values(*ARCHIVED_FIELDS)],
+            update_conflicts=True,
+            unique_fields=['student', 'subject', 'date'],
+            update_fields=[field.removesuffix('_id') for field in UPDATED_FIELDS],
+        )
+        return
+    # INSERT ... SELECT keeps the rows in the database instead of building a model instance per record
+    quote = connection.ops.quote_name
+    select, params = records.values_list(*ARCHIVED_FIELDS).query.get_compiler(using).as_sql()
+    columns = ', '.join(quote(field) for field in ARCHIVED_FIELDS)
+    updates = ', '.join(f'{quote(field)} = excluded.{quote(field)}' for field in UPDATED_FIELDS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote(ArchivedAttendanceRecord._meta.db_table)} ({columns}) {select} '
+            f'ON CONFLICT ({quote("student_id")}, {quote("subject")}, {quote("date")}) DO UPDATE SET {updates}',
+            params,
+        )
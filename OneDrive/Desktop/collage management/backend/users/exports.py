@@ -0,0 +1,188 @@
+"""
+Streaming CSV export of attendance and grades.
+
+Rows are read with one joined query (student, student user and faculty user
+columns via values_list, so no model instances are built) and written to the
+response chunk by chunk, so memory stays flat from a single class to the
+whole college. On PostgreSQL .iterator() uses a server-side cursor; when
+those are disabled (PgBouncer transaction pooling) the export falls back to
+keyset pages on the ordering columns instead of fetching everything at once.
+
+Under the ASGI profile the chunks are handed over through an async iterator:
+given a sync one, Django's ASGI handler would read the whole CSV into memory
+before sending the first byte.
+
+Attendance is read from the archive and then the hot table, as the date
+range requires (see archive.py); both are ordered by date first, so the
+export stays in order across them.
+"""
+import csv
+import io
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import serializers
+
+from college_system.async_utils import aiterate
+from .archive import attendance_sources
+from .models import GradeRecord
+
+# (header, queryset path) per column; the ordering columns make each export's keyset unique
+ATTENDANCE_COLUMNS = (
+    ('date', 'date'),
+    ('subject', 'subject'),
+    ('student_id', 'student__student_id'),
+    ('student_name', 'student__user__name'),
+    ('student_email', 'student__user__email'),
+    ('program', 'student__program'),
+    ('semester', 'student__current_semester'),
+    ('status', 'status'),
+    ('faculty', 'faculty__user__name'),
+    ('marked_at', 'marked_at'),
+)
+ATTENDANCE_ORDERING = ('date', 'subject', 'student_id')
+
+GRADE_COLUMNS = (
+    ('semester', 'semester'),
+    ('subject', 'subject'),
+    ('student_id', 'student__student_id'),
+    ('student_name', 'student__user__name'),
+    ('student_email', 'student__user__email'),
+    ('program', 'student__program'),
+    ('assessment_type', 'assessment_type'),
+    ('marks_obtained', 'marks_obtained'),
+    ('total_marks', 'total_marks'),
+    ('faculty', 'faculty__user__name'),
+    ('updated_at', 'updated_at'),
+)
+GRADE_ORDERING = ('semester', 'subject', 'student_id', 'id')
+
+class ExportFilterSerializer(serializers.Serializer):
+    program = serializers.CharField(required=False)
+    semester = serializers.IntegerField(required=False, min_value=1)
+    subject = serializers.CharField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('date_from') and attrs.get('date_to') and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError({'date_to': 'date_to must not be before date_from.'})
+        return attrs
+
+def attendance_querysets(filters, faculty=None):
+    """Attendance matching the filters, one queryset per table it is in; `semester` is the students' current semester"""
+    return [
+        _filter_attendance(queryset, filters, faculty)
+        for queryset in attendance_sources(filters.get('date_from'), filters.get('date_to'))
+    ]
+
+def _filter_attendance(queryset, filters, faculty):
+    if faculty is not None:
+        queryset = queryset.filter(faculty=faculty)
+    if filters.get('program'):
+        queryset = queryset.filter(student__program=filters['program'])
+    if filters.get('semester'):
+        queryset = queryset.filter(student__current_semester=filters['semester'])
+    if filters.get('subject'):
+        queryset = queryset.filter(subject=filters['subject'])
+    if filters.get('date_from'):
+        queryset = queryset.filter(date__gte=filters['date_from'])
+    if filters.get('date_to'):
+        queryset = queryset.filter(date__lte=filters['date_to'])
+    return queryset
+
+def grades_queryset(filters, faculty=None):
+    """Grades matching the filters; the date range applies to when the grade was entered"""
+    queryset = GradeRecord.objects.all()
+    if faculty is not None:
+        queryset = queryset.filter(faculty=faculty)
+    if filters.get('program'):
+        queryset = queryset.filter(student__program=filters['program'])
+    if filters.get('semester'):
+        queryset = queryset.filter(semester=filters['semester'])
+    if filters.get('subject'):
+        queryset = queryset.filter(subject=filters['subject'])
+    if filters.get('date_from'):
+        queryset = queryset.filter(created_at__date__gte=filters['date_from'])
+    if filters.get('date_to'):
+        queryset = queryset.filter(created_at__date__lte=filters['date_to'])
+    return queryset
+
+def _keyset_pages(queryset, fields, ordering, chunk_size):
+    """values_list pages ordered by `ordering`, each starting after the previous page's last row"""
+    positions = [len(fields) + i for i in range(len(ordering))]
+    page = queryset.values_list(*fields, *ordering)
+    after = None
+    while True:
+        rows = list(page.filter(_after(ordering, after))[:chunk_size]) if after else list(page[:chunk_size])
+        if not rows:
+            return
+        yield [row[:len(fields)] for row in rows]
+        if len(rows) < chunk_size:
+            return
+        after = [rows[-1][position] for position in positions]
+
+def _after(ordering, values):
+    """(a, b, c) > (x, y, z) as a filter the planner can use with the ordering index"""
+    condition = Q()
+    for i in range(len(ordering)):
+        step = Q(**{f'{ordering[i]}__gt': values[i]})
+        for field, value in zip(ordering[:i], values[:i]):
+            step &= Q(**{field: value})
+        condition |= step
+    return condition
+
+def _row_chunks(queryset, fields, ordering, chunk_size):
+    queryset = queryset.order_by(*ordering)
+    if connections[queryset.db].settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+        yield from _keyset_pages(queryset, fields, ordering, chunk_size)
+        return
+    chunk = []
+    for row in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _cell(value):
+    # Spreadsheet apps run cells starting with these as formulas; names and subjects are user input
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@', '\t', '\r'):
+        return "'" + value
+    return value
+
+def stream_csv(columns, querysets, ordering, chunk_size=None):
+    """CSV text of `querysets`, one after the other, in chunks: the header, then one string per chunk of rows"""
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in columns])
+    yield buffer.getvalue()
+
+    fields = [field for _, field in columns]
+    for queryset in querysets:
+        for rows in _row_chunks(queryset, fields, ordering, chunk_size):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([[_cell(value) for value in row] for row in rows])
+            yield buffer.getvalue()
+
+def export_response(kind, filters, faculty=None):
+    """StreamingHttpResponse with the attendance or grades CSV; `faculty` limits it to their own rows"""
+    if kind == 'attendance':
+        querysets, columns, ordering = attendance_querysets(filters, faculty), ATTENDANCE_COLUMNS, ATTENDANCE_ORDERING
+    else:
+        querysets, columns, ordering = [grades_queryset(filters, faculty)], GRADE_COLUMNS, GRADE_ORDERING
+
+    content = stream_csv(columns, querysets, ordering)
+    if settings.ASYNC_API_VIEWS:
+        content = aiterate(content)
+    response = StreamingHttpResponse(content, content_type='text/csv; charset=utf-8')
+    filename = f'{kind}-{timezone.now():%Y%m%d-%H%M%S}.csv'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    return response
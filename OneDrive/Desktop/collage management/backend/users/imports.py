@@ -0,0 +1,413 @@
+"""
+Bulk CSV import of students, faculty, grades and enrollments.
+
+The file is read as a stream and handled in chunks of IMPORT_CHUNK_SIZE
+rows. Each chunk is validated row by row with the same serializers the
+setup endpoint uses, checked for duplicates against the file so far and
+the database with one query per column, then written with bulk_create in
+its own transaction. Invalid rows are skipped and reported with their line
+number; valid rows are imported.
+
+Passwords given in the file are hashed in a process pool, since hashing
+at the configured cost dominates everything else. Rows without a password
+get an unusable one and their welcome email carries a set-password link
+(a PasswordResetToken valid for IMPORT_INVITE_DAYS), so an invite-only
+import does no hashing at all. Welcome emails go to the outbox in one bulk
+insert per chunk.
+"""
+import csv
+import multiprocessing
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from itertools import chain, islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from authentication.hashers import make_passwords
+from authentication.serializers import StudentSetupSerializer, FacultySetupSerializer
+from contact.models import OutboundNotification
+from faculty_portal.models import CourseOffering, Enrollment
+from faculty_portal.roster import invalidate_rosters
+from search.index import index as index_for_search
+from student_portal.dashboard import invalidate_student_dashboards
+from student_portal.models import SemesterResult
+from student_portal.results import refresh_student_results
+from .models import User, StudentProfile, FacultyProfile, GradeRecord, PasswordResetToken
+
+HASH_BATCH_SIZE = 20
+MAX_REPORTED_ERRORS = 1000
+
+class InvalidImportFile(ValueError):
+    """The file itself is unusable (missing columns, not CSV text)"""
+    pass
+
+class StudentImportSerializer(StudentSetupSerializer):
+    email = serializers.EmailField(max_length=254)
+    name = serializers.CharField(max_length=255)
+    password = serializers.CharField(required=False, allow_blank=True, validators=[validate_password])
+
+    class Meta(StudentSetupSerializer.Meta):
+        fields = ('email', 'name', 'password') + StudentSetupSerializer.Meta.fields
+        # Uniqueness is checked per chunk with one query instead of one per row
+        extra_kwargs = {'student_id': {'validators': []}}
+
+class FacultyImportSerializer(FacultySetupSerializer):
+    email = serializers.EmailField(max_length=254)
+    name = serializers.CharField(max_length=255)
+    password = serializers.CharField(required=False, allow_blank=True, validators=[validate_password])
+
+    class Meta(FacultySetupSerializer.Meta):
+        fields = ('email', 'name', 'password') + FacultySetupSerializer.Meta.fields
+        extra_kwargs = {'faculty_id': {'validators': []}}
+
+class GradeImportSerializer(serializers.Serializer):
+    student_id = serializers.CharField(max_length=50)
+    faculty_id = serializers.CharField(max_length=50)
+    subject = serializers.CharField(max_length=200)
+    assessment_type = serializers.CharField(max_length=100)
+    marks_obtained = serializers.DecimalField(max_digits=6, decimal_places=2, min_value=0)
+    total_marks = serializers.DecimalField(max_digits=6, decimal_places=2, min_value=0.01)
+    semester = serializers.IntegerField(min_value=1)
+
+    def validate(self, attrs):
+        if attrs['marks_obtained'] > attrs['total_marks']:
+            raise serializers.ValidationError({'marks_obtained': 'Cannot exceed total_marks.'})
+        return attrs
+
+class EnrollmentImportSerializer(serializers.Serializer):
+    student_id = serializers.CharField(max_length=50)
+    faculty_id = serializers.CharField(max_length=50)
+    subject = serializers.CharField(max_length=200)
+    semester = serializers.IntegerField(min_value=1)
+    program = serializers.CharField(max_length=100, required=False, default='')
+
+class ImportReport:
+    """Outcome of an import: counts plus the first MAX_REPORTED_ERRORS row errors"""
+
+    def __init__(self, kind, dry_run):
+        self.kind = kind
+        self.dry_run = dry_run
+        self.rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'kind': self.kind,
+            'dry_run': self.dry_run,
+            'rows': self.rows,
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': sorted(self.errors, key=lambda error: error['line']),
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+class PasswordHasherPool:
+    """Hash passwords in worker processes; small batches are hashed inline"""
+
+    def __init__(self, workers=None):
+        self.workers = workers if workers is not None else settings.IMPORT_HASH_WORKERS
+        self._pool = None
+
+    def hash(self, passwords):
+        if self.workers <= 1 or len(passwords) <= HASH_BATCH_SIZE:
+            return make_passwords(passwords)
+        if self._pool is None:
+            # spawn, not fork: the caller may be a threaded web worker holding DB connections
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        batches = [passwords[i:i + HASH_BATCH_SIZE] for i in range(0, len(passwords), HASH_BATCH_SIZE)]
+        return list(chain.from_iterable(self._pool.map(make_passwords, batches)))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+def _welcome_message(user, invite_token):
+    message = (
+        f'Hello {user.name},\n\nAn account has been created for you at Adwaita Mission Institute of Technology.'
+        f'\n\nRole: {user.role}\nEmail: {user.email}\n\n'
+    )
+    if invite_token:
+        message += (
+            f'Set your password here: {settings.FRONTEND_URL}/reset-password?token={invite_token}\n\n'
+            f'This link expires in {settings.IMPORT_INVITE_DAYS} days.'
+        )
+    else:
+        message += 'Please login with the password provided by the college office and change it.'
+    return message
+
+class _Importer:
+    kind = None
+    serializer_class = None
+
+    def __init__(self, report, dry_run, send_welcome, hasher):
+        self.report = report
+        self.dry_run = dry_run
+        self.send_welcome = send_welcome
+        self.hasher = hasher
+
+    def validate(self, rows):
+        """[(line, validated_data)] for rows that pass the serializer"""
+        valid = []
+        for line, row in rows:
+            serializer = self.serializer_class(data=row)
+            if serializer.is_valid():
+                valid.append((line, serializer.validated_data))
+            else:
+                self.report.add_error(line, serializer.errors)
+        return valid
+
+    def process(self, rows):
+        valid = self.check(self.validate(rows))
+        if not valid or self.dry_run:
+            self.report.imported += len(valid)
+            return
+        try:
+            with transaction.atomic():
+                self.save(valid)
+        except IntegrityError as e:
+            # Another request created a conflicting row between the check and the insert
+            for line, _ in valid:
+                self.report.add_error(line, {'non_field_errors': [f'Conflicting row created during the import ({e}); re-run this row.']})
+            return
+        self.report.imported += len(valid)
+        self.after_save(valid)
+
+    def check(self, valid):
+        return valid
+
+    def save(self, valid):
+        raise NotImplementedError
+
+    def after_save(self, valid):
+        pass
+
+class _UserImporter(_Importer):
+    role = None
+    profile_model = None
+    id_field = None
+    search_kind = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.seen_emails = set()
+        self.seen_ids = set()
+
+    def check(self, valid):
+        for _, data in valid:
+            data['email'] = User.objects.normalize_email(data['email'])
+        existing_emails = set(User.objects.filter(
+            email__in=[data['email'] for _, data in valid]
+        ).values_list('email', flat=True))
+        existing_ids = set(self.profile_model.objects.filter(
+            **{f'{self.id_field}__in': [data[self.id_field] for _, data in valid]}
+        ).values_list(self.id_field, flat=True))
+
+        checked = []
+        for line, data in valid:
+            email, college_id = data['email'], data[self.id_field]
+            errors = {}
+            if email in existing_emails:
+                errors['email'] = ['A user with this email already exists.']
+            elif email.lower() in self.seen_emails:
+                errors['email'] = ['Duplicate email in this file.']
+            if college_id in existing_ids:
+                errors[self.id_field] = [f'{self.id_field} already exists.']
+            elif college_id in self.seen_ids:
+                errors[self.id_field] = [f'Duplicate {self.id_field} in this file.']
+            self.seen_emails.add(email.lower())
+            self.seen_ids.add(college_id)
+            if errors:
+                self.report.add_error(line, errors)
+            else:
+                checked.append((line, data))
+        return checked
+
+    def save(self, valid):
+        passwords = [data.pop('password', '') for _, data in valid]
+        given = [password for password in passwords if password]
+        hashed = iter(self.hasher.hash(given) if given else [])
+
+        users = []
+        for (_, data), password in zip(valid, passwords):
+            users.append(User(
+                email=data.pop('email'), name=data.pop('name'), role=self.role, is_setup_complete=True,
+                password=next(hashed) if password else make_password(None),
+            ))
+        User.objects.bulk_create(users)
+        profiles = self.profile_model.objects.bulk_create([
+            self.profile_model(user=user, **data) for user, (_, data) in zip(users, valid)
+        ])
+        # bulk_create skips the post_save signal that indexes new profiles
+        index_for_search(self.search_kind, profiles, new=True)
+
+        invites = {}
+        if self.send_welcome:
+            expires_at = timezone.now() + timedelta(days=settings.IMPORT_INVITE_DAYS)
+            invites = {
+                user.pk: PasswordResetToken(user=user, token=secrets.token_urlsafe(32), expires_at=expires_at)
+                for user, password in zip(users, passwords) if not password
+            }
+            PasswordResetToken.objects.bulk_create(invites.values())
+            OutboundNotification.objects.bulk_create([
+                OutboundNotification(
+                    type='email', recipient=user.email,
+                    subject='Welcome to Adwaita Mission Institute of Technology',
+                    message=_welcome_message(user, invites[user.pk].token if user.pk in invites else None),
+                )
+                for user in users
+            ])
+
+class StudentImporter(_UserImporter):
+    kind = 'students'
+    role = 'student'
+    profile_model = StudentProfile
+    id_field = 'student_id'
+    search_kind = 'student'
+    serializer_class = StudentImportSerializer
+
+class FacultyImporter(_UserImporter):
+    kind = 'faculty'
+    role = 'faculty'
+    profile_model = FacultyProfile
+    id_field = 'faculty_id'
+    search_kind = 'faculty'
+    serializer_class = FacultyImportSerializer
+
+class _StudentFacultyImporter(_Importer):
+    """Rows that reference a student and a faculty member by their college ids"""
+
+    def check(self, valid):
+        students = dict(StudentProfile.objects.filter(
+            student_id__in={data['student_id'] for _, data in valid}
+        ).values_list('student_id', 'id'))
+        faculty = dict(FacultyProfile.objects.filter(
+            faculty_id__in={data['faculty_id'] for _, data in valid}
+        ).values_list('faculty_id', 'id'))
+
+        checked = []
+        for line, data in valid:
+            errors = {}
+            if data['student_id'] not in students:
+                errors['student_id'] = ['Unknown student_id.']
+            if data['faculty_id'] not in faculty:
+                errors['faculty_id'] = ['Unknown faculty_id.']
+            if errors:
+                self.report.add_error(line, errors)
+                continue
+            data['student_id'] = students[data.pop('student_id')]
+            data['faculty_id'] = faculty[data.pop('faculty_id')]
+            checked.append((line, data))
+        return checked
+
+class GradeImporter(_StudentFacultyImporter):
+    kind = 'grades'
+    serializer_class = GradeImportSerializer
+
+    def save(self, valid):
+        GradeRecord.objects.bulk_create([GradeRecord(**data) for _, data in valid])
+
+    def after_save(self, valid):
+        # bulk_create skips the post_save signal; refresh results already published for these students
+        earliest = {}
+        for _, data in valid:
+            student = data['student_id']
+            earliest[student] = min(earliest.get(student, data['semester']), data['semester'])
+        published = SemesterResult.objects.filter(student_id__in=earliest).values_list('student_id', flat=True).distinct()
+        for student in published:
+            refresh_student_results(student, earliest[student])
+        invalidate_student_dashboards(earliest)
+
+class EnrollmentImporter(_StudentFacultyImporter):
+    """Rows name a student and an offering (faculty, subject, semester); missing offerings are created"""
+    kind = 'enrollments'
+    serializer_class = EnrollmentImportSerializer
+
+    def save(self, valid):
+        programs = {}
+        for _, data in valid:
+            key = (data['faculty_id'], data['subject'], data['semester'])
+            programs[key] = data['program'] or programs.get(key, '')
+        # Existing offerings keep their program
+        CourseOffering.objects.bulk_create([
+            CourseOffering(faculty_id=faculty, subject=subject, semester=semester, program=program)
+            for (faculty, subject, semester), program in programs.items()
+        ], ignore_conflicts=True)
+        offerings = {
+            (faculty, subject, semester): pk
+            for faculty, subject, semester, pk in CourseOffering.objects.filter(
+                faculty_id__in={key[0] for key in programs},
+                subject__in={key[1] for key in programs},
+                semester__in={key[2] for key in programs},
+            ).values_list('faculty_id', 'subject', 'semester', 'id')
+        }
+        Enrollment.objects.bulk_create([
+            Enrollment(offering_id=offerings[(data['faculty_id'], data['subject'], data['semester'])], student_id=data['student_id'])
+            for _, data in valid
+        ], ignore_conflicts=True)
+        # bulk_create skips the signal that drops cached rosters
+        changed = [offerings[key] for key in programs]
+        transaction.on_commit(lambda: invalidate_rosters(changed))
+
+IMPORTERS = {
+    importer.kind: importer for importer in (StudentImporter, FacultyImporter, GradeImporter, EnrollmentImporter)
+}
+
+def _required_columns(serializer_class):
+    return {name for name, field in serializer_class().fields.items() if field.required and not field.read_only}
+
+def import_csv(kind, file, dry_run=False, send_welcome=True, chunk_size=None, hash_workers=None, progress=None):
+    """
+    Import `kind` ('students', 'faculty', 'grades' or 'enrollments') from a text file object
+    with a header row. Returns an ImportReport; raises InvalidImportFile if
+    the header lacks a required column.
+    """
+    importer_class = IMPORTERS[kind]
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+    reader = csv.DictReader(file)
+    try:
+        header = set(reader.fieldnames or ())
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise InvalidImportFile(f'Could not read the CSV header: {e}') from e
+    missing = _required_columns(importer_class.serializer_class) - header
+    if missing:
+        raise InvalidImportFile(f'Missing columns: {", ".join(sorted(missing))}')
+
+    report = ImportReport(kind, dry_run)
+    hasher = PasswordHasherPool(hash_workers)
+    importer = importer_class(report, dry_run, send_welcome, hasher)
+
+    def numbered_rows():
+        try:
+            for row in reader:
+                # Blank cells count as missing so optional columns fall back to their defaults
+                yield reader.line_num, {key: value.strip() for key, value in row.items() if key and value and value.strip()}
+        except (csv.Error, UnicodeDecodeError) as e:
+            # Earlier chunks are already committed; say how far the import got
+            raise InvalidImportFile(
+                f'Line {reader.line_num}: {e}; the {report.imported} valid rows before it were imported'
+            ) from e
+
+    rows = numbered_rows()
+    try:
+        while chunk := list(islice(rows, chunk_size)):
+            report.rows += len(chunk)
+            importer.process(chunk)
+            if progress:
+                progress(report)
+    finally:
+        hasher.close()
+    return report
@@ -0,0 +1,48 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from users.archive import academic_year_start, archive_attendance, cutoffs, default_cutoff
+from users.models import AttendanceRecord
+
+
+class Command(BaseCommand):
+    help = (
+        'Move attendance from closed academic years to the archive table, keeping ATTENDANCE_HOT_YEARS '
+        'years in attendance_records. Safe to run repeatedly, e.g. from a monthly cron job'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before', type=date.fromisoformat,
+            help='Archive records dated before this academic year start (YYYY-MM-DD) instead of the default'
+        )
+        parser.add_argument('--chunk-size', type=int, default=None, help='Records moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the records that would move')
+
+    def handle(self, *args, **options):
+        cutoff = options['before'] or default_cutoff()
+        if cutoff != academic_year_start(cutoff):
+            raise CommandError(f'{cutoff} is not the start of an academic year ({academic_year_start(cutoff)} is)')
+        if cutoff > academic_year_start(timezone.localdate()):
+            raise CommandError('The current academic year is still open and cannot be archived')
+        closed = cutoffs()[0]
+        if closed is not None and cutoff < closed:
+            raise CommandError(f'Attendance before {closed} is already archived')
+
+        if options['dry_run']:
+            count = AttendanceRecord.objects.filter(date__lt=cutoff).count()
+            self.stdout.write(f'{count} attendance records dated before {cutoff} would be archived')
+            return
+
+        start = time.perf_counter()
+
+        def progress(moved):
+            self.stdout.write(f'  {moved:>10} moved ({time.perf_counter() - start:.1f}s)')
+
+        run = archive_attendance(cutoff, chunk_size=options['chunk_size'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {run.moved} attendance records dated before {cutoff} in {time.perf_counter() - start:.1f}s'
+        ))
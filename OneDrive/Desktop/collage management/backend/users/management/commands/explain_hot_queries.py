@@ -0,0 +1,126 @@
+import re
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from contact.models import OutboundNotification
+from faculty_portal.models import CourseOffering, Enrollment
+from student_portal.announcements import visible_announcements
+from student_portal.models import SemesterResult
+from users.models import StudentProfile, AttendanceRecord, ArchivedAttendanceRecord, AttendanceSummary, GradeRecord
+from users.synthetic import generate_dataset
+
+# SQLite: "SCAN table" without an index is a full table scan; "SEARCH ... USING INDEX" is not
+SQLITE_FULL_SCAN = re.compile(r'\bSCAN (\w+)(?!.*\bINDEX\b)')
+POSTGRES_FULL_SCAN = re.compile(r'\bSeq Scan on (\w+)')
+ANALYZED_TABLES = (
+    'users', 'student_profiles', 'faculty_profiles', 'attendance_records', 'attendance_summaries',
+    'grade_records', 'semester_results', 'announcements', 'notification_outbox', 'course_offerings', 'enrollments',
+    'attendance_records_archive',
+)
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the portal hot queries on a synthetic dataset and fail on full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000, help='Synthetic students to generate')
+        parser.add_argument('--days', type=int, default=20, help='Attendance days per subject')
+        parser.add_argument('--database', default='default', help='Database alias to check')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan in full')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        connection = connections[alias]
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'Unsupported database vendor: {connection.vendor}')
+        full_scan = SQLITE_FULL_SCAN if connection.vendor == 'sqlite' else POSTGRES_FULL_SCAN
+
+        # The dataset only lives inside this transaction
+        failures = []
+        with transaction.atomic(using=alias):
+            start = time.perf_counter()
+            dataset = generate_dataset(students=options['students'], days=options['days'])
+            self._analyze(connection)
+            counts = ', '.join(f'{name}={count}' for name, count in dataset['counts'].items())
+            self.stdout.write(f'{connection.vendor}: generated {counts} in {time.perf_counter() - start:.1f}s')
+
+            for name, queryset in self._hot_queries(dataset):
+                plan = queryset.using(alias).explain()
+                scanned = sorted(set(full_scan.findall(plan)))
+                if scanned:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(f'  FULL SCAN  {name}: {", ".join(scanned)}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'  indexed    {name}'))
+                if scanned or options['verbose_plans']:
+                    self.stdout.write('\n'.join(f'      {line}' for line in plan.splitlines()))
+
+            transaction.set_rollback(True, using=alias)
+
+        if failures:
+            raise CommandError(f'{len(failures)} hot queries use a full table scan: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('All hot queries use indexes'))
+
+    def _analyze(self, connection):
+        """Refresh planner statistics so plans reflect the synthetic data volume"""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+            else:
+                for table in ANALYZED_TABLES:
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(table)}')
+
+    def _hot_queries(self, dataset):
+        """(name, queryset) for each query the portals run per request"""
+        (program, section), members = next(iter(dataset['sections'].items()))
+        student = members[len(members) // 2]
+        subject = dataset['subjects'][program][0]
+        teacher = dataset['teachers'][(subject, section)]
+        day = dataset['days'][len(dataset['days']) // 2]
+        roster = [profile.pk for profile in members]
+        offering = dataset['offerings'][(teacher.pk, subject)]
+
+        return [
+            ('grades: student up to semester', GradeRecord.objects.filter(student=student, semester__lte=3).values_list(
+                'student_id', 'semester', 'subject', 'assessment_type', 'marks_obtained', 'total_marks'
+            )),
+            ('grades: result refresh for one semester', GradeRecord.objects.filter(student=student, semester=2)),
+            ('grades: faculty gradebook', GradeRecord.objects.filter(faculty=teacher, subject=subject, semester=2)),
+            ('results: student semester', SemesterResult.objects.filter(student__user_id=student.user_id, semester=2)),
+            ('attendance: class on a day', AttendanceRecord.objects.filter(subject=subject, date=day)),
+            ('attendance: upsert previous statuses', AttendanceRecord.objects.filter(
+                subject=subject, date=day, student_id__in=roster
+            ).values_list('student_id', 'status')),
+            ('attendance: faculty date range', AttendanceRecord.objects.filter(
+                faculty=teacher, subject=subject, date__range=(dataset['days'][0], day)
+            )),
+            ('roster: faculty offerings', CourseOffering.objects.filter(faculty__user_id=teacher.user_id)),
+            ('roster: offering students', Enrollment.objects.filter(
+                offering_id=offering.pk, student__user__is_active=True
+            ).order_by('student__student_id').values_list('student__student_id', 'student__user__name')),
+            ('archive: faculty date range', ArchivedAttendanceRecord.objects.filter(
+                faculty=teacher, subject=subject, date__range=(dataset['days'][0], day)
+            )),
+            ('archive: summary rebuild', ArchivedAttendanceRecord.objects.filter(student_id__in=roster).values(
+                'student_id', 'subject'
+            ).annotate(total=Count('id')).order_by()),
+            ('attendance: student summary', AttendanceSummary.objects.filter(student__user_id=student.user_id)),
+            ('announcements: feed page', visible_announcements(program).order_by('-created_at', '-id')[:21]),
+            ('students: program roster', StudentProfile.objects.filter(
+                program=program, user__is_active=True
+            ).values_list('user__email', 'phone')),
+            ('admin: attendance changelist page', AttendanceRecord.objects.select_related(
+                'student__user', 'faculty__user'
+            ).order_by('-date', '-id')[:100]),
+            ('admin: grades changelist page', GradeRecord.objects.select_related(
+                'student__user', 'faculty__user'
+            ).order_by('-created_at', '-id')[:100]),
+            ('outbox: claim due notifications', OutboundNotification.objects.filter(
+                status__in=('pending', 'processing'), next_attempt_at__lte=timezone.now() + timedelta(seconds=1)
+            ).order_by('next_attempt_at').values_list('id', flat=True)[:50]),
+        ]
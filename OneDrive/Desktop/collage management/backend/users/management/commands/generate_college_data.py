@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from search.index import rebuild as rebuild_search_index
+from users.synthetic import generate_dataset
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic college (students, faculty, attendance, grades, announcements) for load testing'
+
+    def add_arguments(self, parser):
+        # Defaults give roughly 20k students, 800 faculty, 5M attendance rows and 1M grades
+        parser.add_argument('--students', type=int, default=20000)
+        parser.add_argument('--faculty', type=int, default=800)
+        parser.add_argument('--subjects', type=int, default=6, help='Subjects per program')
+        parser.add_argument('--days', type=int, default=42, help='Attendance days per subject')
+        parser.add_argument('--semesters', type=int, default=3, help='Semesters of grades per student')
+        parser.add_argument('--section-size', type=int, default=60, help='Students per class section')
+        parser.add_argument('--announcements', type=int, default=2000)
+        parser.add_argument('--notifications', type=int, default=20000, help='Outbox rows')
+        parser.add_argument('--password', default='LoadTest@12345', help='Password for every generated user')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible data')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        def progress(label, count):
+            self.stdout.write(f'  {label:<22} {count:>10}  ({time.perf_counter() - start:.0f}s)')
+
+        with transaction.atomic():
+            dataset = generate_dataset(
+                students=options['students'],
+                faculty=options['faculty'],
+                subjects_per_program=options['subjects'],
+                days=options['days'],
+                semesters=options['semesters'],
+                section_size=options['section_size'],
+                announcements=options['announcements'],
+                notifications=options['notifications'],
+                password=options['password'],
+                seed=options['seed'],
+                progress=progress,
+            )
+        # bulk_create skips the signals that keep the search index current
+        rebuild_search_index(['student', 'faculty', 'announcement'])
+        progress('search index', sum(dataset['counts'].get(label, 0) for label in ('students', 'faculty', 'announcements')))
+
+        tag = dataset['tag']
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated dataset {tag} in {time.perf_counter() - start:.0f}s. '
+            f'Logins: student-{tag}-<n>@example.com / faculty-{tag}-<n>@example.com'
+        ))
+        self.stdout.write(
+            f'Load test: python loadtest.py --scenario portal --tag {tag} '
+            f'--students {options["students"]} --faculty {options["faculty"]} --password {options["password"]}'
+        )
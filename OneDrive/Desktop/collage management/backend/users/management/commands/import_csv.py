@@ -0,0 +1,64 @@
+import csv
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.imports import IMPORTERS, InvalidImportFile, import_csv
+
+
+class Command(BaseCommand):
+    help = 'Import students, faculty, grades or enrollments from a CSV file with a header row'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS))
+        parser.add_argument('path', help='CSV file (UTF-8, header row with the column names)')
+        parser.add_argument('--dry-run', action='store_true', help='Validate every row without writing anything')
+        parser.add_argument('--no-welcome', action='store_true', help='Do not queue welcome emails for new users')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Rows per transaction (IMPORT_CHUNK_SIZE)')
+        parser.add_argument('--workers', type=int, default=None, help='Password hashing processes (IMPORT_HASH_WORKERS)')
+        parser.add_argument('--errors', help='Write the rejected rows to this CSV file (line, field, message)')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        def progress(report):
+            self.stdout.write(
+                f'  {report.rows:>8} rows  {report.imported:>8} ok  {report.failed:>6} rejected  '
+                f'({time.perf_counter() - start:.1f}s)'
+            )
+
+        try:
+            # utf-8-sig drops the byte order mark Excel writes
+            with open(options['path'], newline='', encoding='utf-8-sig') as file:
+                report = import_csv(
+                    options['kind'], file,
+                    dry_run=options['dry_run'],
+                    send_welcome=not options['no_welcome'],
+                    chunk_size=options['chunk_size'],
+                    hash_workers=options['workers'],
+                    progress=progress,
+                )
+        except (OSError, InvalidImportFile) as e:
+            raise CommandError(str(e))
+
+        errors = report.as_dict()['errors']
+        if options['errors']:
+            with open(options['errors'], 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['line', 'field', 'message'])
+                for error in errors:
+                    for field, messages in error['errors'].items():
+                        for message in messages if isinstance(messages, list) else [messages]:
+                            writer.writerow([error['line'], field, message])
+        else:
+            for error in errors[:20]:
+                self.stdout.write(self.style.WARNING(f'  line {error["line"]}: {json.dumps(error["errors"])}'))
+            if report.failed > 20:
+                self.stdout.write(self.style.WARNING(f'  ... {report.failed - 20} more; use --errors to save them all'))
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {report.imported} of {report.rows} {options["kind"]} rows in {time.perf_counter() - start:.1f}s '
+            f'({report.failed} rejected)'
+        ))
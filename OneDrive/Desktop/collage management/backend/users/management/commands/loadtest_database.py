@@ -0,0 +1,104 @@
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.utils import timezone
+
+from faculty_portal.models import CourseOffering, Enrollment
+from faculty_portal.services import mark_attendance
+from users.models import User, StudentProfile, FacultyProfile, AttendanceSummary
+
+
+class Command(BaseCommand):
+    help = (
+        'Run a mixed attendance/login/read workload from several threads against the configured '
+        'database and report throughput. Run once with and once without DATABASE_URL to compare.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--students', type=int, default=300)
+        parser.add_argument('--class-size', type=int, default=60)
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        faculty, students = self._create_fixture(tag, options['students'])
+        user_ids = [student.user_id for student in students]
+        counts = Counter()
+        errors = Counter()
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['seconds']
+
+        def worker(seed):
+            rng = random.Random(seed)
+            local, local_errors = Counter(), Counter()
+            try:
+                while time.monotonic() < deadline:
+                    roll = rng.random()
+                    try:
+                        if roll < 0.2:
+                            roster = rng.sample(students, min(options['class_size'], len(students)))
+                            mark_attendance(
+                                faculty, f'Load {tag}', date(2000, 1, 1) + timedelta(days=rng.randrange(200)),
+                                [{'student_id': s.student_id, 'status': rng.choice(('present', 'absent'))} for s in roster]
+                            )
+                            local['attendance_bulk'] += 1
+                        elif roll < 0.5:
+                            User.objects.filter(pk=rng.choice(user_ids)).update(last_login=timezone.now())
+                            local['login_write'] += 1
+                        else:
+                            list(AttendanceSummary.objects.filter(student=rng.choice(students)))
+                            local['dashboard_read'] += 1
+                    except Exception as e:
+                        local_errors[type(e).__name__ + ': ' + str(e)[:60]] += 1
+            finally:
+                connection.close()
+                with lock:
+                    counts.update(local)
+                    errors.update(local_errors)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(options['threads'])]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+        User.objects.filter(email__startswith=f'load-{tag}').delete()
+
+        vendor = connections['default'].vendor
+        self.stdout.write(f'{vendor}: {options["threads"]} threads for {elapsed:.1f}s')
+        for operation, count in sorted(counts.items()):
+            self.stdout.write(f'  {operation:<16} {count / elapsed:>8.1f} ops/s')
+        self.stdout.write(f'  {"total":<16} {sum(counts.values()) / elapsed:>8.1f} ops/s')
+        for error, count in errors.most_common():
+            self.stdout.write(self.style.ERROR(f'  {count} x {error}'))
+
+    def _create_fixture(self, tag, size):
+        faculty_user = User.objects.create(email=f'load-{tag}-faculty@example.com', name='Load Faculty', role='faculty', password='!')
+        faculty = FacultyProfile.objects.create(
+            user=faculty_user, faculty_id=f'LF-{tag}', department='Load',
+            designation='Professor', phone='0000000000', specialization='Load'
+        )
+        users = User.objects.bulk_create([
+            User(email=f'load-{tag}-{n}@example.com', name=f'Student {n}', role='student', password='!')
+            for n in range(size)
+        ])
+        students = StudentProfile.objects.bulk_create([
+            StudentProfile(
+                user=user, student_id=f'LS-{tag}-{n}', program='Load',
+                enrollment_date=date(2000, 1, 1), phone='0000000000', address='-'
+            )
+            for n, user in enumerate(users)
+        ])
+        # mark_attendance only marks students enrolled in the faculty member's offering of the subject
+        offering = CourseOffering.objects.create(faculty=faculty, subject=f'Load {tag}', semester=1, program='Load')
+        Enrollment.objects.bulk_create([Enrollment(offering=offering, student=student) for student in students])
+        return faculty, students
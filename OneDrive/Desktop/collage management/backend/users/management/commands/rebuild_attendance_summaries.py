@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from users.services import iter_student_id_chunks, rebuild_attendance_summaries
+
+
+class Command(BaseCommand):
+    help = 'Recompute AttendanceSummary from AttendanceRecord in chunks of students'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Students recomputed per transaction')
+
+    def handle(self, *args, **options):
+        students = summaries = 0
+        for chunk in iter_student_id_chunks(options['chunk_size']):
+            summaries += rebuild_attendance_summaries(chunk)
+            students += len(chunk)
+            self.stdout.write(f'Rebuilt {students} students...')
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {summaries} summaries for {students} students'))
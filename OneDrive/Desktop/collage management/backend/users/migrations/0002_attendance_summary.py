@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:30
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceSummary',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('subject', models.CharField(max_length=200)),
+                ('present_count', models.IntegerField(default=0)),
+                ('total_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='users.studentprofile')),
+            ],
+            options={
+                'db_table': 'attendance_summaries',
+                'unique_together': {('student', 'subject')},
+            },
+        ),
+    ]
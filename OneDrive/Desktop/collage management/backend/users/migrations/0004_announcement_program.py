@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='program',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_announcement_program'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='announcement_feed_idx'),
+        ),
+    ]
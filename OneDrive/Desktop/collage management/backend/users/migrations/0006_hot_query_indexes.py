@@ -0,0 +1,41 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_announcement_feed_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='announcement',
+            name='announcement_feed_idx',
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='announcement_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['subject', 'date', 'student'], include=('status',), name='attendance_subject_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['faculty', 'subject', 'date'], include=('status',), name='attendance_faculty_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='graderecord',
+            index=models.Index(fields=['student', 'semester'], include=('subject', 'assessment_type', 'marks_obtained', 'total_marks'), name='grade_student_semester_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='graderecord',
+            index=models.Index(fields=['faculty', 'subject', 'semester'], name='grade_faculty_subject_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(fields=['program', 'current_semester'], name='student_program_idx'),
+        ),
+    ]
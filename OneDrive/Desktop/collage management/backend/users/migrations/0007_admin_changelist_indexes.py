@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['-date', '-id'], name='attendance_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='graderecord',
+            index=models.Index(fields=['-created_at', '-id'], name='grade_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:43
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_admin_changelist_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceArchiveRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('cutoff', models.DateField()),
+                ('moved', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'attendance_archive_runs',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedAttendanceRecord',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('subject', models.CharField(max_length=200)),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('present', 'Present'), ('absent', 'Absent')], max_length=10)),
+                ('marked_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField()),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendance', to='users.facultyprofile')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_attendance', to='users.studentprofile')),
+            ],
+            options={
+                'db_table': 'attendance_records_archive',
+                'indexes': [models.Index(fields=['faculty', 'subject', 'date'], name='attendance_archive_faculty_idx')],
+                'unique_together': {('student', 'subject', 'date')},
+            },
+        ),
+    ]
@@ -35,17 +35,39 @@ class User(AbstractBaseUser, PermissionsMixin):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     last_login = models.DateTimeField(null=True, blank=True)
+    token_version = models.PositiveIntegerField(default=0)
     
     objects = UserManager()
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['name', 'role']
     
+    # Changing any of these revokes access tokens already issued to the user
+    TOKEN_STATE_FIELDS = ('role', 'is_active')
+    
     class Meta:
         db_table = 'users'
         
     def __str__(self):
         return f"{self.name} ({self.email})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._token_state = instance._get_token_state()
+        return instance
+    
+    def _get_token_state(self):
+        return tuple(self.__dict__.get(field) for field in self.TOKEN_STATE_FIELDS)
+    
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_token_state', None)
+        if loaded is not None and loaded != self._get_token_state():
+            self.token_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'token_version'}
+        super().save(*args, **kwargs)
+        self._token_state = self._get_token_state()
 
 class StudentProfile(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -59,6 +81,10 @@ class StudentProfile(models.Model):
     
     class Meta:
         db_table = 'student_profiles'
+        indexes = [
+            # Program rosters: result publishing, announcement broadcasts
+            models.Index(fields=['program', 'current_semester'], name='student_program_idx'),
+        ]
         
     def __str__(self):
         return f"{self.student_id} - {self.user.name}"
@@ -96,10 +122,70 @@ class AttendanceRecord(models.Model):
     class Meta:
         db_table = 'attendance_records'
         unique_together = ('student', 'subject', 'date')
+        indexes = [
+            # A class on a given day (marking, roster views); student_id makes it covering for upserts
+            models.Index(fields=['subject', 'date', 'student'], include=['status'], name='attendance_subject_date_idx'),
+            # A faculty member's classes over a date range
+            models.Index(fields=['faculty', 'subject', 'date'], include=['status'], name='attendance_faculty_date_idx'),
+            # Admin changelist: newest first (the admin adds -id to make the order total)
+            models.Index(fields=['-date', '-id'], name='attendance_recent_idx'),
+        ]
         
     def __str__(self):
         return f"{self.student.student_id} - {self.subject} - {self.date}"
 
+class ArchivedAttendanceRecord(models.Model):
+    """An AttendanceRecord from a closed academic year, moved here by users/archive.py"""
+    id = models.UUIDField(primary_key=True, editable=False)  # the original record's id
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='archived_attendance')
+    faculty = models.ForeignKey(FacultyProfile, on_delete=models.CASCADE, related_name='archived_attendance')
+    subject = models.CharField(max_length=200)
+    date = models.DateField()
+    status = models.CharField(max_length=10, choices=AttendanceRecord.STATUS_CHOICES)
+    marked_at = models.DateTimeField()
+    created_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'attendance_records_archive'
+        # Only what historical reads need: per-student rebuilds and faculty exports
+        unique_together = ('student', 'subject', 'date')
+        indexes = [
+            models.Index(fields=['faculty', 'subject', 'date'], name='attendance_archive_faculty_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.student_id} - {self.subject} - {self.date} (archived)"
+
+class AttendanceArchiveRun(models.Model):
+    """One archive_attendance run: records dated before `cutoff` move to the archive"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    cutoff = models.DateField()
+    moved = models.IntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'attendance_archive_runs'
+        
+    def __str__(self):
+        return f"Archive before {self.cutoff} ({self.moved} records)"
+
+class AttendanceSummary(models.Model):
+    """Running present/total counts per student and subject, maintained on every attendance write"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='attendance_summaries')
+    subject = models.CharField(max_length=200)
+    present_count = models.IntegerField(default=0)
+    total_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'attendance_summaries'
+        unique_together = ('student', 'subject')
+        
+    def __str__(self):
+        return f"{self.student_id} - {self.subject} - {self.present_count}/{self.total_count}"
+
 class GradeRecord(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='grade_records')
@@ -114,6 +200,18 @@ class GradeRecord(models.Model):
     
     class Meta:
         db_table = 'grade_records'
+        indexes = [
+            # A student's grades up to a semester (grades, results); covering for the grading engine on PostgreSQL
+            models.Index(
+                fields=['student', 'semester'],
+                include=['subject', 'assessment_type', 'marks_obtained', 'total_marks'],
+                name='grade_student_semester_idx'
+            ),
+            # A faculty member's gradebook for a subject
+            models.Index(fields=['faculty', 'subject', 'semester'], name='grade_faculty_subject_idx'),
+            # Admin changelist: newest first (the admin adds -id to make the order total)
+            models.Index(fields=['-created_at', '-id'], name='grade_recent_idx'),
+        ]
         
     def __str__(self):
         return f"{self.student.student_id} - {self.subject} - {self.marks_obtained}/{self.total_marks}"
@@ -123,6 +221,7 @@ class Announcement(models.Model):
     faculty = models.ForeignKey(FacultyProfile, on_delete=models.CASCADE, related_name='announcements')
     title = models.CharField(max_length=255)
     content = models.TextField()
+    program = models.CharField(max_length=100, blank=True)  # blank = all programs
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -130,6 +229,12 @@ class Announcement(models.Model):
     class Meta:
         db_table = 'announcements'
         ordering = ['-created_at']
+        indexes = [
+            # Feed pages walk active announcements newest first, keyed on (created_at, id).
+            # Partial rather than leading on is_active: the ORM filters booleans as a bare
+            # column ("WHERE is_active"), which SQLite can only match against an index predicate
+            models.Index(fields=['-created_at', '-id'], condition=models.Q(is_active=True), name='announcement_feed_idx'),
+        ]
         
     def __str__(self):
         return self.title
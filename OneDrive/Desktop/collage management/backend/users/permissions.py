@@ -0,0 +1,22 @@
+from rest_framework.permissions import BasePermission
+
+class IsStudent(BasePermission):
+    """Allow access only to users with the student role"""
+    message = 'Only students can access this endpoint.'
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and request.user.role == 'student')
+
+class IsFaculty(BasePermission):
+    """Allow access only to users with the faculty role"""
+    message = 'Only faculty members can access this endpoint.'
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and request.user.role == 'faculty')
+
+class IsAdminRole(BasePermission):
+    """Allow access only to users with the admin role"""
+    message = 'Only administrators can access this endpoint.'
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and request.user.role == 'admin')
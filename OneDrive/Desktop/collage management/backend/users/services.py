@@ -0,0 +1,89 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Count, F, Q
+from .archive import attendance_sources
+from .models import StudentProfile, AttendanceSummary
+
+def lock_attendance_summaries(subject, student_ids):
+    """
+    Create any missing summaries for `student_ids` in `subject` and lock them
+    until the transaction ends. Writers of the same students' attendance in
+    the subject then queue here, so each reads the statuses the previous one
+    committed; locking the attendance rows alone misses rows not written yet.
+    """
+    student_ids = sorted(set(student_ids))
+    if not student_ids:
+        return
+    AttendanceSummary.objects.bulk_create(
+        [AttendanceSummary(student_id=student, subject=subject) for student in student_ids],
+        ignore_conflicts=True,
+    )
+    # Always taken in id order, so two rosters sharing students cannot deadlock
+    list(
+        AttendanceSummary.objects.select_for_update().filter(student_id__in=student_ids, subject=subject)
+        .order_by('id').values_list('id', flat=True)
+    )
+
+def apply_attendance_deltas(subject, deltas):
+    """
+    Apply {student_pk: (present_delta, total_delta)} to the summary table, in
+    the transaction that locked the summaries (lock_attendance_summaries).
+    
+    Students sharing the same delta are updated together, so a whole roster
+    costs at most a handful of UPDATE statements.
+    """
+    deltas = {student: delta for student, delta in deltas.items() if delta != (0, 0)}
+    if not deltas:
+        return
+    
+    groups = defaultdict(list)
+    for student, delta in deltas.items():
+        groups[delta].append(student)
+    
+    for (present_delta, total_delta), students in groups.items():
+        AttendanceSummary.objects.filter(student_id__in=students, subject=subject).update(
+            present_count=F('present_count') + present_delta,
+            total_count=F('total_count') + total_delta,
+        )
+
+def rebuild_attendance_summaries(student_ids):
+    """Recompute summaries for the given students from their attendance records, archived ones included"""
+    counts = defaultdict(lambda: [0, 0])
+    for source in attendance_sources():
+        rows = (
+            source.filter(student_id__in=student_ids)
+            .values('student_id', 'subject')
+            .annotate(total=Count('id'), present=Count('id', filter=Q(status='present')))
+            .order_by()
+        )
+        for row in rows:
+            count = counts[(row['student_id'], row['subject'])]
+            count[0] += row['present']
+            count[1] += row['total']
+    summaries = [
+        AttendanceSummary(
+            student_id=student,
+            subject=subject,
+            present_count=present,
+            total_count=total,
+        )
+        for (student, subject), (present, total) in counts.items()
+    ]
+    
+    with transaction.atomic():
+        AttendanceSummary.objects.filter(student_id__in=student_ids).delete()
+        AttendanceSummary.objects.bulk_create(summaries)
+    return len(summaries)
+
+def iter_student_id_chunks(chunk_size):
+    """Yield StudentProfile primary keys in chunks using keyset pagination"""
+    last = None
+    while True:
+        queryset = StudentProfile.objects.order_by('id')
+        if last is not None:
+            queryset = queryset.filter(id__gt=last)
+        chunk = list(queryset.values_list('id', flat=True)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1]
@@ -0,0 +1,220 @@
+"""
+Synthetic college data for benchmarks, load tests and query-plan checks.
+
+Rows are generated lazily and written with bulk_create in fixed-size chunks,
+so memory stays flat even for millions of attendance rows. Every dataset is
+tagged with a short random suffix (emails student-<tag>-<n>@example.com,
+student ids S-<tag>-<n>) so several can coexist; callers that only need the
+data temporarily wrap generate_dataset() in a transaction and roll it back.
+
+Students are assigned to programs round robin (student n is in
+PROGRAMS[n % len(PROGRAMS)]) and split into sections; each (subject, section)
+is taught by one faculty member, whose course offering for the subject has
+those students enrolled.
+"""
+import random
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from contact.models import OutboundNotification
+from faculty_portal.models import CourseOffering, Enrollment
+from student_portal.models import SemesterResult
+from .models import (
+    User, StudentProfile, FacultyProfile, AttendanceRecord, AttendanceSummary, GradeRecord, Announcement
+)
+
+PROGRAMS = ('B.Tech CSE', 'B.Tech ECE', 'B.Tech Mechanical', 'BCA', 'BBA')
+ASSESSMENTS = (('assignment', 20), ('midterm', 50), ('final', 100))
+CHUNK_SIZE = 5000
+
+def bulk_insert(model, rows, chunk_size=CHUNK_SIZE):
+    """bulk_create an iterable of unsaved instances in chunks; returns the number inserted"""
+    rows = iter(rows)
+    inserted = 0
+    while chunk := list(islice(rows, chunk_size)):
+        model.objects.bulk_create(chunk, batch_size=min(chunk_size, 2000))
+        inserted += len(chunk)
+    return inserted
+
+def class_days(days, start=date(2000, 1, 3)):
+    """`days` teaching days (Monday to Friday) from `start`"""
+    result = []
+    day = start
+    while len(result) < days:
+        if day.weekday() < 5:
+            result.append(day)
+        day += timedelta(days=1)
+    return result
+
+def generate_dataset(students=1000, faculty=50, subjects_per_program=6, days=20, semesters=4,
+                     section_size=60, announcements=200, notifications=1000, password=None,
+                     seed=None, progress=None):
+    """
+    Create a college's worth of related rows and return a summary dict with the
+    tag, row counts and the created students, faculty, teaching assignments
+    and course offerings (keyed by (faculty pk, subject)).
+
+    Every student gets `days` attendance rows per subject of their program and
+    one grade per assessment type per subject for each of `semesters`.
+    Users get an unusable password unless `password` is given (hashed once).
+    `progress(label, count)` is called after each table is written.
+    """
+    rng = random.Random(seed)
+    tag = uuid.uuid4().hex[:8]
+    hashed = make_password(password) if password else make_password(None)
+    now = timezone.now()
+    counts = Counter()
+    report = progress or (lambda label, count: None)
+
+    def record(label, count):
+        counts[label] += count
+        report(label, count)
+
+    subjects = {
+        program: [f'{program} Subject {n + 1}' for n in range(subjects_per_program)]
+        for program in PROGRAMS
+    }
+    teaching_days = class_days(days)
+
+    faculty_users = User.objects.bulk_create([
+        User(email=f'faculty-{tag}-{n}@example.com', name=f'Faculty {n}', role='faculty',
+             password=hashed, is_setup_complete=True)
+        for n in range(faculty)
+    ], batch_size=2000)
+    faculty_profiles = FacultyProfile.objects.bulk_create([
+        FacultyProfile(
+            user=user, faculty_id=f'F-{tag}-{n}', department=PROGRAMS[n % len(PROGRAMS)],
+            designation='Professor', phone='0000000000', specialization='General'
+        )
+        for n, user in enumerate(faculty_users)
+    ], batch_size=2000)
+    record('faculty', faculty)
+
+    student_profiles = []
+    for start in range(0, students, CHUNK_SIZE):
+        numbers = range(start, min(start + CHUNK_SIZE, students))
+        users = User.objects.bulk_create([
+            User(email=f'student-{tag}-{n}@example.com', name=f'Student {n}', role='student',
+                 password=hashed, is_setup_complete=True)
+            for n in numbers
+        ], batch_size=2000)
+        student_profiles += StudentProfile.objects.bulk_create([
+            StudentProfile(
+                user=user, student_id=f'S-{tag}-{n}', program=PROGRAMS[n % len(PROGRAMS)],
+                enrollment_date=teaching_days[0], current_semester=semesters, phone=f'+91{n:010d}', address='-'
+            )
+            for n, user in zip(numbers, users)
+        ], batch_size=2000)
+    record('students', students)
+
+    # Sections: consecutive students of a program; each (subject, section) gets one teacher
+    sections = {}
+    for program in PROGRAMS:
+        enrolled = student_profiles[PROGRAMS.index(program)::len(PROGRAMS)]
+        for start in range(0, len(enrolled), section_size):
+            sections[(program, start // section_size)] = enrolled[start:start + section_size]
+    teachers = {}
+    for n, ((program, section), _) in enumerate(sections.items()):
+        for offset, subject in enumerate(subjects[program]):
+            teachers[(subject, section)] = faculty_profiles[(n * subjects_per_program + offset) % len(faculty_profiles)]
+
+    # One offering per teacher and subject in the current semester, covering all their sections
+    offerings = {}
+    for (program, section), members in sections.items():
+        for subject in subjects[program]:
+            teacher = teachers[(subject, section)]
+            offerings.setdefault((teacher.pk, subject), CourseOffering(
+                faculty=teacher, subject=subject, semester=semesters, program=program
+            ))
+    CourseOffering.objects.bulk_create(offerings.values(), batch_size=2000)
+    record('offerings', len(offerings))
+    record('enrollments', bulk_insert(Enrollment, (
+        Enrollment(offering=offerings[(teachers[(subject, section)].pk, subject)], student=profile)
+        for (program, section), members in sections.items()
+        for subject in subjects[program]
+        for profile in members
+    )))
+
+    def attendance_rows(summaries):
+        for (program, section), members in sections.items():
+            for subject in subjects[program]:
+                teacher = teachers[(subject, section)]
+                for profile in members:
+                    present = 0
+                    for day in teaching_days:
+                        status = 'present' if rng.random() < 0.85 else 'absent'
+                        present += status == 'present'
+                        yield AttendanceRecord(student=profile, faculty=teacher, subject=subject, date=day, status=status)
+                    summaries.append(AttendanceSummary(
+                        student=profile, subject=subject, present_count=present, total_count=len(teaching_days)
+                    ))
+
+    summaries = []
+    record('attendance', bulk_insert(AttendanceRecord, attendance_rows(summaries)))
+    record('attendance_summaries', bulk_insert(AttendanceSummary, summaries))
+    del summaries
+
+    def grade_rows():
+        for semester in range(1, semesters + 1):
+            for (program, section), members in sections.items():
+                for subject in subjects[program]:
+                    teacher = teachers[(subject, section)]
+                    for profile in members:
+                        for assessment, total in ASSESSMENTS:
+                            yield GradeRecord(
+                                student=profile, faculty=teacher, subject=subject, assessment_type=assessment,
+                                marks_obtained=round(rng.uniform(0.35, 1.0) * total, 2), total_marks=total,
+                                semester=semester
+                            )
+
+    record('grades', bulk_insert(GradeRecord, grade_rows()))
+
+    record('semester_results', bulk_insert(SemesterResult, (
+        SemesterResult(
+            student=profile, semester=semester, sgpa=round(rng.uniform(5, 10), 2), cgpa=round(rng.uniform(5, 10), 2),
+            credits=subjects_per_program * 4, subjects=[], published_at=now
+        )
+        for profile in student_profiles
+        for semester in range(1, semesters)
+    )))
+
+    # Announcements spread over the last year; created_at is auto_now_add, so backdate with one bulk update
+    posted = Announcement.objects.bulk_create([
+        Announcement(
+            faculty=faculty_profiles[n % len(faculty_profiles)], title=f'Announcement {n}', content='Synthetic announcement',
+            program=rng.choice(('',) + PROGRAMS), is_active=rng.random() < 0.9
+        )
+        for n in range(announcements)
+    ], batch_size=2000)
+    for announcement in posted:
+        announcement.created_at = now - timedelta(minutes=rng.randrange(60 * 24 * 365))
+    Announcement.objects.bulk_update(posted, ['created_at'], batch_size=500)
+    record('announcements', announcements)
+
+    # Mostly delivered outbox rows with a small pending tail, like a healthy worker
+    record('notifications', bulk_insert(OutboundNotification, (
+        OutboundNotification(
+            type='email', recipient=f'student-{tag}-{n % max(students, 1)}@example.com', subject='Synthetic',
+            message='Synthetic notification', status='sent' if n % 50 else 'pending', attempts=1,
+            next_attempt_at=now - timedelta(minutes=n), sent_at=now if n % 50 else None
+        )
+        for n in range(notifications)
+    )))
+
+    return {
+        'tag': tag,
+        'counts': dict(counts),
+        'programs': list(PROGRAMS),
+        'subjects': subjects,
+        'days': teaching_days,
+        'students': student_profiles,
+        'faculty': faculty_profiles,
+        'sections': sections,
+        'teachers': teachers,
+        'offerings': offerings,
+    }
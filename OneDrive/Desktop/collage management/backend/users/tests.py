@@ -1,3 +1,60 @@
+from datetime import date
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from authentication.tokens import CollegeRefreshToken
+from faculty_portal.services import mark_attendance
+from faculty_portal.tests import create_faculty, create_students, summary, teach
+from .archive import archive_attendance, attendance_sources, closed_before
+from .models import AttendanceRecord, ArchivedAttendanceRecord, AttendanceArchiveRun
+
+CUTOFF = date(2030, 7, 1)
+OLD_DAYS = [date(2030, 1, day) for day in range(6, 11)]
+OPEN_DAY = date(2030, 7, 6)
+
+class AttendanceArchiveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.faculty = create_faculty()
+        self.students = create_students(2)
+        teach(self.faculty, self.students)
+        for day in OLD_DAYS:
+            self.mark('present', day)
+        self.mark('absent', OPEN_DAY)
+
+    def mark(self, status, day):
+        entries = [{'student_id': student.student_id, 'status': status} for student in self.students]
+        return [result['outcome'] for result in mark_attendance(self.faculty, 'Maths', day, entries)]
+
+    def test_archive_moves_closed_years_and_keeps_the_totals(self):
+        run = archive_attendance(CUTOFF, chunk_size=3)
+        self.assertEqual(run.moved, len(OLD_DAYS) * 2)
+        self.assertEqual(ArchivedAttendanceRecord.objects.count(), len(OLD_DAYS) * 2)
+        self.assertEqual(list(AttendanceRecord.objects.values_list('date', flat=True).distinct()), [OPEN_DAY])
+        self.assertEqual(summary(self.students[0]), (len(OLD_DAYS), len(OLD_DAYS) + 1))
+        self.assertEqual(closed_before(), CUTOFF)
+        self.assertEqual([source.model for source in attendance_sources(date_from=OPEN_DAY)], [AttendanceRecord])
+
+    def test_dates_close_when_a_run_starts(self):
+        self.assertIsNone(closed_before())
+        # A run in progress: logged, nothing moved yet
+        AttendanceArchiveRun.objects.create(cutoff=CUTOFF)
+        self.assertEqual(self.mark('absent', OLD_DAYS[0]), ['closed', 'closed'])
+        self.assertEqual(self.mark('present', date(2030, 1, 13)), ['closed', 'closed'])
+        self.assertFalse(AttendanceRecord.objects.filter(date=date(2030, 1, 13)).exists())
+        self.assertEqual(AttendanceRecord.objects.get(student=self.students[0], date=OLD_DAYS[0]).status, 'present')
+        self.assertEqual(summary(self.students[0]), (len(OLD_DAYS), len(OLD_DAYS) + 1))
+        # Open years are still marked
+        self.assertEqual(self.mark('present', OPEN_DAY), ['updated', 'updated'])
+
+    def test_run_starting_after_validation_still_refuses_the_mark(self):
+        # The request validates against the cached cutoff from before the run
+        self.assertIsNone(closed_before())
+        AttendanceArchiveRun.objects.create(cutoff=CUTOFF)
+        token = CollegeRefreshToken.for_user(self.faculty.user).access_token
+        response = self.client.post('/api/faculty/attendance/bulk/', {
+            'subject': 'Maths', 'date': OLD_DAYS[0].isoformat(), 'records': [{'student_id': 'S-0', 'status': 'absent'}],
+        }, content_type='application/json', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(AttendanceRecord.objects.get(student=self.students[0], date=OLD_DAYS[0]).status, 'present')